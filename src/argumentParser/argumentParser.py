@@ -129,6 +129,46 @@ class ArgumentParser(object):
                 "function_argumemnt": {"steps": "steps"},
             }
         )
+        self.add_argument(
+            {
+                "key": "w",
+                "name": "workers",
+                "help": "Number of processes used to parse and validate the sequences",
+                "default": 1,
+                "type": int,
+                "function_argumemnt": {"workers": "workers"},
+            }
+        )
+        self.add_argument(
+            {
+                "key": "cvw",
+                "name": "cv_workers",
+                "help": "Number of processes used to execute the rounds of the validator",
+                "default": 1,
+                "type": int,
+                "function_argumemnt": {"cv_workers": "cv_workers"},
+            }
+        )
+        self.add_argument(
+            {
+                "key": "sw",
+                "name": "sweep_workers",
+                "help": "Number of processes used to evaluate the configurations of the test",
+                "default": 1,
+                "type": int,
+                "function_argumemnt": {"sweep_workers": "sweep_workers"},
+            }
+        )
+        self.add_argument(
+            {
+                "key": "seed",
+                "name": "seed",
+                "help": "Seed to shuffle the samples of each round of the validator, the round i uses the seed + i",
+                "default": None,
+                "type": int,
+                "function_argumemnt": {"seed": "seed"},
+            }
+        )
         self.add_argument(
             {
                 "key": "sd",
@@ -5,3 +5,19 @@ KTSS_MODEL = "ktss"
 
 PARSER_OPERATION = "p"
 PARSER_MODEL_OPERATION = "pm"
+
+FILE_STORAGE = "file"
+MMAP_STORAGE = "mmap"
+PACKED_STORAGE = "packed"
+
+PYVCF_READER = "pyvcf"
+LIGHT_VCF_READER = "light"
+
+TEXT_PVCF_FORMAT = "text"
+BINARY_PVCF_FORMAT = "binary"
+
+PYTHON_TRAINER_BACKEND = "python"
+NUMPY_TRAINER_BACKEND = "numpy"
+
+JSON_MODEL_FORMAT = "json"
+BINARY_MODEL_FORMAT = "binary"
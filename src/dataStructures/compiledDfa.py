@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+
+import json
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+from sortedcontainers import SortedDict, SortedSet
+
+BINARY_DFA_MAGIC: bytes = b"BDFA0001"
+"""First bytes of a binary compiled DFA file."""
+
+_HEADER = struct.Struct("<8s5Q11Q")
+
+
+def is_binary_dfa(path: str) -> bool:
+    """Checks if a file is a binary compiled DFA file.
+
+    Parameters
+    ----------
+    path: str
+        Path of the file.
+
+    Returns
+    -------
+    True if the file is a binary compiled DFA file, otherwise False.
+    """
+    with open(path, "rb") as dfa_file:
+        return dfa_file.read(len(BINARY_DFA_MAGIC)) == BINARY_DFA_MAGIC
+
+
+class CompiledDFA(object):
+    """Array representation of a `DFA` or a `DFAStochastic`.
+
+    The states and the symbols are renumbered to integers following their sorted order,
+    so the transitions are a dense `states x symbols` int32 table where a missing
+    transition is -1, and the probabilities are a float64 array with only the
+    probability of each transition, in the order of the cells of the table (see
+    `transition_index`). The states are the states of the automata and every
+    state used by a transition, and the symbols are the alphabet and every symbol used
+    by a transition, `declared_states` and `declared_symbols` mark the ones that are
+    states and symbols of the automata (see `to_dict`). So the transitions are array
+    lookups:
+
+    ```python
+        compiled = dfa.compile()
+
+        state = compiled.next_state(compiled.symbol_index["a"], compiled.initial_state)
+        compiled.state_names[state]
+    ```
+
+    The compiled DFA can be saved into a binary file (see `save`) which is loaded
+    through a memory map (see `load`), so the tables are not read until they are used
+    and the processes that load the same file share its memory.
+
+    Parameters
+    ----------
+    dfa: DFA
+        Automata to compile, if it has probabilities they are also compiled.
+    """
+
+    def __init__(self, dfa):
+        states = SortedSet(dfa.states)
+        states.add(dfa.initial_state)
+        states.update(dfa.final_states)
+        symbols = SortedSet(dfa.alphabet)
+        for from_state, transition in dfa.transitions.items():
+            states.add(from_state)
+            states.update(transition.values())
+            symbols.update(transition)
+
+        self.state_names = list(states)
+        self._state_index = {state: index for index, state in enumerate(states)}
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: index for index, symbol in enumerate(symbols)}
+
+        self.initial_state = self.state_index[dfa.initial_state]
+        self.final_states = np.zeros(len(self.state_names), dtype=bool)
+        self.final_states[[self.state_index[i] for i in dfa.final_states]] = True
+        self.declared_states = np.zeros(len(self.state_names), dtype=bool)
+        self.declared_states[[self.state_index[i] for i in dfa.states]] = True
+        self.declared_symbols = np.zeros(len(self.symbols), dtype=bool)
+        self.declared_symbols[[self.symbol_index[i] for i in dfa.alphabet]] = True
+        self.metadata = {}
+
+        self.table = np.full((len(self.state_names), len(self.symbols)), -1, np.int32)
+        for from_state, transition in dfa.transitions.items():
+            row = self.table[self.state_index[from_state]]
+            for symbol, to_state in transition.items():
+                row[self.symbol_index[symbol]] = self.state_index[to_state]
+
+        self.probabilities = None
+        self._log_probabilities = None
+        self._transition_keys = None
+        if getattr(dfa, "probabilities", None) is not None:
+            states = []
+            symbols = []
+            probabilities = []
+            for from_state, transition in dfa.probabilities.items():
+                for symbol, probability in transition.items():
+                    states.append(self.state_index[from_state])
+                    symbols.append(self.symbol_index[symbol])
+                    probabilities.append(probability)
+
+            keys = np.array(states, dtype=np.int64) * len(self.symbols) + symbols
+            positions = np.searchsorted(self.transition_keys, keys)
+            # The probabilities of missing transitions are not kept
+            exists = positions < len(self.transition_keys)
+            exists[exists] = self.transition_keys[positions[exists]] == keys[exists]
+
+            self.probabilities = np.zeros(len(self.transition_keys), dtype=np.float64)
+            self.probabilities[positions[exists]] = np.array(
+                probabilities, dtype=np.float64
+            )[exists]
+
+    @property
+    def state_index(self) -> dict:
+        """Index of each state, it is computed the first time it is used."""
+        if self._state_index is None:
+            self._state_index = {
+                state: index for index, state in enumerate(self.state_names)
+            }
+
+        return self._state_index
+
+    @property
+    def transition_keys(self) -> np.ndarray:
+        """Cell of each transition in the flattened table (`state * symbols + symbol`)
+        in increasing order, which is the order of the probabilities. It is computed
+        the first time it is used."""
+        if self._transition_keys is None:
+            self._transition_keys = np.flatnonzero(self.table.reshape(-1) != -1)
+
+        return self._transition_keys
+
+    def transition_index(self, states, symbols) -> np.ndarray:
+        """Index in `probabilities` of the transitions of states with symbols, the
+        transitions must exist.
+
+        Parameters
+        ----------
+        states: int, ndarray
+            Indexes of the states of the transitions.
+        symbols: int, ndarray
+            Indexes of the symbols of the transitions.
+
+        Returns
+        -------
+        Indexes of the transitions.
+        """
+        keys = np.asarray(states, dtype=np.int64) * len(self.symbols) + symbols
+
+        return np.searchsorted(self.transition_keys, keys)
+
+    @property
+    def log_probabilities(self) -> np.ndarray:
+        """Logarithm of the probabilities, -inf for the transitions with probability
+        zero. It is computed the first time it is used."""
+        if self._log_probabilities is None and self.probabilities is not None:
+            with np.errstate(divide="ignore"):
+                self._log_probabilities = np.log(self.probabilities)
+
+        return self._log_probabilities
+
+    def encode(self, string: str) -> np.ndarray:
+        """Transforms a string into the indexes of its symbols.
+
+        Parameters
+        ----------
+        string: str
+            String to encode.
+
+        Raise
+        -----
+        ValueError: When a symbol is not in the automata.
+
+        Returns
+        -------
+        Indexes of the symbols.
+        """
+        try:
+            return np.fromiter(
+                (self.symbol_index[symbol] for symbol in string),
+                dtype=np.int32,
+                count=len(string),
+            )
+        except KeyError as error:
+            raise ValueError(f"The symbol {error} not exists") from None
+
+    def has_transition(self, state: int, symbol: int) -> bool:
+        """Returns true if the transitions from state with symbol exists.
+
+        Parameters
+        ----------
+        state: int
+            Index of the state of the transition.
+        symbol: int
+            Index of the symbol of the transition.
+
+        Returns
+        -------
+        True if the transitions exists otherwise False.
+        """
+        return self.table[state, symbol] != -1
+
+    def next_state(self, symbol: int, state: int) -> int:
+        """Parse a symbol from a state and returns the next state.
+
+        Parameters
+        ----------
+        symbol: int
+            Index of the symbol to be parsed.
+        state: int
+            Index of the state where the transition starts.
+
+        Raise
+        -----
+        ValueError: When not exists a transition for given state and symbol.
+
+        Returns
+        -------
+        Index of the next state.
+        """
+        next_state = int(self.table[state, symbol])
+        if next_state == -1:
+            raise ValueError(
+                f"The transition for {self.state_names[state]} - "
+                f"{self.symbols[symbol]} not exists"
+            )
+
+        return next_state
+
+    def parse_string(self, string: str, state: int = None) -> list:
+        """Parse a string and returns the sequence of states.
+
+        Parameters
+        ----------
+        string: str
+            string to be parsed.
+        state: int = None
+            Index of the initial state to generate the sequences, by default the
+            initial state of the automata.
+
+        Raise
+        -----
+        ValueError: When the string connot be parsed.
+
+        Returns
+        -------
+        Sequence of the indexes of the followed states.
+        """
+        current_state = self.initial_state if state is None else state
+        states = [current_state]
+
+        for symbol in self.encode(string).tolist():
+            current_state = self.next_state(symbol, current_state)
+            states.append(current_state)
+
+        return states
+
+    def to_dict(self) -> dict:
+        """Transforms the compiled DFA into the dictionary of a DFA model, with the
+        states, the alphabet, the transitions, the initial state, the final states and
+        the probabilities (if it has probabilities). The states and the alphabet are
+        the ones of the compiled automata (`declared_states` and `declared_symbols`),
+        so the dictionary is the same as the one of the automata.
+
+        Returns
+        -------
+        Dictionary of the model.
+        """
+        transitions = SortedDict()
+        probabilities = SortedDict()
+        states, symbols = np.divmod(self.transition_keys, len(self.symbols))
+        next_states = self.table[states, symbols].tolist()
+        transition_probabilities = None
+        if self.probabilities is not None:
+            transition_probabilities = self.probabilities.tolist()
+
+        for index, (state, symbol) in enumerate(zip(states.tolist(), symbols.tolist())):
+            state_name = self.state_names[state]
+            if state_name not in transitions:
+                transitions[state_name] = SortedDict()
+                if transition_probabilities is not None:
+                    probabilities[state_name] = SortedDict()
+
+            symbol = self.symbols[symbol]
+            transitions[state_name][symbol] = self.state_names[next_states[index]]
+            if transition_probabilities is not None:
+                probabilities[state_name][symbol] = transition_probabilities[index]
+
+        model = {
+            "states": SortedSet(
+                self.state_names[i]
+                for i in np.flatnonzero(self.declared_states).tolist()
+            ),
+            "alphabet": SortedSet(
+                self.symbols[i] for i in np.flatnonzero(self.declared_symbols).tolist()
+            ),
+            "transitions": transitions,
+            "initial_state": self.state_names[self.initial_state],
+            "final_states": SortedSet(
+                self.state_names[i] for i in np.flatnonzero(self.final_states).tolist()
+            ),
+        }
+        if self.probabilities is not None:
+            model["probabilities"] = probabilities
+
+        return model
+
+    def save(self, path: str, metadata: dict = None):
+        """Saves the compiled DFA into a binary file. The file has a header followed by
+        the sections:
+
+        ```
+            state names data     uint8[state_names_size]
+            state names offsets  int64[states + 1]
+            symbols data         uint8[symbols_size]
+            symbols offsets      int64[symbols + 1]
+            final states         uint8[states]
+            declared states      uint8[states]
+            declared symbols     uint8[symbols]
+            table                int32[states x symbols]
+            probabilities        float64[transitions] (if it has probabilities)
+            metadata             json
+        ```
+
+        The header stores the magic bytes, the number of states, symbols and
+        transitions, the initial state, if it has probabilities and the byte offset of each section. The
+        sections are aligned to 8 bytes, so they can be mapped.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+        metadata: dict = None
+            Data that is saved with the DFA as json.
+        """
+        state_names, state_offsets = _encode_strings(self.state_names)
+        symbols, symbols_offsets = _encode_strings(self.symbols)
+        sections_data = [
+            state_names,
+            state_offsets,
+            symbols,
+            symbols_offsets,
+            self.final_states.astype(np.uint8),
+            self.declared_states.astype(np.uint8),
+            self.declared_symbols.astype(np.uint8),
+            np.ascontiguousarray(self.table, dtype=np.int32),
+            np.empty(0, dtype=np.float64),
+            json.dumps(metadata or {}).encode("utf-8"),
+        ]
+        if self.probabilities is not None:
+            sections_data[8] = np.ascontiguousarray(
+                self.probabilities, dtype=np.float64
+            )
+
+        with open(path, "wb") as dfa_file:
+            dfa_file.write(b"\0" * _HEADER.size)
+            sections = []
+            for data in sections_data:
+                dfa_file.write(b"\0" * (-dfa_file.tell() % 8))
+                sections.append(dfa_file.tell())
+                dfa_file.write(data if isinstance(data, bytes) else data.tobytes())
+            sections.append(dfa_file.tell())
+
+            dfa_file.seek(0)
+            dfa_file.write(
+                _HEADER.pack(
+                    BINARY_DFA_MAGIC,
+                    len(self.state_names),
+                    len(self.symbols),
+                    len(self.transition_keys),
+                    self.initial_state,
+                    self.probabilities is not None,
+                    *sections,
+                )
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledDFA":
+        """Loads a compiled DFA saved by `save` through a memory map, the metadata is
+        stored in the `metadata` attribute.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+
+        Raise
+        -----
+        ValueError: When the file is not a binary compiled DFA file.
+
+        Returns
+        -------
+        The compiled DFA.
+        """
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        (
+            magic,
+            states,
+            symbols,
+            transitions,
+            initial_state,
+            has_probabilities,
+            *sections,
+        ) = _HEADER.unpack(data[: _HEADER.size].tobytes())
+        if magic != BINARY_DFA_MAGIC:
+            raise ValueError(f"{path} is not a binary compiled DFA file")
+
+        def section(index: int, length: int, dtype=np.uint8) -> np.ndarray:
+            start = sections[index]
+            return data[start : start + length * np.dtype(dtype).itemsize].view(dtype)
+
+        state_offsets = section(1, states + 1, np.int64)
+        symbols_offsets = section(3, symbols + 1, np.int64)
+
+        compiled = cls.__new__(cls)
+        compiled.state_names = _MappedStrings(
+            section(0, int(state_offsets[-1])), state_offsets
+        )
+        compiled._state_index = None
+        compiled.symbols = list(
+            _MappedStrings(section(2, int(symbols_offsets[-1])), symbols_offsets)
+        )
+        compiled.symbol_index = {
+            symbol: index for index, symbol in enumerate(compiled.symbols)
+        }
+        compiled.initial_state = initial_state
+        compiled.final_states = section(4, states).view(bool)
+        compiled.declared_states = section(5, states).view(bool)
+        compiled.declared_symbols = section(6, symbols).view(bool)
+        compiled.table = section(7, states * symbols, np.int32).reshape(states, symbols)
+        compiled.probabilities = None
+        if has_probabilities:
+            compiled.probabilities = section(8, transitions, np.float64)
+        compiled._log_probabilities = None
+        compiled._transition_keys = None
+        compiled.metadata = json.loads(
+            data[sections[9] : sections[10]].tobytes().decode("utf-8")
+        )
+
+        return compiled
+
+
+def _encode_strings(strings: list) -> tuple:
+    """Encodes a list of strings as utf-8 data and the offsets of each string.
+
+    Parameters
+    ----------
+    strings: list
+        Strings.
+
+    Returns
+    -------
+    Pair (data, offsets).
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(i) for i in encoded], out=offsets[1:])
+
+    return b"".join(encoded), offsets
+
+
+class _MappedStrings(Sequence):
+    """Sequence of strings stored as utf-8 data and the offsets of each string, the
+    strings are decoded when they are used.
+
+    Parameters
+    ----------
+    data: ndarray
+        Data of the strings.
+    offsets: ndarray
+        Offsets of the strings.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self._data = data
+        self._offsets = offsets
+
+    def __getitem__(self, index: int) -> str:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string index out of range")
+
+        return (
+            self._data[self._offsets[index] : self._offsets[index + 1]]
+            .tobytes()
+            .decode("utf-8")
+        )
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        data = self._data.tobytes()
+        offsets = self._offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end].decode("utf-8")
@@ -1,6 +1,7 @@
 from typing import Union
 
 from sortedcontainers import SortedDict, SortedSet
+from src.dataStructures.compiledDfa import CompiledDFA
 
 
 class DFA(object):
@@ -105,3 +106,12 @@ class DFA(object):
         """
         transition = self.transitions.get(state, False)
         return transition and transition.get(symbol, False)
+
+    def compile(self) -> CompiledDFA:
+        """Returns the array representation of the automata (see `CompiledDFA`).
+
+        Returns
+        -------
+        Compiled automata.
+        """
+        return CompiledDFA(self)
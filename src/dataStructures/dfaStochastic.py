@@ -7,6 +7,15 @@ from src.utils.arithmetic import lcm
 
 
 class DFAStochastic(DFA):
+    """Deterministic finite automata with a probability per transition.
+
+    The transitions added by `add_transition` are counted per state and symbol
+    (`counts`), and the probabilities of a state are the counts divided by the total of
+    the state. They are computed when `probabilities` is used after the counts of the
+    state changed, so adding a transition does not update the other probabilities of
+    the state.
+    """
+
     def __init__(
         self,
         states: Union[set, list, tuple],
@@ -18,13 +27,32 @@ class DFAStochastic(DFA):
     ):
         super().__init__(states, alphabet, transitions, initial_state, final_states)
 
-        self.probabilities = SortedDict(probabilities)
+        self.counts = {}
+        self._probabilities = SortedDict(probabilities)
+        self._stale_probabilities = set()
+
+    @property
+    def probabilities(self) -> SortedDict:
+        """Probabilities of the transitions of each state."""
+        for state in self._stale_probabilities:
+            state_counts = self.counts[state]
+            total = sum(state_counts.values())
+            self._probabilities[state] = SortedDict(
+                {symbol: count / total for symbol, count in state_counts.items()}
+            )
+        self._stale_probabilities.clear()
+
+        return self._probabilities
 
     @staticmethod
-    def _add_probability(
-        transition: Union[OrderedDict, dict], symbol: str
-    ) -> OrderedDict:
-        """Update the probabilities of a transition when a new symbol is added.
+    def _probabilities_to_counts(transition: Union[OrderedDict, dict]) -> dict:
+        """Transforms the probabilities of a transition into the smallest counts whose
+        proportions are the probabilities.
+
+        Each probability is transformed into the fraction with the smallest denominator
+        up to 1000000 that is the same float, which is the fraction of counts that
+        generated it if the total of the state is not greater than 1000000. If there is
+        not such fraction, the exact fraction of the float is used.
 
         For instance, if our transition is:
 
@@ -32,45 +60,32 @@ class DFAStochastic(DFA):
             {"a": 1 / 4, "b": 1 / 4, "c": 1 / 2}
         ```
 
-        And our symbol is `a` the result is:
+        The result is:
 
         ```python
-            {"a": 2 / 5, "b": 1 / 5, "c": 2 / 5}
+            {"a": 1, "b": 1, "c": 2}
         ```
 
         Parameters
         ----------
         transition: OrderedDict, dict
-            Transition to be updated.
-        symbol: str
-            Symbol that was added.
-        """
-        if not transition.get(symbol, False) and not len(transition.values()):
-            transition[symbol] = 1
-            return transition
-
-        if not transition.get(symbol, False):
-            transition[symbol] = 0
+            Probabilities of the transition.
 
-        lcm_value = lcm(
-            [Fraction(number).denominator for number in transition.values()]
-        )
-
-        for transition_symbol in transition:
-            fraction = Fraction(transition[transition_symbol])
-
-            add = 0
-            if transition_symbol == symbol:
-                add = 1
-
-            new_numerator = (
-                lcm_value / fraction.denominator
-            ) * fraction.numerator + add
-            new_denominator = lcm_value + 1
-
-            transition[transition_symbol] = new_numerator / new_denominator
-
-        return transition
+        Returns
+        -------
+        Counts of the transition.
+        """
+        fractions = {}
+        for symbol, probability in transition.items():
+            fraction = Fraction(probability).limit_denominator()
+            if float(fraction) != probability:
+                fraction = Fraction(probability)
+            fractions[symbol] = fraction
+        lcm_value = lcm([fraction.denominator for fraction in fractions.values()])
+
+        return {
+            symbol: int(fraction * lcm_value) for symbol, fraction in fractions.items()
+        }
 
     def add_transition(self, from_state: str, symbol: str, to_state: str):
         """Append a transition into an ordered dict that represent the transitions.
@@ -84,9 +99,13 @@ class DFAStochastic(DFA):
         to_state: str
             String tht represents the destination state.
         """
-        if not self.transitions.get(from_state):
-            self.transitions[from_state] = SortedDict({})
-            self.probabilities[from_state] = SortedDict({})
+        if from_state not in self.counts:
+            self.counts[from_state] = self._probabilities_to_counts(
+                self._probabilities.get(from_state, {})
+            )
+
+        super().add_transition(from_state, symbol, to_state)
 
-        self.transitions[from_state][symbol] = to_state
-        DFAStochastic._add_probability(self.probabilities[from_state], symbol)
+        state_counts = self.counts[from_state]
+        state_counts[symbol] = state_counts.get(symbol, 0) + 1
+        self._stale_probabilities.add(from_state)
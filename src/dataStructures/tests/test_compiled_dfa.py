@@ -0,0 +1,175 @@
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from src.dataStructures.compiledDfa import CompiledDFA, is_binary_dfa
+from src.dataStructures.dfa import DFA
+from src.dataStructures.dfaStochastic import DFAStochastic
+
+
+class TestCompiledDFA(TestCase):
+    def setUp(self) -> None:
+        alphabet = {"a", "b"}
+        states = {"", "a", "b", "aa", "bb", "ab", "ba"}
+        transitions = {
+            "": {"a": "a", "b": "b"},
+            "a": {"a": "aa", "b": "ab"},
+            "b": {"b": "bb", "c": "bc"},
+        }
+        probabilities = {
+            "": {"a": 1 / 4, "b": 3 / 4},
+            "a": {"a": 1 / 2, "b": 1 / 2},
+            "b": {"b": 1 / 3, "c": 2 / 3},
+        }
+        initial_state = ""
+        final_states = {"bb", "aa"}
+
+        self.dfa = DFAStochastic(
+            states, alphabet, transitions, initial_state, final_states, probabilities
+        )
+        self.compiled = self.dfa.compile()
+        return super().setUp()
+
+    def test_states(self):
+        states = ["", "a", "aa", "ab", "b", "ba", "bb", "bc"]
+
+        self.assertEqual(self.compiled.state_names, states)
+        self.assertEqual(self.compiled.initial_state, 0)
+        self.assertEqual(list(np.flatnonzero(self.compiled.final_states)), [2, 6])
+
+    def test_symbols(self):
+        self.assertEqual(self.compiled.symbols, ["a", "b", "c"])
+        self.assertEqual(self.compiled.symbol_index, {"a": 0, "b": 1, "c": 2})
+
+    def test_table(self):
+        self.assertEqual(self.compiled.table.dtype, np.int32)
+        self.assertEqual(self.compiled.table.shape, (8, 3))
+        for state, transition in self.dfa.transitions.items():
+            for symbol, to_state in transition.items():
+                result = self.compiled.table[
+                    self.compiled.state_index[state], self.compiled.symbol_index[symbol]
+                ]
+
+                self.assertEqual(self.compiled.state_names[result], to_state)
+        self.assertEqual((self.compiled.table != -1).sum(), 6)
+
+    def test_probabilities(self):
+        b = self.compiled.state_index["b"]
+
+        result = self.compiled.transition_index(b, [1, 2])
+
+        self.assertEqual(self.compiled.probabilities.shape, (6,))
+        self.assertEqual(list(self.compiled.probabilities[result]), [1 / 3, 2 / 3])
+        self.assertEqual(
+            list(self.compiled.log_probabilities[result]),
+            [np.log(1 / 3), np.log(2 / 3)],
+        )
+
+    def test_transition_index(self):
+        states, symbols = np.nonzero(self.compiled.table != -1)
+
+        result = self.compiled.transition_index(states, symbols)
+
+        self.assertEqual(list(result), list(range(6)))
+
+    def test_has_transition(self):
+        a = self.compiled.state_index["a"]
+
+        self.assertTrue(self.compiled.has_transition(a, 1))
+        self.assertFalse(self.compiled.has_transition(a, 2))
+
+    def test_next_state_invalid(self):
+        with self.assertRaises(ValueError):
+            self.compiled.next_state(2, self.compiled.state_index["a"])
+
+    def test_parse_string(self):
+        result = self.compiled.parse_string("bc")
+
+        self.assertEqual(
+            [self.compiled.state_names[i] for i in result], self.dfa.parse_string("bc")
+        )
+
+    def test_parse_string_invalid(self):
+        with self.assertRaises(ValueError):
+            self.compiled.parse_string("ad")
+
+    def test_compile_dfa(self):
+        dfa = DFA({"1"}, {"a"}, {"1": {"a": "1"}}, "1", {"1"})
+
+        result = dfa.compile()
+
+        self.assertIsNone(result.probabilities)
+        self.assertIsNone(result.log_probabilities)
+        self.assertEqual(result.parse_string("aa"), [0, 0, 0])
+        self.assertEqual(result.metadata, {})
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as temporal_dir:
+            path = f"{temporal_dir}/model.bdfa"
+            self.compiled.save(path, metadata={"k": 2})
+
+            result = CompiledDFA.load(path)
+
+            self.assertTrue(is_binary_dfa(path))
+            self.assertIsInstance(result.table, np.memmap)
+            self.assertEqual(list(result.state_names), self.compiled.state_names)
+            self.assertEqual(result.state_index, self.compiled.state_index)
+            self.assertEqual(result.symbols, self.compiled.symbols)
+            self.assertEqual(result.initial_state, self.compiled.initial_state)
+            self.assertTrue(
+                np.array_equal(result.final_states, self.compiled.final_states)
+            )
+            self.assertTrue(np.array_equal(result.table, self.compiled.table))
+            self.assertTrue(
+                np.array_equal(result.probabilities, self.compiled.probabilities)
+            )
+            self.assertEqual(result.metadata, {"k": 2})
+            self.assertEqual(
+                result.parse_string("ab"), self.compiled.parse_string("ab")
+            )
+
+    def test_save_load_unaligned(self):
+        dfa = DFA({"1", "2", "3"}, {"a"}, {"1": {"a": "2"}}, "1", {"2"})
+        compiled = dfa.compile()
+
+        with tempfile.TemporaryDirectory() as temporal_dir:
+            path = f"{temporal_dir}/model.bdfa"
+            compiled.save(path)
+
+            result = CompiledDFA.load(path)
+
+            self.assertEqual(result.table.shape, (3, 1))
+            self.assertTrue(np.array_equal(result.table, compiled.table))
+            self.assertIsNone(result.probabilities)
+            self.assertEqual(result.metadata, {})
+
+    def test_load_invalid(self):
+        with tempfile.TemporaryDirectory() as temporal_dir:
+            path = f"{temporal_dir}/model.json"
+            with open(path, "w") as model_file:
+                model_file.write("{}" * 100)
+
+            self.assertFalse(is_binary_dfa(path))
+            with self.assertRaises(ValueError):
+                CompiledDFA.load(path)
+
+    def test_to_dict(self):
+        result = self.compiled.to_dict()
+
+        self.assertEqual(result["transitions"], self.dfa.transitions)
+        self.assertEqual(result["probabilities"], self.dfa.probabilities)
+        self.assertEqual(result["initial_state"], "")
+        self.assertEqual(list(result["final_states"]), ["aa", "bb"])
+        self.assertEqual(list(result["alphabet"]), ["a", "b"])
+        self.assertEqual(result["states"], self.dfa.states)
+
+    def test_to_dict_saved(self):
+        with tempfile.TemporaryDirectory() as temporal_dir:
+            path = f"{temporal_dir}/model.bdfa"
+            self.compiled.save(path)
+
+            result = CompiledDFA.load(path).to_dict()
+
+        self.assertEqual(result, self.compiled.to_dict())
+        self.assertEqual(result["states"], self.dfa.states)
+        self.assertEqual(result["alphabet"], self.dfa.alphabet)
@@ -17,33 +17,6 @@ class TestDFAStochastic(TestCase):
         )
         return super().setUp()
 
-    def test__add_probability(self):
-        transition = {"a": 1 / 4, "b": 1 / 4, "c": 1 / 2}
-        symbol = "a"
-        new_transition = {"a": 2 / 5, "b": 1 / 5, "c": 2 / 5}
-
-        DFAStochastic._add_probability(transition, symbol)
-
-        self.assertEqual(transition, new_transition)
-
-    def test__add_probability_empty(self):
-        transition = {}
-        symbol = "a"
-        new_transition = {"a": 1}
-
-        DFAStochastic._add_probability(transition, symbol)
-
-        self.assertEqual(transition, new_transition)
-
-    def test__add_probability_not_present(self):
-        transition = {"b": 1 / 2, "c": 1 / 2}
-        symbol = "a"
-        new_transition = {"a": 1 / 3, "b": 1 / 3, "c": 1 / 3}
-
-        DFAStochastic._add_probability(transition, symbol)
-
-        self.assertEqual(transition, new_transition)
-
     def test_add_transition_empty_transitions(self):
         from_state = "a"
         symbol = "b"
@@ -64,3 +37,42 @@ class TestDFAStochastic(TestCase):
         self.dfa.add_transition(from_state, symbol, to_state)
 
         self.assertEqual(self.dfa.probabilities, transition)
+
+    def test_add_transition_counts(self):
+        self.dfa.add_transition("a", "a", "aa")
+        self.dfa.add_transition("a", "a", "aa")
+        self.dfa.add_transition("a", "b", "ab")
+        self.dfa.add_transition("a", "b", "ab")
+        self.dfa.add_transition("a", "a", "aa")
+
+        self.assertEqual(self.dfa.counts, {"a": {"a": 3, "b": 2}})
+        self.assertEqual(self.dfa.probabilities, {"a": {"a": 3 / 5, "b": 2 / 5}})
+
+    def test_add_transition_probabilities(self):
+        dfa = DFAStochastic(
+            {"", "a", "b"},
+            {"a", "b"},
+            {"": {"a": "a", "b": "b"}},
+            "",
+            set(),
+            {"": {"a": 1 / 3, "b": 2 / 3}},
+        )
+
+        dfa.add_transition("", "a", "a")
+
+        self.assertEqual(dfa.counts, {"": {"a": 2, "b": 2}})
+        self.assertEqual(dfa.probabilities, {"": {"a": 1 / 2, "b": 1 / 2}})
+
+    def test__probabilities_to_counts(self):
+        transition = {"a": 1 / 4, "b": 1 / 4, "c": 1 / 2}
+
+        result = DFAStochastic._probabilities_to_counts(transition)
+
+        self.assertEqual(result, {"a": 1, "b": 1, "c": 2})
+
+    def test__probabilities_to_counts_exact(self):
+        transition = {"a": 0.1234567891234, "b": 1 - 0.1234567891234}
+
+        result = DFAStochastic._probabilities_to_counts(transition)
+
+        self.assertEqual(result["a"] / (result["a"] + result["b"]), transition["a"])
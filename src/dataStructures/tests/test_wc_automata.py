@@ -56,6 +56,62 @@ class TestWCA(TestCase):
 
         self.assertEqual(result, transition)
 
+    def test_add_transition_pairs(self):
+        self.wca.add_transition("1", ("a", "b"), "2")
+        self.wca.add_transition("2", ("a", "b"), "3")
+        self.wca.add_transition("2", ("c", "d"), "4")
+
+        self.assertEqual(self.wca.pairs, {("a", "b"): 2, ("c", "d"): 1})
+        self.assertEqual(self.wca.pair_ids, {("a", "b"): 0, ("c", "d"): 1})
+        self.assertEqual(self.wca.pair_symbols, [("a", "b"), ("c", "d")])
+
+    def test_transitions(self):
+        self.wca.add_transition("1", ("a", "b"), "2")
+        self.wca.add_transition("1", ("c", "d"), "3")
+
+        self.assertEqual(self.wca.transitions, {"1": {"a-b": "2", "c-d": "3"}})
+        self.assertEqual(self.wca.probabilities, {"1": {"a-b": 1 / 2, "c-d": 1 / 2}})
+        self.assertEqual(self.wca.transitions["1"]["c-d"], "3")
+        with self.assertRaises(KeyError):
+            self.wca.transitions["1"]["e-f"]
+
+    def test_transitions_counts(self):
+        self.wca.add_transition("1", ("a", "b"), "2")
+        self.wca.add_transition("1", ("a", "b"), "2")
+        self.wca.add_transition("1", ("c", "d"), "3")
+
+        self.assertEqual(self.wca.probabilities, {"1": {"a-b": 2 / 3, "c-d": 1 / 3}})
+
+    def test_transitions_counts_probabilities(self):
+        self.wca.add_transition("1", ("a", "b"), "2", probability=1 / 2)
+        self.wca.add_transition("1", ("c", "d"), "3", probability=1 / 2)
+        self.wca.add_transition("1", ("a", "b"), "2")
+
+        self.assertEqual(self.wca.probabilities, {"1": {"a-b": 2 / 3, "c-d": 1 / 3}})
+
+    def test_transitions_view(self):
+        transitions = self.wca.transitions
+        self.wca.add_transition("1", ("a", "b"), "2")
+
+        self.assertIs(self.wca.transitions, transitions)
+        self.assertIs(self.wca.probabilities, self.wca.probabilities)
+        self.assertEqual(transitions, {"1": {"a-b": "2"}})
+
+    def test_init_transitions(self):
+        wca = WatsonCrickAutomata(
+            {"a", "b"},
+            [("a", "b")],
+            {"1", "2"},
+            "1",
+            set(),
+            {"1": {"a-b": "2"}},
+            {"1": {"a-b": 1}},
+        )
+
+        self.assertEqual(wca.transitions, {"1": {"a-b": "2"}})
+        self.assertEqual(wca.probabilities, {"1": {"a-b": 1}})
+        self.assertEqual(wca.next_state(("a", "b"), "1"), "2")
+
     def test_next_state(self):
         pair = ("a", "b")
         origin = "1"
@@ -115,6 +171,33 @@ class TestWCA(TestCase):
 
         self.assertEqual(result, transitions)
 
+    def test_compile(self):
+        self.wca.add_transition("1", ("a", "A"), "2", probability=1 / 4)
+        self.wca.add_transition("1", ("l", "A"), "3", probability=1 / 2)
+        self.wca.add_transition("1", ("d", "C"), "4", probability=1 / 4)
+        greedy_transitions = {("1", "A"): ("l", "3"), ("1", "C"): ("d", "4")}
+
+        result = self.wca.compile()
+
+        self.assertEqual(result, greedy_transitions)
+
+    def test_compile_tie(self):
+        self.wca.add_transition("1", ("a", "A"), "2", probability=1 / 2)
+        self.wca.add_transition("1", ("l", "A"), "3", probability=1 / 2)
+
+        result = self.wca.compile()
+
+        self.assertEqual(result, {("1", "A"): ("a", "2")})
+
+    def test_compile_add_transition(self):
+        self.wca.add_transition("1", ("a", "A"), "2", probability=1 / 4)
+        self.wca.compile()
+        self.wca.add_transition("1", ("l", "A"), "3", probability=1 / 2)
+
+        result = self.wca.compile()
+
+        self.assertEqual(result, {("1", "A"): ("l", "3")})
+
 
 class TestWCAParse(TestCase):
     def setUp(self) -> None:
@@ -227,3 +310,11 @@ class TestWCAParse(TestCase):
 
         self.assertNotIn(annotated_mutation, results)
         self.assertIn(annotated_not_muutation, results)
+
+    def test_annotate_sequence_without_transitions(self):
+        sequence = "AAAA"
+        annotated = "aaz"
+
+        result = self.wca.annotate_sequence(sequence)
+
+        self.assertEqual(result, annotated)
@@ -1,8 +1,23 @@
+from collections import Counter
+from collections.abc import Mapping
+
 from src.dataStructures.dfaStochastic import DFAStochastic
 
 
 class WatsonCrickAutomata(object):
-    """Class that represents a [Watson-Crick Automata](https://arxiv.org/pdf/1602.05721.pdf) 1-limited"""
+    """Class that represents a [Watson-Crick Automata](https://arxiv.org/pdf/1602.05721.pdf) 1-limited
+
+    The pairs are interned: each different pair has an integer id (`pair_ids`, and
+    `pair_symbols` is the pair of each id), and the transitions and the probabilities
+    are stored by the id of the pair. The `transitions` and `probabilities` attributes
+    are read only views keyed by the hashed pairs (see `_hash_pair`), whose keys are
+    created when they are used. `pairs` counts the transitions of each pair.
+
+    The transitions added without a probability are counted per state and pair id, and
+    the probabilities of the state are the counts divided by the total of the state
+    (see `src.dataStructures.dfaStochastic.DFAStochastic`). They are computed when the
+    probabilities are used after the counts of the state changed.
+    """
 
     def __init__(
         self,
@@ -15,14 +30,74 @@ class WatsonCrickAutomata(object):
         probabilities,
     ) -> None:
         self.alphabet = alphabet
-        self.pairs = pairs
+        self.pairs = Counter(tuple(pair) for pair in pairs)
         self.states = states
         self.initial_state = initial_state
         self.final_states = final_states
-        self.transitions = transitions
-        self.probabilities = probabilities
+        self.pair_ids = {}
+        self.pair_symbols = []
+        self._pair_transitions = {}
+        self._pair_probabilities = {}
+        for origin, transition in transitions.items():
+            self._pair_transitions[origin] = {
+                self._intern_pair(hashed_pair.split("-")): destination
+                for hashed_pair, destination in transition.items()
+            }
+        for origin, transition in probabilities.items():
+            self._pair_probabilities[origin] = {
+                self._intern_pair(hashed_pair.split("-")): probability
+                for hashed_pair, probability in transition.items()
+            }
+        self._pair_counts = {}
+        self._stale_probabilities = set()
+        self._greedy_transitions = None
+        self._transitions_view = _StatesView(self, self._pair_transitions)
+        self._probabilities_view = _StatesView(self, self._pair_probabilities)
         super().__init__()
 
+    @property
+    def transitions(self) -> Mapping:
+        """Transitions of each state, keyed by the hashed pairs."""
+        return self._transitions_view
+
+    @property
+    def probabilities(self) -> Mapping:
+        """Probabilities of the transitions of each state, keyed by the hashed pairs."""
+        self._update_probabilities()
+
+        return self._probabilities_view
+
+    def _update_probabilities(self):
+        """Computes the probabilities of the states whose counts changed."""
+        for origin in self._stale_probabilities:
+            state_counts = self._pair_counts[origin]
+            state_probabilities = self._pair_probabilities[origin]
+            total = sum(state_counts.values())
+            for pair_id, count in state_counts.items():
+                state_probabilities[pair_id] = count / total
+        self._stale_probabilities.clear()
+
+    def _intern_pair(self, pair: tuple) -> int:
+        """Returns the id of a pair, a new id is created if the pair has not one.
+
+        Parameters
+        ----------
+        pair: tuple
+            Pair.
+
+        Returns
+        -------
+        Id of the pair.
+        """
+        pair = tuple(pair)
+        pair_id = self.pair_ids.get(pair)
+        if pair_id is None:
+            pair_id = len(self.pair_symbols)
+            self.pair_ids[pair] = pair_id
+            self.pair_symbols.append(pair)
+
+        return pair_id
+
     def _hash_pair(self, pair: tuple, symbol: str = "-") -> str:
         """Creates a unic string by a pair.
 
@@ -59,26 +134,34 @@ class WatsonCrickAutomata(object):
         -------
         Dictionary with the transition.
         """
+        pair = tuple(pair)
         self.alphabet.add(pair[0])
         self.alphabet.add(pair[1])
-        self.pairs.append(pair)
+        self.pairs[pair] += 1
         self.states.add(origin)
         self.states.add(destination)
+        self._greedy_transitions = None
 
-        if not self.transitions.get(origin, False):
-            self.transitions[origin] = {}
-            self.probabilities[origin] = {}
+        if not self._pair_transitions.get(origin, False):
+            self._pair_transitions[origin] = {}
+            self._pair_probabilities[origin] = {}
 
-        hashed_pair = self._hash_pair(pair)
-        transition = {hashed_pair: destination}
+        pair_id = self._intern_pair(pair)
 
-        self.transitions[origin][hashed_pair] = destination
-        if not probability:
-            DFAStochastic._add_probability(self.probabilities[origin], hashed_pair)
+        self._pair_transitions[origin][pair_id] = destination
+        if probability:
+            self._pair_probabilities[origin][pair_id] = probability
         else:
-            self.probabilities[origin][hashed_pair] = probability
+            state_counts = self._pair_counts.get(origin)
+            if state_counts is None:
+                state_counts = DFAStochastic._probabilities_to_counts(
+                    self._pair_probabilities[origin]
+                )
+                self._pair_counts[origin] = state_counts
+            state_counts[pair_id] = state_counts.get(pair_id, 0) + 1
+            self._stale_probabilities.add(origin)
 
-        return transition
+        return {self._hash_pair(pair): destination}
 
     def next_state(self, pair: tuple, origin: str) -> str:
         """Parse a symbol from a state and returns the next state.
@@ -94,7 +177,7 @@ class WatsonCrickAutomata(object):
         -------
         The next state.
         """
-        return self.transitions[origin][self._hash_pair(pair)]
+        return self._pair_transitions[origin][self.pair_ids[tuple(pair)]]
 
     def parse_dfa(self, dfa, mappings):
         mappings_keys = mappings.keys()
@@ -111,8 +194,64 @@ class WatsonCrickAutomata(object):
                     probability=dfa.probabilities[origin][symbol],
                 )
 
+        self.compile()
+
         return self.transitions
 
+    def compile(self) -> dict:
+        """Computes the transition that `annotate_sequence` does from each state with
+        each symbol of the sequences, which is the transition with the highest
+        probability whose second symbol of the pair is the symbol of the sequence in
+        upper case (the first one of the transitions of the state if there are more than
+        one).
+
+        The transitions are computed the first time this method is called after a
+        transition is added.
+
+        For instance, if the transitions are:
+
+        ```python
+            {"1": {"a-A": "2", "l-A": "3", "d-C": "4"}}
+        ```
+
+        And the probabilities are:
+
+        ```python
+            {"1": {"a-A": 1 / 4, "l-A": 1 / 2, "d-C": 1 / 4}}
+        ```
+
+        The result is:
+
+        ```python
+            {("1", "A"): ("l", "3"), ("1", "C"): ("d", "4")}
+        ```
+
+        Returns
+        -------
+        Dictionary with the pair (first symbol of the pair, next state) of each pair
+        (state, symbol of the sequences).
+        """
+        if self._greedy_transitions is None:
+            self._update_probabilities()
+            greedy_transitions = {}
+            greedy_probabilities = {}
+            for origin, transition in self._pair_transitions.items():
+                state_probabilities = self._pair_probabilities[origin]
+                for pair_id, destination in transition.items():
+                    pair = self.pair_symbols[pair_id]
+                    key = (origin, pair[1].upper())
+                    probability = state_probabilities[pair_id]
+                    if (
+                        key not in greedy_probabilities
+                        or probability > greedy_probabilities[key]
+                    ):
+                        greedy_probabilities[key] = probability
+                        greedy_transitions[key] = (pair[0], destination)
+
+            self._greedy_transitions = greedy_transitions
+
+        return self._greedy_transitions
+
     def annotate_sequence(self, sequence: str, separator: str = "") -> str:
         """Gets a string sequence, and annotates it.
 
@@ -124,7 +263,7 @@ class WatsonCrickAutomata(object):
         with that symbols from a state of the model DFA.
 
         If more than one symbol can be associated to a sequence symbol, this methods get
-        in a aleatory way a symbol from all the possible symbols.
+        the symbol of the transition with the highest probability (see `compile`).
 
         For instance, if our sequence is:
 
@@ -170,28 +309,81 @@ class WatsonCrickAutomata(object):
         -------
         Annotated sequence
         """
+        greedy_transitions = self.compile()
+
         result = []
         current_state = self.initial_state
         for symbol in sequence:
-            symbols = list(
-                map(lambda x: x.split("-"), self.transitions[current_state].keys())
-            )
+            transition = greedy_transitions.get((current_state, symbol))
+            if transition is None:
+                break
+
+            new_symbol, current_state = transition
+            result.append(new_symbol)
 
-            symbols = [self._hash_pair(i) for i in symbols if i[1].upper() == symbol]
-            if not symbols:
-                return separator.join(result)
+        return separator.join(result)
 
-            state_probabilities = self.probabilities[current_state]
 
-            probabilities = [
-                (possible_symbol, state_probabilities[possible_symbol])
-                for possible_symbol in symbols
-            ]
-            max_probability_symbol = max(probabilities, key=lambda item: item[1])[0]
-            new_symbol = max_probability_symbol.split("-")
+class _StatesView(Mapping):
+    """Read only view of the transitions or the probabilities of the states of a
+    `WatsonCrickAutomata`, the transition of each state is a `_HashedPairView`.
 
-            result.append(new_symbol[0])
+    Parameters
+    ----------
+    wca: WatsonCrickAutomata
+        Automata of the transitions.
+    states: dict
+        Transition of each state keyed by the ids of the pairs.
+    """
 
-            current_state = self.next_state(new_symbol, current_state)
+    def __init__(self, wca: WatsonCrickAutomata, states: dict):
+        self._wca = wca
+        self._states = states
 
-        return separator.join(result)
+    def __getitem__(self, state: str) -> "_HashedPairView":
+        return _HashedPairView(self._wca, self._states[state])
+
+    def __iter__(self):
+        return iter(self._states)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class _HashedPairView(Mapping):
+    """Read only view of a transition of a `WatsonCrickAutomata` stored by the ids of
+    the pairs, which is keyed by the hashed pairs.
+
+    Parameters
+    ----------
+    wca: WatsonCrickAutomata
+        Automata of the transition.
+    transition: dict
+        Transition keyed by the ids of the pairs.
+    """
+
+    def __init__(self, wca: WatsonCrickAutomata, transition: dict):
+        self._wca = wca
+        self._transition = transition
+
+    def __getitem__(self, hashed_pair: str):
+        pair_id = self._wca.pair_ids.get(tuple(hashed_pair.split("-")))
+        if pair_id not in self._transition:
+            raise KeyError(hashed_pair)
+
+        return self._transition[pair_id]
+
+    def __iter__(self):
+        return (
+            self._wca._hash_pair(self._wca.pair_symbols[pair_id])
+            for pair_id in self._transition
+        )
+
+    def __len__(self) -> int:
+        return len(self._transition)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
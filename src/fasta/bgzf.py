@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+
+"""Random access to [BGZF](https://samtools.github.io/hts-specs/SAMv1.pdf) compressed
+files.
+
+A BGZF file is a series of gzip members (blocks) of at most 64 KiB of uncompressed
+data. The `.gzi` index of a BGZF file stores the compressed and the uncompressed offset
+of each block, so a position of the uncompressed data can be read inflating only the
+block that contains that position.
+"""
+
+import gzip
+import io
+import logging
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+BGZF_EXTENSION = ".bgz"
+"""Extension of the BGZF files generated from gzip files."""
+
+GZI_EXTENSION = ".gzi"
+"""Extension of the index of the BGZF files."""
+
+SOURCE_EXTENSION = ".src"
+"""Extension of the file that stores the size and the modification time of the gzip
+file a BGZF file has been converted from."""
+
+BLOCK_SIZE = 65280
+"""Maximum length of the uncompressed data of a block."""
+
+_HEADER = struct.Struct("<4BI2BH")
+_SUBFIELD = struct.Struct("<2BH")
+_FOOTER = struct.Struct("<2I")
+_EOF_BLOCK = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+
+def _read_block_size(fasta_file: io.BufferedReader) -> int:
+    """Reads the header of a BGZF block and returns the size of the compressed block.
+
+    Parameters
+    ----------
+    fasta_file: BufferedReader
+        File placed at the start of the block.
+
+    Returns
+    -------
+    Size of the block or None if the file has no more blocks or it is not a BGZF file.
+    """
+    header = fasta_file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+
+    id_1, id_2, method, flags, _, _, _, extra_length = _HEADER.unpack(header)
+    if (id_1, id_2, method) != (31, 139, 8) or not flags & 4:
+        return None
+
+    extra = fasta_file.read(extra_length)
+    index = 0
+    while index + _SUBFIELD.size <= len(extra):
+        subfield_1, subfield_2, length = _SUBFIELD.unpack_from(extra, index)
+        index += _SUBFIELD.size
+        if (subfield_1, subfield_2, length) == (66, 67, 2):
+            return struct.unpack_from("<H", extra, index)[0] + 1
+        index += length
+
+    return None
+
+
+def is_bgzf(path: str) -> bool:
+    """Checks if a file is compressed with BGZF.
+
+    Parameters
+    ----------
+    path: str
+        Path of the file.
+
+    Returns
+    -------
+    True if the file is a BGZF file, otherwise False.
+    """
+    with open(path, "rb") as fasta_file:
+        return _read_block_size(fasta_file) is not None
+
+
+def _source_stamp(source_path: str) -> str:
+    """Generates the line that identifies the version of the gzip file a BGZF file is
+    converted from.
+
+    Parameters
+    ----------
+    source_path: str
+        Path of the gzip file.
+
+    Returns
+    -------
+    The stamp line of the gzip file.
+    """
+    stat = os.stat(source_path)
+    return f"size={stat.st_size} mtime={stat.st_mtime_ns}\n"
+
+
+def is_converted(source_path: str, destination_path: str) -> bool:
+    """Checks if a BGZF file has been converted from the current version of a gzip
+    file, comparing the size and the modification time of the gzip file with the ones
+    stored when the BGZF file was generated.
+
+    Parameters
+    ----------
+    source_path: str
+        Path of the gzip file.
+    destination_path: str
+        Path of the BGZF file.
+
+    Returns
+    -------
+    True if the BGZF file is up to date, otherwise False.
+    """
+    stamp_path = f"{destination_path}{SOURCE_EXTENSION}"
+    if not os.path.isfile(destination_path) or not os.path.isfile(stamp_path):
+        return False
+
+    with open(stamp_path, "r") as stamp_file:
+        return stamp_file.read() == _source_stamp(source_path)
+
+
+def build_gzi(path: str) -> list:
+    """Generates the index of a BGZF file reading the header of each block.
+
+    Parameters
+    ----------
+    path: str
+        Path of the BGZF file.
+
+    Returns
+    -------
+    List of pairs (compressed offset, uncompressed offset) of each block, without the
+    first block.
+    """
+    index = []
+    compressed_offset = 0
+    uncompressed_offset = 0
+    with open(path, "rb") as fasta_file:
+        while True:
+            fasta_file.seek(compressed_offset)
+            block_size = _read_block_size(fasta_file)
+            if block_size is None:
+                break
+
+            fasta_file.seek(compressed_offset + block_size - _FOOTER.size)
+            _, data_length = _FOOTER.unpack(fasta_file.read(_FOOTER.size))
+
+            compressed_offset += block_size
+            uncompressed_offset += data_length
+            if data_length:
+                index.append((compressed_offset, uncompressed_offset))
+
+    # The last pair points to the end of the file, it is not the start of a block
+    return index[:-1]
+
+
+def write_gzi(path: str, index: list) -> None:
+    """Writes the index of a BGZF file in the samtools `.gzi` format.
+
+    Parameters
+    ----------
+    path: str
+        Path of the index file.
+    index: list
+        List of pairs (compressed offset, uncompressed offset) of each block, without
+        the first block.
+    """
+    with open(path, "wb") as index_file:
+        index_file.write(struct.pack("<Q", len(index)))
+        for offsets in index:
+            index_file.write(struct.pack("<2Q", *offsets))
+
+
+def read_gzi(path: str) -> list:
+    """Reads the index of a BGZF file from a samtools `.gzi` file.
+
+    Parameters
+    ----------
+    path: str
+        Path of the index file.
+
+    Returns
+    -------
+    List of pairs (compressed offset, uncompressed offset) of each block, without the
+    first block.
+    """
+    with open(path, "rb") as index_file:
+        (length,) = struct.unpack("<Q", index_file.read(8))
+        offsets = array("Q")
+        offsets.frombytes(index_file.read(16 * length))
+
+    return list(zip(offsets[::2], offsets[1::2]))
+
+
+def convert_to_bgzf(source_path: str, destination_path: str, block_size=BLOCK_SIZE):
+    """Converts a gzip file into a BGZF file and generates its `.gzi` index. The size
+    and the modification time of the gzip file are stored next to the BGZF file (see
+    `is_converted`).
+
+    Parameters
+    ----------
+    source_path: str
+        Path of the gzip file.
+    destination_path: str
+        Path of the BGZF file.
+    block_size: int = 65280
+        Length of the uncompressed data of each block.
+    """
+    index = []
+    compressed_offset = 0
+    uncompressed_offset = 0
+    with gzip.open(source_path, "rb") as source, open(
+        destination_path, "wb"
+    ) as destination:
+        data = source.read(block_size)
+        while data:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+            length = _HEADER.size + _SUBFIELD.size + 2 + len(compressed) + _FOOTER.size
+
+            destination.write(_HEADER.pack(31, 139, 8, 4, 0, 0, 255, 6))
+            destination.write(_SUBFIELD.pack(66, 67, 2))
+            destination.write(struct.pack("<H", length - 1))
+            destination.write(compressed)
+            destination.write(_FOOTER.pack(zlib.crc32(data), len(data)))
+
+            if compressed_offset:
+                index.append((compressed_offset, uncompressed_offset))
+            compressed_offset += length
+            uncompressed_offset += len(data)
+
+            data = source.read(block_size)
+
+        destination.write(_EOF_BLOCK)
+
+    write_gzi(f"{destination_path}{GZI_EXTENSION}", index)
+    with open(f"{destination_path}{SOURCE_EXTENSION}", "w") as stamp_file:
+        stamp_file.write(_source_stamp(source_path))
+
+
+class BgzfReader(io.RawIOBase):
+    """Binary file that reads the uncompressed data of a BGZF file.
+
+    The position of the file is a position of the uncompressed data, so `seek` and
+    `read` work as in an uncompressed file, but only the blocks that contain the
+    requested data are inflated. The last inflated blocks are cached.
+
+    If the `.gzi` index of the file does not exist it is generated reading the headers
+    of the blocks.
+
+    Parameters
+    ----------
+    path: str
+        Path of the BGZF file.
+    cache_size: int = 8
+        Number of inflated blocks that are cached.
+    """
+
+    def __init__(self, path: str, cache_size: int = 8):
+        super().__init__()
+        self.name = path
+        self._file = open(path, "rb")
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._position = 0
+
+        index = self._load_index(f"{path}{GZI_EXTENSION}")
+        self._compressed_offsets = [0] + [offsets[0] for offsets in index]
+        self._uncompressed_offsets = [0] + [offsets[1] for offsets in index]
+        self._file_size = os.path.getsize(path)
+
+    def _load_index(self, index_path: str) -> list:
+        """Reads the index of the file, if the index does not exist it is generated and
+        saved.
+
+        Parameters
+        ----------
+        index_path: str
+            Path of the index file.
+
+        Returns
+        -------
+        List of pairs (compressed offset, uncompressed offset) of each block, without
+        the first block.
+        """
+        if os.path.isfile(index_path):
+            return read_gzi(index_path)
+
+        logging.info("Generating bgzf index")
+        index = build_gzi(self.name)
+        try:
+            write_gzi(index_path, index)
+        except OSError as error:
+            logging.warning(f"Bgzf index could not be saved: {error}")
+
+        return index
+
+    def _block(self, block: int) -> bytes:
+        """Returns the uncompressed data of a block.
+
+        Parameters
+        ----------
+        block: int
+            Number of the block.
+
+        Returns
+        -------
+        Uncompressed data of the block.
+        """
+        if block in self._cache:
+            self._cache.move_to_end(block)
+            return self._cache[block]
+
+        start = self._compressed_offsets[block]
+        end = self._file_size
+        if block + 1 < len(self._compressed_offsets):
+            end = self._compressed_offsets[block + 1]
+
+        self._file.seek(start)
+        compressed = self._file.read(end - start)
+        members = []
+        while compressed:
+            decompressor = zlib.decompressobj(31)
+            members.append(decompressor.decompress(compressed))
+            compressed = decompressor.unused_data
+        data = b"".join(members)
+
+        self._cache[block] = data
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            raise io.UnsupportedOperation("Seeking from the end is not supported")
+
+        self._position = max(offset, 0)
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        block = bisect_right(self._uncompressed_offsets, self._position) - 1
+        result = []
+        while size != 0 and block < len(self._compressed_offsets):
+            data = self._block(block)
+            start = self._position - self._uncompressed_offsets[block]
+            end = len(data) if size < 0 else min(len(data), start + size)
+            if start < end:
+                result.append(data[start:end])
+                self._position += end - start
+                size -= end - start if size > 0 else 0
+            block += 1
+
+        return b"".join(result)
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+from src.fasta.chromosome import Chromosome
+
+
+class BgzfChromosome(Chromosome):
+    """Chromosome that gets the sequences from a BGZF compressed fasta file.
+
+    The fasta file is read through a `src.fasta.bgzf.BgzfReader`, so only the blocks
+    that contain the sequence are inflated.
+
+    Parameters
+    ----------
+    fasta_file: BgzfReader
+        Reader of the BGZF fasta file.
+    name: str
+        Name of the chromosome.
+    line_length: int
+        Line length of the chromosome.
+    label_length: int
+        Length of the first line of the chromosome.
+    index_start: int
+        Index where the chrosomosme starts on the FASTA file.
+    length: int
+        Length of the chromosome.
+    """
+
+    def _get_from_interval(self, starts: int, length: int) -> str:
+        """Returns a sequence that starts at a given index of the fasta file and has a
+        given length.
+
+        Parameters
+        ----------
+        length : int
+            Length of the sequence.
+        starts : int
+            Index of the fasta file where the sequence starts.
+
+        Returns
+        -------
+        The sequence.
+        """
+        ends = self._get_interval_end(starts, length)
+
+        self.fasta_file.seek(starts, 0)
+        return self._decode(self.fasta_file.read(ends - starts))
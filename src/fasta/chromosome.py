@@ -1,5 +1,11 @@
+import string
 from typing import TextIO
 
+UPPERCASE_TABLE: bytes = bytes.maketrans(
+    string.ascii_lowercase.encode(), string.ascii_uppercase.encode()
+)
+"""Translation table that changes lowercase symbols to uppercase symbols."""
+
 
 class Chromosome(object):
     """Class that represents a chromosome.
@@ -86,6 +92,84 @@ class Chromosome(object):
 
         return [pref, nucleotide, suff]
 
+    def sequences(
+        self,
+        nucleotides: list,
+        positions: list,
+        from_nuc: int,
+        to_nuc: int,
+        max_region_length: int = 1 << 20,
+    ) -> list:
+        """Gets many sequences from the fasta file by the positions of nucleotides on
+        the chromosome, with a specified prefix length and suffix length.
+
+        The windows of the sequences are sorted by position and the overlapping windows
+        are merged into regions of at most `max_region_length` nucleotides (unless a
+        single window is longer), so each region of the chromosome is read only once.
+
+        Parameters
+        ----------
+        nucleotides : list
+            Labels of the nucleotides.
+        positions : list
+            Positions of the nucleotides on the chromosome.
+        from_nuc : int
+            Length of the prefix of the sequences.
+        to_nuc : int
+            Length of the suffix of the sequences.
+        max_region_length : int = 1048576
+            Maximum length of the regions read from the fasta file.
+
+        Raises
+        ------
+        IndexError
+            When a position is wrong or invalid.
+
+        Returns
+        -------
+        The sequences divided in (prefix, nucleotide, suffix), in the same order than
+        the positions.
+        """
+        lengths = [len(nucleotide) for nucleotide in nucleotides]
+        for pos, length in zip(positions, lengths):
+            # The suffix starts after the nucleotide, so it must be in the chromosome
+            if pos < 0 or pos + length > self.length - 1:
+                raise IndexError(
+                    f"Invalid index, must be in the interval {0}-{self.length - 1}"
+                )
+
+        windows = sorted(
+            (max(pos - from_nuc, 0), min(pos + length + to_nuc, self.length), i)
+            for i, (pos, length) in enumerate(zip(positions, lengths))
+        )
+
+        regions = []
+        for window in windows:
+            start, end, _ = window
+            if regions and start <= regions[-1][1]:
+                region = regions[-1]
+                if max(end, region[1]) - region[0] <= max_region_length:
+                    region[1] = max(end, region[1])
+                    region[2].append(window)
+                    continue
+
+            regions.append([start, end, [window]])
+
+        result = [None] * len(windows)
+        for region_start, region_end, region_windows in regions:
+            region = self._get_sequence(region_start, region_end - region_start)
+
+            for start, end, i in region_windows:
+                pos = positions[i] - region_start
+                length = lengths[i]
+                result[i] = [
+                    region[start - region_start : pos],
+                    region[pos : pos + length],
+                    region[pos + length : end - region_start],
+                ]
+
+        return result
+
     def _get_nucleotide_index(self, pos: int) -> int:
         """Gets the index of a nucleotide by its position in a chromosome.
 
@@ -116,6 +200,46 @@ class Chromosome(object):
         # we use seek)
         return pos + index_start + label_length + num_new_lines
 
+    def _get_interval_end(self, starts: int, length: int) -> int:
+        """Returns the index of the fasta file where a sequence that starts at a given
+        index of the fasta file and has a given length ends, taking into account the
+        new line characters of the sequence.
+
+        Parameters
+        ----------
+        starts : int
+            Index of the fasta file where the sequence starts.
+        length : int
+            Length of the sequence.
+
+        Returns
+        -------
+        Index of the fasta file after the last nucleotide of the sequence.
+        """
+        if length <= 0:
+            return starts
+
+        line_length = self.line_length
+        column = (starts - self.index_start - self.label_length) % (line_length + 1)
+
+        return starts + length + (column + length - 1) // line_length
+
+    @staticmethod
+    def _decode(sequence: bytes) -> str:
+        """Removes the new line characters of a sequence read from the fasta file in
+        binary mode and returns the sequence in uppercase.
+
+        Parameters
+        ----------
+        sequence : bytes
+            Sequence read from the fasta file.
+
+        Returns
+        -------
+        The sequence.
+        """
+        return sequence.translate(UPPERCASE_TABLE, b"\n").decode("ascii")
+
     def _get_from_interval(self, starts: int, length: int) -> str:
         """Returns a sequence that starts at a given index of the fasta file and has a
         given length.
@@ -147,6 +271,23 @@ class Chromosome(object):
 
         return sequence.upper()
 
+    def _get_sequence(self, start: int, length: int) -> str:
+        """Returns a sequence that starts at a given position of the chromosome and has
+        a given length.
+
+        Parameters
+        ----------
+        start : int
+            Position of the chromosome where the sequence starts.
+        length : int
+            Length of the sequence.
+
+        Returns
+        -------
+        The sequence.
+        """
+        return self._get_from_interval(self._get_nucleotide_index(start), length)
+
     def __getitem__(self, key):
         if isinstance(key, (int)):
             key = slice(key, key + 1, None)
@@ -167,8 +308,7 @@ class Chromosome(object):
         if stop > self.length:
             stop = self.length
 
-        length = stop - start
-        return self._get_from_interval(self._get_nucleotide_index(start), length)
+        return self._get_sequence(start, stop - start)
 
     def __ln__(self):
         return self.length
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+
+FASTA_INDEX_EXTENSION = ".fai"
+"""Extension of the index file, appended to the name of the FASTA file."""
+
+FASTA_LABELS_EXTENSION = ".fai.labels"
+"""Extension of the labels file of the index, appended to the name of the FASTA
+file."""
+
+_STAMP_PREFIX = "#"
+
+
+class FastaIndex(object):
+    """Sidecar index of a FASTA file, so the chromosomes of the file can be obtained
+    without reading the whole FASTA file.
+
+    The index file is a samtools [faidx](http://www.htslib.org/doc/faidx.html) index,
+    so it can be shared with other tools. Each line describes a chromosome:
+
+    ```
+        NAME  LENGTH  OFFSET  LINEBASES  LINEWIDTH
+    ```
+
+    The label lines of the chromosomes are not part of the faidx format, so they are
+    stored in a second file with the `.fai.labels` extension, one label line per
+    chromosome in the same order than the index. The first line of this file stores
+    the size and the modification time of the FASTA file when the index was generated.
+    If the FASTA file changes, the index is not valid anymore and it has to be
+    generated again.
+
+    For example, the index of a FASTA file with two chromosomes will be:
+
+    ```
+        chr1	29	8	29	30
+        chr2	36	46	36	37
+    ```
+
+    And its labels file:
+
+    ```
+        #size=66 mtime=1620000000000000000
+        chr1 1
+        chr2 2
+    ```
+
+    Only FASTA files with `\\n` line endings are indexed.
+
+    Parameters
+    ----------
+    fasta_path: str
+        Path of the FASTA file.
+    """
+
+    def __init__(self, fasta_path: str):
+        self.fasta_path = fasta_path
+        self.path = f"{fasta_path}{FASTA_INDEX_EXTENSION}"
+        self.labels_path = f"{fasta_path}{FASTA_LABELS_EXTENSION}"
+
+    def _stamp(self) -> str:
+        """Generates the line that identifies the version of the FASTA file.
+
+        Returns
+        -------
+        The stamp line of the FASTA file.
+        """
+        stat = os.stat(self.fasta_path)
+        return f"{_STAMP_PREFIX}size={stat.st_size} mtime={stat.st_mtime_ns}\n"
+
+    def read(self) -> dict:
+        """Reads the chromosomes information from the index file.
+
+        The result has the same format than the result of
+        `src.fasta.fastaReader.FastaReader._parse_chromosomes`.
+
+        Returns
+        -------
+        The chromosomes information or None if the index does not exist or is not
+        valid for the FASTA file.
+        """
+        if not os.path.isfile(self.path) or not os.path.isfile(self.labels_path):
+            return None
+
+        with open(self.labels_path, "r") as labels_file:
+            if labels_file.readline() != self._stamp():
+                logging.info("Fasta index is outdated")
+                return None
+            labels = [line.rstrip("\n") for line in labels_file]
+
+        with open(self.path, "r") as index_file:
+            lines = index_file.readlines()
+
+        if len(lines) != len(labels):
+            logging.warning("Fasta index and its labels do not match")
+            return None
+
+        result = {}
+        for line, label in zip(lines, labels):
+            columns = line.rstrip("\n").split("\t")
+            try:
+                length, offset, line_length, line_width = map(int, columns[1:5])
+            except ValueError:
+                logging.warning(f"Invalid fasta index line: {line}")
+                return None
+
+            if len(columns) != 5 or line_width != line_length + 1:
+                logging.warning(f"Invalid fasta index line: {line}")
+                return None
+
+            label_length = len(label) + 2
+            labels_list = label.split()
+            name = labels_list[len(labels_list) - 1]
+            result[name] = {
+                "name": name,
+                "line_length": line_length,
+                "label_length": label_length,
+                "index_start": offset - label_length,
+                "length": length,
+                "labels": labels_list,
+            }
+
+        return result
+
+    def write(self, chromosomes: dict, labels: dict) -> bool:
+        """Writes the chromosomes information into the index file and the labels
+        file.
+
+        Parameters
+        ----------
+        chromosomes: dict
+            Chromosomes information as it is generated by
+            `src.fasta.fastaReader.FastaReader._parse_chromosomes`.
+        labels: dict
+            Label line of each chromosome, without the `>` symbol.
+
+        Returns
+        -------
+        True if the index has been written, otherwise False.
+        """
+        try:
+            with open(self.path, "w") as index_file:
+                for name, chromosome in chromosomes.items():
+                    offset = chromosome["index_start"] + chromosome["label_length"]
+                    line_length = int(chromosome["line_length"])
+                    index_file.write(
+                        f"{labels[name].split()[0]}\t{chromosome['length']}\t"
+                        f"{offset}\t{line_length}\t{line_length + 1}\n"
+                    )
+
+            with open(self.labels_path, "w") as labels_file:
+                labels_file.write(self._stamp())
+                for name in chromosomes:
+                    labels_file.write(f"{labels[name]}\n")
+        except OSError as error:
+            logging.warning(f"Fasta index could not be saved: {error}")
+            return False
+
+        return True
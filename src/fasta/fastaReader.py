@@ -2,10 +2,22 @@
 
 import gzip
 import logging
+import mmap
 import os
-import shutil
 
+from src.constants.constants import FILE_STORAGE, MMAP_STORAGE, PACKED_STORAGE
+from src.fasta.bgzf import (
+    BGZF_EXTENSION,
+    BgzfReader,
+    convert_to_bgzf,
+    is_bgzf,
+    is_converted,
+)
+from src.fasta.bgzfChromosome import BgzfChromosome
 from src.fasta.chromosome import Chromosome
+from src.fasta.fastaIndex import FastaIndex
+from src.fasta.mmapChromosome import MmapChromosome
+from src.fasta.packedChromosome import PackedChromosome
 from src.logging.tqdmLoggingHandler import TqdmLoggingHandler
 from tqdm import tqdm
 
@@ -39,10 +51,23 @@ class FastaReader(object):
         sequence_string = chr[2:9]
     ```
 
+    The information of the chromosomes is stored in an index file next to the fasta file
+    (see `src.fasta.fastaIndex.FastaIndex`), so the fasta file is only read completely
+    the first time or when the fasta file changes.
+
     Parameters
     ----------
     fasta_path : str
         Path of the fasta file.
+    use_index : bool = True
+        If true the chromosomes are read from the index file and the index file is
+        generated when it does not exist or is outdated.
+    storage : str = "file"
+        How the sequences are read from the fasta file: `"file"` seeks and reads the
+        file, `"mmap"` slices a memory map of the file (see
+        `src.fasta.mmapChromosome.MmapChromosome`) and `"packed"` loads the
+        chromosomes in memory with 2 bits per nucleotide (see
+        `src.fasta.packedChromosome.PackedChromosome`).
     """
 
     chromosomes: dict = {}
@@ -58,32 +83,80 @@ class FastaReader(object):
     fasta_filename: str = None
     """Name of the fasta file"""
 
-    def __init__(self, fasta_path: str):
+    _storages: dict = {
+        FILE_STORAGE: Chromosome,
+        MMAP_STORAGE: MmapChromosome,
+        PACKED_STORAGE: Chromosome,
+    }
+    """Mapping between the storages and the class of the chromosomes that read the
+    fasta file."""
+
+    def __init__(
+        self, fasta_path: str, use_index: bool = True, storage: str = FILE_STORAGE
+    ):
+        if storage not in self._storages:
+            raise ValueError(f"Invalid fasta storage {storage}")
+
         logging.info("Loading fasta file")
         self.fasta_filename = fasta_path.replace(".gz", "")
+        self.storage = storage
 
         logging.info("Loading fasta information")
         self._set_fasta_file(fasta_path)
-        self._parse_chromosomes()
+
+        if not use_index:
+            self._parse_chromosomes()
+            return
+
+        index = FastaIndex(self.fasta_source)
+        chromosomes = index.read()
+        if chromosomes is None:
+            chromosomes = self._parse_chromosomes()
+            index.write(chromosomes, self._label_lines)
+        else:
+            logging.info("Fasta information loaded from index")
+            self._set_chromosomes(chromosomes)
 
     def _set_fasta_file(self, fasta_path: str):
-        """Gets the fasta file from gz file and unzip the file to get the complete fasta
-        file. If there is a unziped file with the same name without .gz extension, the
-        class use that file instead of unzip the gz one.
+        """Opens the fasta file. If there is an unziped file with the same name without
+        .gz extension, the class uses that file.
+
+        Otherwise, the gz file is read in place if it is compressed with BGZF, only
+        inflating the blocks that are read (see `src.fasta.bgzf.BgzfReader`). If the gz
+        file is compressed with gzip, it is converted once into a BGZF file with the
+        same name and `.bgz` extension, which is used instead of the gz file.
 
         Parameters
         ----------
         fasta_path : str
             Path of the fasta file.
         """
-        if not os.path.isfile(self.fasta_filename):
-            logging.info("Unzip fasta gz file")
-            self.fasta_file = gzip.open(fasta_path, "r")
+        self.is_compressed = False
+        self.fasta_source = self.fasta_filename
 
-            with open(self.fasta_filename, "wb") as f_out:
-                shutil.copyfileobj(self.fasta_file, f_out)
+        if os.path.isfile(self.fasta_filename):
+            self.fasta_file = open(self.fasta_filename, "r", newline="")
 
-        self.fasta_file = open(self.fasta_filename, "r")
+            if self.storage == MMAP_STORAGE:
+                self.fasta_map = mmap.mmap(
+                    self.fasta_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            return
+
+        self.is_compressed = True
+        self.fasta_source = fasta_path
+
+        if not is_bgzf(fasta_path):
+            self.fasta_source = f"{self.fasta_filename}{BGZF_EXTENSION}"
+
+            if not is_converted(fasta_path, self.fasta_source):
+                logging.info("Converting fasta gz file into bgzf")
+                convert_to_bgzf(fasta_path, self.fasta_source)
+
+        if self.storage == MMAP_STORAGE:
+            logging.warning("A compressed fasta file can not be memory mapped")
+
+        self.fasta_file = BgzfReader(self.fasta_source)
 
     def _parse_chromosomes(self) -> dict:
         """Create all Cromosmes of he FASTA file and append it to a dictionary with the
@@ -102,9 +175,13 @@ class FastaReader(object):
         Returns
         -------
         Chromosomes.
+
+        Raises
+        ------
+        ValueError
+            If the fasta file has `\\r\\n` line endings.
         """
-        self._chromosomes_list = []
-        self.chromosomes = {}
+        self._label_lines = {}
         logger = logging.getLogger()
         tqdm_out = TqdmLoggingHandler(logger, level=logging.INFO)
 
@@ -113,10 +190,19 @@ class FastaReader(object):
         length = 0
         result = {}
         current_chromosome = False
-        self.fasta_file.seek(0, 0)
-        for i in tqdm(self.fasta_file, file=tqdm_out):
+
+        fasta_lines = self.fasta_file
+        if self.is_compressed:
+            fasta_lines = gzip.open(self.fasta_source, "rt", newline="")
+
+        fasta_lines.seek(0, 0)
+        for i in tqdm(fasta_lines, file=tqdm_out):
             lines += 1
             if i.startswith(">"):
+                if i.endswith("\r\n"):
+                    raise ValueError(
+                        "Fasta files with \\r\\n line endings are not supported"
+                    )
                 if current_chromosome:
                     result[current_chromosome]["length"] = length
                 length = 0
@@ -124,7 +210,7 @@ class FastaReader(object):
                 labels = i.rstrip().replace(">", "").split()
                 current_chromosome = labels[len(labels) - 1]
 
-                self._chromosomes_list.append(current_chromosome)
+                self._label_lines[current_chromosome] = i[1:].rstrip("\n")
                 result[current_chromosome] = {
                     "name": current_chromosome,
                     "line_length": False,
@@ -133,8 +219,6 @@ class FastaReader(object):
                     "length": False,
                     "labels": labels,
                 }
-                for label in labels:
-                    self._labels[label] = current_chromosome
                 is_populated = False
                 index += len(i)
                 continue
@@ -151,20 +235,49 @@ class FastaReader(object):
 
         result[current_chromosome]["length"] = length
 
-        for i in result:
-            chromosome = Chromosome(
-                self.fasta_file,
+        if self.is_compressed:
+            fasta_lines.close()
+
+        self._set_chromosomes(result)
+
+        return result
+
+    def _set_chromosomes(self, chromosomes: dict) -> None:
+        """Creates the `src.fasta.chromosome.Chromosome` objects from the information of
+        the chromosomes and maps every label to its chromosome.
+
+        Parameters
+        ----------
+        chromosomes: dict
+            Information of the chromosomes, as it is returned by `_parse_chromosomes`.
+        """
+        self._chromosomes_list = []
+        self.chromosomes = {}
+
+        chromosome_class = self._storages[self.storage]
+        source = self.fasta_file
+        if self.is_compressed:
+            chromosome_class = BgzfChromosome
+        elif self.storage == MMAP_STORAGE:
+            source = self.fasta_map
+
+        for i in chromosomes:
+            chromosome = chromosome_class(
+                source,
                 name=i,
-                line_length=result[i]["line_length"],
-                label_length=result[i]["label_length"],
-                index_start=result[i]["index_start"],
-                length=result[i]["length"],
-                labels=result[i]["labels"],
+                line_length=chromosomes[i]["line_length"],
+                label_length=chromosomes[i]["label_length"],
+                index_start=chromosomes[i]["index_start"],
+                length=chromosomes[i]["length"],
+                labels=chromosomes[i]["labels"],
             )
+            if self.storage == PACKED_STORAGE:
+                chromosome = PackedChromosome(chromosome)
 
+            self._chromosomes_list.append(i)
             self.chromosomes[i] = chromosome
-
-        return result
+            for label in chromosomes[i]["labels"]:
+                self._labels[label] = i
 
     def __getitem__(self, key):
         assert isinstance(key, str)
@@ -200,3 +313,35 @@ class FastaReader(object):
         The sequence divided in (prefix, nucleotide, suffix).
         """
         return self[chromosome].sequence(nucleotide, pos, from_nuc, to_nuc)
+
+    def sequences(
+        self,
+        chromosome: str,
+        nucleotides: list,
+        positions: list,
+        from_nuc: int,
+        to_nuc: int,
+    ) -> list:
+        """Gets many sequences from the fasta file by the positions of nucleotides on a
+        chromosome, with a specified prefix length and suffix length. Each region of the
+        chromosome is read only once (see `src.fasta.chromosome.Chromosome.sequences`).
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome where the sequences are going to be obtained.
+        nucleotides : list
+            Labels of the nucleotides.
+        positions : list
+            Positions of the nucleotides on the chromosome.
+        from_nuc : int
+            Length of the prefix of the sequences.
+        to_nuc : int
+            Length of the suffix of the sequences.
+
+        Returns
+        -------
+        The sequences divided in (prefix, nucleotide, suffix), in the same order than
+        the positions.
+        """
+        return self[chromosome].sequences(nucleotides, positions, from_nuc, to_nuc)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import mmap
+
+from src.fasta.chromosome import Chromosome
+
+
+class MmapChromosome(Chromosome):
+    """Chromosome that gets the sequences from a memory-mapped fasta file.
+
+    The indexes of the first and the last nucleotide of a sequence on the fasta file are
+    computed from the line length of the chromosome, so every sequence is obtained
+    slicing the memory map once, without seeking or reading the file.
+
+    Parameters
+    ----------
+    fasta_file: mmap
+        Memory map of the fasta file.
+    name: str
+        Name of the chromosome.
+    line_length: int
+        Line length of the chromosome.
+    label_length: int
+        Length of the first line of the chromosome.
+    index_start: int
+        Index where the chrosomosme starts on the FASTA file.
+    length: int
+        Length of the chromosome.
+    """
+
+    def __init__(
+        self,
+        fasta_file: mmap.mmap,
+        name: str,
+        line_length: int,
+        label_length: int,
+        index_start: int,
+        length: int,
+        labels: list = False,
+    ) -> None:
+        super().__init__(
+            fasta_file, name, line_length, label_length, index_start, length, labels
+        )
+        self._view = memoryview(fasta_file)
+
+    def _get_from_interval(self, starts: int, length: int) -> str:
+        """Returns a sequence that starts at a given index of the fasta file and has a
+        given length.
+
+        Parameters
+        ----------
+        length : int
+            Length of the sequence.
+        starts : int
+            Index of the fasta file where the sequence starts.
+
+        Returns
+        -------
+        The sequence.
+        """
+        ends = self._get_interval_end(starts, length)
+
+        return self._decode(self._view[starts:ends].tobytes())
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from src.fasta.chromosome import Chromosome
+
+SYMBOLS: np.ndarray = np.frombuffer(b"ACGT", dtype=np.uint8)
+"""Symbols of the nucleotides that are packed, the index of each symbol is its code."""
+
+_AMBIGUOUS = 255
+
+# Code of each byte, lowercase symbols have the code of the uppercase symbol and any
+# other symbol is ambiguous
+_CODES = np.full(256, _AMBIGUOUS, dtype=np.uint8)
+_CODES[SYMBOLS] = np.arange(SYMBOLS.size)
+_CODES[SYMBOLS + 32] = np.arange(SYMBOLS.size)
+
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+
+
+class PackedChromosome(Chromosome):
+    """Chromosome that stores its sequence in memory, packed in a numpy array with 2
+    bits per nucleotide (4 nucleotides per byte).
+
+    The nucleotides A, C, G and T are packed with the codes 0, 1, 2 and 3. Any other
+    symbol (N, R, Y, ...) is stored in a side table of runs of the same symbol, so a
+    chromosome uses about a quarter of its length in memory and every sequence is
+    decoded slicing the packed array.
+
+    The chromosome is packed reading the sequence of another chromosome in chunks of
+    `chunk_size` nucleotides.
+
+    For example, the sequence `ACGTNNA` is stored as:
+
+    ```python
+        packed = array([0b00011011, 0b00000000], dtype=uint8)
+        ambiguous_starts = array([4])
+        ambiguous_ends = array([6])
+        ambiguous_symbols = b"N"
+    ```
+
+    Parameters
+    ----------
+    chromosome: Chromosome
+        Chromosome whose sequence is packed.
+    chunk_size: int = 4194304
+        Number of nucleotides read from the chromosome at once, it is rounded to a
+        multiple of 4.
+    """
+
+    def __init__(self, chromosome: Chromosome, chunk_size: int = 1 << 22) -> None:
+        super().__init__(
+            chromosome.fasta_file,
+            chromosome.name,
+            chromosome.line_length,
+            chromosome.label_length,
+            chromosome.index_start,
+            chromosome.length,
+            chromosome.labels,
+        )
+
+        self._pack(chromosome, max(chunk_size - chunk_size % 4, 4))
+
+    def _pack(self, chromosome: Chromosome, chunk_size: int) -> None:
+        """Packs the sequence of a chromosome.
+
+        Parameters
+        ----------
+        chromosome: Chromosome
+            Chromosome whose sequence is packed.
+        chunk_size: int
+            Number of nucleotides read from the chromosome at once, it must be a
+            multiple of 4.
+        """
+        self.packed = np.zeros((self.length + 3) // 4, dtype=np.uint8)
+        starts = []
+        ends = []
+        symbols = []
+
+        for chunk_start in range(0, self.length, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, self.length)
+            sequence = chromosome[chunk_start:chunk_end].encode("ascii")
+            codes = _CODES[np.frombuffer(sequence, dtype=np.uint8)]
+
+            ambiguous = np.flatnonzero(codes == _AMBIGUOUS)
+            if ambiguous.size:
+                run_symbols = np.frombuffer(sequence, dtype=np.uint8)[ambiguous]
+                # A run ends when the next ambiguous nucleotide is not contiguous or it
+                # has another symbol
+                breaks = np.flatnonzero(
+                    (np.diff(ambiguous) != 1) | (np.diff(run_symbols) != 0)
+                )
+                run_starts = np.concatenate(([0], breaks + 1))
+                run_ends = np.concatenate((breaks, [ambiguous.size - 1]))
+
+                starts.append(ambiguous[run_starts] + chunk_start)
+                ends.append(ambiguous[run_ends] + chunk_start + 1)
+                symbols.append(run_symbols[run_starts])
+                codes[ambiguous] = 0
+
+            codes = np.pad(codes, (0, -codes.size % 4)).reshape(-1, 4)
+            self.packed[chunk_start // 4 : (chunk_end + 3) // 4] = np.bitwise_or.reduce(
+                codes << _SHIFTS, axis=1
+            )
+
+        self.ambiguous_starts = np.concatenate(starts or [[]]).astype(np.int64)
+        self.ambiguous_ends = np.concatenate(ends or [[]]).astype(np.int64)
+        self.ambiguous_symbols = np.concatenate(symbols or [[]]).astype(np.uint8)
+
+    def _get_sequence(self, start: int, length: int) -> str:
+        """Returns a sequence that starts at a given position of the chromosome and has
+        a given length, decoding it from the packed array.
+
+        Parameters
+        ----------
+        start : int
+            Position of the chromosome where the sequence starts.
+        length : int
+            Length of the sequence.
+
+        Raises
+        ------
+        IndexError
+            When the start position is wrong or invalid.
+
+        Returns
+        -------
+        The sequence.
+        """
+        if start > self.length - 1 or start < 0:
+            raise IndexError(
+                f"Invalid index, must be in the interval {0}-{self.length - 1}"
+            )
+
+        if length <= 0:
+            return ""
+
+        end = start + length
+        packed = self.packed[start // 4 : (end + 3) // 4]
+        codes = ((packed[:, None] >> _SHIFTS) & 3).ravel()
+        sequence = SYMBOLS[codes[start % 4 : start % 4 + length]]
+
+        first = np.searchsorted(self.ambiguous_ends, start, side="right")
+        last = np.searchsorted(self.ambiguous_starts, end, side="left")
+        for run in range(first, last):
+            run_start = max(self.ambiguous_starts[run], start) - start
+            run_end = min(self.ambiguous_ends[run], end) - start
+            sequence[run_start:run_end] = self.ambiguous_symbols[run]
+
+        return sequence.tobytes().decode("ascii")
+
+    def _get_from_interval(self, starts: int, length: int) -> str:
+        """Returns a sequence that starts at a given index of the fasta file and has a
+        given length.
+
+        Parameters
+        ----------
+        length : int
+            Length of the sequence.
+        starts : int
+            Index of the fasta file where the sequence starts.
+
+        Returns
+        -------
+        The sequence.
+        """
+        offset = starts - self.index_start - self.label_length
+        start = offset - offset // (self.line_length + 1)
+
+        return self._get_sequence(start, length)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import os
+import pathlib
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.fasta.bgzf import (
+    GZI_EXTENSION,
+    BgzfReader,
+    build_gzi,
+    convert_to_bgzf,
+    is_bgzf,
+    is_converted,
+    read_gzi,
+)
+from src.fasta.bgzfChromosome import BgzfChromosome
+from src.fasta.fastaReader import FastaReader
+
+
+class TestBgzf(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.gzip_path = f"{self.temporal_dir.name}/test.fa.gz"
+        self.bgzf_path = f"{self.temporal_dir.name}/test.bgz"
+
+        with open(f"{self.static_dir}test.fa", "rb") as fasta_file:
+            self.data = fasta_file.read()
+        with gzip.open(self.gzip_path, "wb") as gzip_file:
+            gzip_file.write(self.data)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_is_bgzf(self):
+        convert_to_bgzf(self.gzip_path, self.bgzf_path)
+
+        self.assertFalse(is_bgzf(self.gzip_path))
+        self.assertTrue(is_bgzf(self.bgzf_path))
+
+    def test_is_converted(self):
+        self.assertFalse(is_converted(self.gzip_path, self.bgzf_path))
+
+        convert_to_bgzf(self.gzip_path, self.bgzf_path)
+
+        self.assertTrue(is_converted(self.gzip_path, self.bgzf_path))
+
+        with gzip.open(self.gzip_path, "ab") as gzip_file:
+            gzip_file.write(b"ACGT\n")
+
+        self.assertFalse(is_converted(self.gzip_path, self.bgzf_path))
+
+    def test_convert_to_bgzf(self):
+        convert_to_bgzf(self.gzip_path, self.bgzf_path, block_size=16)
+
+        with gzip.open(self.bgzf_path, "rb") as bgzf_file:
+            result = bgzf_file.read()
+
+        self.assertEqual(result, self.data)
+
+    def test_build_gzi(self):
+        convert_to_bgzf(self.gzip_path, self.bgzf_path, block_size=16)
+        index = read_gzi(f"{self.bgzf_path}{GZI_EXTENSION}")
+
+        result = build_gzi(self.bgzf_path)
+
+        self.assertEqual(result, index)
+        self.assertEqual(result[0][1], 16)
+        self.assertEqual(len(result), (len(self.data) - 1) // 16)
+
+    def test_read(self):
+        convert_to_bgzf(self.gzip_path, self.bgzf_path, block_size=16)
+        reader = BgzfReader(self.bgzf_path, cache_size=2)
+
+        reader.seek(10)
+        result = reader.read(40)
+
+        self.assertEqual(result, self.data[10:50])
+        self.assertEqual(reader.tell(), 50)
+
+    def test_read_end(self):
+        convert_to_bgzf(self.gzip_path, self.bgzf_path, block_size=16)
+        reader = BgzfReader(self.bgzf_path)
+
+        reader.seek(len(self.data) - 5)
+        result = reader.read()
+
+        self.assertEqual(result, self.data[-5:])
+        self.assertEqual(reader.read(10), b"")
+
+    def test_read_without_index(self):
+        convert_to_bgzf(self.gzip_path, self.bgzf_path, block_size=16)
+        os.remove(f"{self.bgzf_path}{GZI_EXTENSION}")
+        reader = BgzfReader(self.bgzf_path)
+
+        reader.seek(20)
+        result = reader.read(30)
+
+        self.assertEqual(result, self.data[20:50])
+        self.assertTrue(os.path.isfile(f"{self.bgzf_path}{GZI_EXTENSION}"))
+
+
+class TestFastaReaderBgzf(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.gzip_path = f"{self.temporal_dir.name}/test.fa.gz"
+        self.fasta_path = f"{self.temporal_dir.name}/test.fa"
+
+        shutil.copyfile(f"{self.static_dir}test.fa", self.fasta_path)
+        with open(self.fasta_path, "rb") as fasta_file, gzip.open(
+            self.gzip_path, "wb"
+        ) as gzip_file:
+            shutil.copyfileobj(fasta_file, gzip_file)
+
+        self.reader = FastaReader(self.fasta_path, use_index=False)
+        os.remove(self.fasta_path)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_gzip(self):
+        reader = FastaReader(self.gzip_path)
+
+        self.assertEqual(reader.fasta_source, f"{self.fasta_path}.bgz")
+        self.assertFalse(os.path.isfile(self.fasta_path))
+        self.assertIsInstance(reader["chr3"], BgzfChromosome)
+
+    def test_gzip_outdated(self):
+        FastaReader(self.gzip_path)
+        stat = os.stat(self.gzip_path)
+        with open(self.fasta_path, "wb") as fasta_file:
+            fasta_file.write(b">chr1 1\nACGT\n")
+        with open(self.fasta_path, "rb") as fasta_file, gzip.open(
+            self.gzip_path, "wb"
+        ) as gzip_file:
+            shutil.copyfileobj(fasta_file, gzip_file)
+        os.remove(self.fasta_path)
+        os.utime(self.gzip_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        reader = FastaReader(self.gzip_path)
+
+        self.assertEqual(list(reader.chromosomes), ["1"])
+
+    def test_bgzf(self):
+        bgzf_path = f"{self.temporal_dir.name}/bgzf.fa.gz"
+        convert_to_bgzf(self.gzip_path, bgzf_path, block_size=16)
+
+        reader = FastaReader(bgzf_path)
+
+        self.assertEqual(reader.fasta_source, bgzf_path)
+        self.assertFalse(os.path.isfile(f"{self.fasta_path}.bgz"))
+
+    def test_chromosomes(self):
+        reader = FastaReader(self.gzip_path, use_index=False)
+
+        self.assertEqual(list(reader.chromosomes), list(self.reader.chromosomes))
+
+    def test_get_sequence(self):
+        bgzf_path = f"{self.temporal_dir.name}/bgzf.fa.gz"
+        convert_to_bgzf(self.gzip_path, bgzf_path, block_size=16)
+        reader = FastaReader(bgzf_path)
+
+        for chromosome in reader.chromosomes:
+            length = reader[chromosome].length
+            for pos in range(5, length - 10):
+                result = reader.sequence(chromosome, "A", pos, 5, 7)
+                expected = self.reader.sequence(chromosome, "A", pos, 5, 7)
+
+                self.assertEqual(result, expected)
@@ -115,6 +115,30 @@ class TestChromosomeCHR1(TestCase):
 
         self.assertEqual(result, sequence)
 
+    def test_sequences(self):
+        nucleotides = ["CA", "G", "AT", "G"]
+        positions = [5, 0, 26, 12]
+
+        result = self.chromosome.sequences(nucleotides, positions, 4, 5)
+
+        for nucleotide, pos, sequence in zip(nucleotides, positions, result):
+            self.assertEqual(sequence, self.chromosome.sequence(nucleotide, pos, 4, 5))
+
+    def test_sequences_regions(self):
+        nucleotides = ["C"] * 7
+        positions = [1, 25, 5, 9, 13, 17, 21]
+
+        result = self.chromosome.sequences(
+            nucleotides, positions, 2, 2, max_region_length=10
+        )
+
+        for nucleotide, pos, sequence in zip(nucleotides, positions, result):
+            self.assertEqual(sequence, self.chromosome.sequence(nucleotide, pos, 2, 2))
+
+    def test_sequences_invalid(self):
+        with self.assertRaises(IndexError):
+            self.chromosome.sequences(["G", "G"], [0, 28], 2, 2)
+
 
 class TestChromosomeCHR2(TestCase):
     def setUp(self) -> None:
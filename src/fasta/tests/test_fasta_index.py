@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pathlib
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.fasta.fastaIndex import FastaIndex
+from src.fasta.fastaReader import FastaReader
+
+
+class TestFastaIndex(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.fasta_path = f"{self.temporal_dir.name}/test2.fa"
+        shutil.copyfile(f"{self.static_dir}test2.fa", self.fasta_path)
+        self.index = FastaIndex(self.fasta_path)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_read_not_exists(self):
+        result = self.index.read()
+
+        self.assertIsNone(result)
+
+    def test_write(self):
+        lines = [
+            "chr1\t29\t8\t29\t30\n",
+            "chr2\t36\t46\t36\t37\n",
+            "chr3\t33\t91\t33\t34\n",
+        ]
+
+        FastaReader(self.fasta_path)
+
+        with open(self.index.path) as index_file:
+            result = index_file.readlines()
+
+        self.assertEqual(result, lines)
+
+    def test_write_labels(self):
+        lines = ["chr1 1\n", "chr2 2\n", "chr3 3\n"]
+
+        FastaReader(self.fasta_path)
+
+        with open(self.index.labels_path) as labels_file:
+            result = labels_file.readlines()
+
+        self.assertTrue(result[0].startswith("#size="))
+        self.assertEqual(result[1:], lines)
+
+    def test_read(self):
+        reader = FastaReader(self.fasta_path)
+        data = reader._parse_chromosomes()
+
+        result = self.index.read()
+
+        self.assertEqual(result, data)
+
+    def test_read_outdated(self):
+        FastaReader(self.fasta_path)
+        with open(self.fasta_path, "a") as fasta_file:
+            fasta_file.write(">chr4 4\nACGT\n")
+
+        result = self.index.read()
+
+        self.assertIsNone(result)
+
+    def test_read_labels_not_exists(self):
+        FastaReader(self.fasta_path)
+        os.remove(self.index.labels_path)
+
+        result = self.index.read()
+
+        self.assertIsNone(result)
+
+    def test_read_crlf_index(self):
+        FastaReader(self.fasta_path)
+        with open(self.index.path, "w") as index_file:
+            index_file.write("chr1\t29\t8\t29\t31\n")
+            index_file.write("chr2\t36\t46\t36\t38\n")
+            index_file.write("chr3\t33\t91\t33\t35\n")
+
+        result = self.index.read()
+
+        self.assertIsNone(result)
+
+    def test_fasta_reader_crlf(self):
+        with open(self.fasta_path, "rb") as fasta_file:
+            content = fasta_file.read()
+        with open(self.fasta_path, "wb") as fasta_file:
+            fasta_file.write(content.replace(b"\n", b"\r\n"))
+
+        with self.assertRaises(ValueError):
+            FastaReader(self.fasta_path)
+
+    def test_fasta_reader_uses_index(self):
+        FastaReader(self.fasta_path)
+        chromosome = "chr3"
+        nucleotide = "GC"
+        pos = 9
+        from_nuc = 9
+        to_nuc = 33
+        sequence = ["AGCTAGCTA", "GC", "TAGCTAGCTAGCTAGCTAGCTA"]
+
+        with patch.object(FastaReader, "_parse_chromosomes") as parse_chromosomes:
+            reader = FastaReader(self.fasta_path)
+        result = reader.sequence(chromosome, nucleotide, pos, from_nuc, to_nuc)
+
+        parse_chromosomes.assert_not_called()
+        self.assertEqual(result, sequence)
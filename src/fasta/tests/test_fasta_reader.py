@@ -3,7 +3,9 @@
 import pathlib
 from unittest import TestCase
 
+from src.constants.constants import MMAP_STORAGE
 from src.fasta.fastaReader import FastaReader
+from src.fasta.mmapChromosome import MmapChromosome
 
 
 class TestFastaReader(TestCase):
@@ -34,6 +36,19 @@ class TestFastaReader(TestCase):
 
         self.assertEqual(result, sequence)
 
+    def test_get_sequences(self):
+        chromosome = "chr3"
+        nucleotides = ["GC", "A"]
+        positions = [9, 0]
+        sequences = [
+            ["AGCTAGCTA", "GC", "TAGCTAGCTAGCTAGCTAGCTA"],
+            ["", "A", "GCTAGCTAGCTAGCTAGCTAGCTAGCTAGCTA"],
+        ]
+
+        result = self.reader.sequences(chromosome, nucleotides, positions, 9, 33)
+
+        self.assertEqual(result, sequences)
+
 
 class TestFastaReader1Line(TestCase):
     def setUp(self) -> None:
@@ -94,3 +109,32 @@ class TestFastaReader1Line(TestCase):
         result = self.reader.sequence(chromosome, nucleotide, pos, from_nuc, to_nuc)
 
         self.assertEqual(result, sequence)
+
+
+class TestFastaReaderMmap(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.reader = FastaReader(f"{self.static_dir}test.fa.gz", storage=MMAP_STORAGE)
+
+        return super().setUp()
+
+    def test_chromosomes(self):
+        result = self.reader["chr3"]
+
+        self.assertIsInstance(result, MmapChromosome)
+
+    def test_get_sequence(self):
+        chromosome = "chr3"
+        nucleotide = "GC"
+        pos = 9
+        from_nuc = 9
+        to_nuc = 33
+        sequence = ["AGCTAGCTA", "GC", "TAGCTAGCTAGCTAGCTAGCTA"]
+
+        result = self.reader.sequence(chromosome, nucleotide, pos, from_nuc, to_nuc)
+
+        self.assertEqual(result, sequence)
+
+    def test_invalid_storage(self):
+        with self.assertRaises(ValueError):
+            FastaReader(f"{self.static_dir}test.fa.gz", storage="invalid")
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import mmap
+import pathlib
+from unittest import TestCase
+
+from src.fasta.mmapChromosome import MmapChromosome
+
+
+class TestMmapChromosomeCHR1(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.sequence = "GCATGCATGCATGCATGCATGCATGCATG"
+        self.fasta_file = open(f"{self.static_dir}test.fa", "rb")
+        self.chromosome = MmapChromosome(
+            mmap.mmap(self.fasta_file.fileno(), 0, access=mmap.ACCESS_READ),
+            name="chr1",
+            line_length=12,
+            label_length=6,
+            index_start=0,
+            length=29,
+        )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.fasta_file.close()
+
+        return super().tearDown()
+
+    def test___getitem__(self):
+        sequence = self.sequence[0]
+
+        data = self.chromosome[0]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___no_start(self):
+        sequence = self.sequence[:24]
+
+        data = self.chromosome[:24]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___no_end(self):
+        sequence = self.sequence[4:]
+
+        data = self.chromosome[4:]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___all(self):
+        sequence = self.sequence[:]
+
+        data = self.chromosome[:]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___line_end(self):
+        sequence = self.sequence[11:13]
+
+        data = self.chromosome[11:13]
+
+        self.assertEqual(data, sequence)
+
+    def test__get_prefix(self):
+        pos = 13
+        length = 7
+        prefix = self.sequence[pos - length : pos]
+
+        data = self.chromosome[pos:-length]
+
+        self.assertEqual(data, prefix)
+
+    def test__get_interval_end(self):
+        index = 6
+        length = 13
+        end = 20
+
+        result = self.chromosome._get_interval_end(index, length)
+
+        self.assertEqual(result, end)
+
+    def test__get_from_interval(self):
+        index = 6
+        length = 29
+        sequence = "GCATGCATGCATGCATGCATGCATGCATG"
+
+        result = self.chromosome._get_from_interval(index, length)
+
+        self.assertEqual(result, sequence)
+
+
+class TestMmapChromosomeCHR3(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.sequence = "AGCTAGCTAGCTAGCTAGCTAGCTAGCTAGCTA"
+        self.fasta_file = open(f"{self.static_dir}test.fa", "rb")
+        self.chromosome = MmapChromosome(
+            mmap.mmap(self.fasta_file.fileno(), 0, access=mmap.ACCESS_READ),
+            name="chr3",
+            line_length=12,
+            label_length=6,
+            index_start=83,
+            length=33,
+        )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.fasta_file.close()
+
+        return super().tearDown()
+
+    def test___getitem___no_end(self):
+        sequence = self.sequence[4:]
+
+        data = self.chromosome[4:]
+
+        self.assertEqual(data, sequence)
+
+    def test_get_sequence(self):
+        nucleotide = "GC"
+        pos = 9
+        from_nuc = 9
+        to_nuc = 33
+        sequence = ["AGCTAGCTA", "GC", "TAGCTAGCTAGCTAGCTAGCTA"]
+
+        result = self.chromosome.sequence(nucleotide, pos, from_nuc, to_nuc)
+
+        self.assertEqual(result, sequence)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import pathlib
+import tempfile
+from unittest import TestCase
+
+from src.constants.constants import PACKED_STORAGE
+from src.fasta.chromosome import Chromosome
+from src.fasta.fastaReader import FastaReader
+from src.fasta.packedChromosome import PackedChromosome
+
+
+class TestPackedChromosomeCHR1(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.sequence = "GCATGCATGCATGCATGCATGCATGCATG"
+        self.fasta_file = open(f"{self.static_dir}test.fa", "r")
+        self.chromosome = PackedChromosome(
+            Chromosome(
+                self.fasta_file,
+                name="chr1",
+                line_length=12,
+                label_length=6,
+                index_start=0,
+                length=29,
+            ),
+            chunk_size=6,
+        )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.fasta_file.close()
+
+        return super().tearDown()
+
+    def test_packed(self):
+        self.assertEqual(len(self.chromosome.packed), 8)
+        self.assertEqual(self.chromosome.packed[0], 0b10010011)
+        self.assertEqual(len(self.chromosome.ambiguous_starts), 0)
+
+    def test___getitem__(self):
+        sequence = self.sequence[0]
+
+        data = self.chromosome[0]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___no_start(self):
+        sequence = self.sequence[:24]
+
+        data = self.chromosome[:24]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___no_end(self):
+        sequence = self.sequence[4:]
+
+        data = self.chromosome[4:]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___prefix(self):
+        sequence = self.sequence[5:14]
+
+        data = self.chromosome[14:-9]
+
+        self.assertEqual(data, sequence)
+
+    def test___getitem___all(self):
+        for start in range(len(self.sequence)):
+            for stop in range(start + 1, len(self.sequence) + 1):
+                data = self.chromosome[start:stop]
+
+                self.assertEqual(data, self.sequence[start:stop])
+
+    def test___getitem___invalid(self):
+        with self.assertRaises(IndexError):
+            self.chromosome[29:30]
+
+    def test_sequence(self):
+        sequence = ["CATG", "CA", "TGCAT"]
+
+        data = self.chromosome.sequence("CA", 5, 4, 5)
+
+        self.assertEqual(data, sequence)
+
+
+class TestPackedChromosomeAmbiguous(TestCase):
+    def setUp(self) -> None:
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.fasta_path = f"{self.temporal_dir.name}/ambiguous.fa"
+        self.sequence = "NNACGTRYNNNNacgtNACGTNNNNNNNNNNAC"
+        with open(self.fasta_path, "w") as fasta_file:
+            fasta_file.write(">chr1 1\n")
+            for i in range(0, len(self.sequence), 10):
+                fasta_file.write(f"{self.sequence[i:i + 10]}\n")
+
+        self.reader = FastaReader(
+            self.fasta_path, use_index=False, storage=PACKED_STORAGE
+        )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.reader.fasta_file.close()
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_chromosome(self):
+        result = self.reader["1"]
+
+        self.assertIsInstance(result, PackedChromosome)
+
+    def test_ambiguous(self):
+        chromosome = self.reader["1"]
+
+        self.assertEqual(list(chromosome.ambiguous_starts), [0, 6, 7, 8, 16, 21])
+        self.assertEqual(list(chromosome.ambiguous_ends), [2, 7, 8, 12, 17, 31])
+        self.assertEqual(bytes(chromosome.ambiguous_symbols), b"NRYNNN")
+
+    def test___getitem___all(self):
+        chromosome = self.reader["1"]
+        sequence = self.sequence.upper()
+
+        for start in range(len(sequence)):
+            for stop in range(start + 1, len(sequence) + 1):
+                data = chromosome[start:stop]
+
+                self.assertEqual(data, sequence[start:stop])
@@ -2,9 +2,10 @@
 
 
 from abc import ABC, abstractmethod
-from random import shuffle
+from random import Random, shuffle
 from typing import Callable, Union
 
+from src.parser.binaryPvcf import BinaryPvcfReader, is_binary_pvcf
 from src.utils.folders import parse_route
 
 
@@ -53,6 +54,10 @@ class AbstractModel(ABC):
         Path from where the results will be retrieved.
     """
 
+    _retrieved_samples: bool = False
+    """If true the parsed sequences of the samples are already retrieved, which happens
+    when the samples are read from a binary file or are cropped."""
+
     @abstractmethod
     def __init__(self, save_path: str, restore_path: str):
         self.save_path = parse_route(save_path)
@@ -81,8 +86,9 @@ class AbstractModel(ABC):
         pass
 
     @abstractmethod
-    def saver(self):
-        """Method that save the model in a file."""
+    def saver(self, step: int = None, **kwargs):
+        """Method that save the model in a file, if a step is given the file is
+        specific for that step."""
         if not self.save_path:
             raise AttributeError("Saver path is not defined")
 
@@ -95,9 +101,25 @@ class AbstractModel(ABC):
         if not self.restore_path:
             raise AttributeError("Loader path is not defined")
 
-    def get_samples(self, path: str, test_ratio: int, is_paired: bool = True) -> zip:
+    def get_samples(
+        self,
+        path: str,
+        test_ratio: int,
+        is_paired: bool = True,
+        prefix_length: int = None,
+        suffix_length: int = None,
+    ) -> zip:
         """Gets samples from a file that has a pair sample, one item per line.
 
+        The file can also be a binary columnar file (see
+        `src.parser.binaryPvcf.BinaryPvcfWriter`), which is read through a memory map
+        and whose parsed sequences do not need to be retrieved.
+
+        If `prefix_length` or `suffix_length` are given, the prefixes and suffixes of
+        the samples are cropped to those lengths (see `crop_samples`), so a file parsed
+        with long prefixes and suffixes can be used as if it was parsed with shorter
+        ones.
+
         Parameters
         ----------
         path: str
@@ -106,11 +128,31 @@ class AbstractModel(ABC):
             Ratio of training and test samples
         is_paired: bool
             Specifies if the file is paired and has two lines per sample.
+        prefix_length: int = None
+            Length of the prefixes of the samples, if None the prefixes are not cropped.
+        suffix_length: int = None
+            Length of the suffixes of the samples, if None the suffixes are not cropped.
 
         Returns
         -------
         Samples in a list of pairs.
         """
+        if is_paired and (prefix_length is not None or suffix_length is not None):
+            return self.crop_samples(
+                self.get_sample_windows(path), test_ratio, prefix_length, suffix_length
+            )
+
+        self._retrieved_samples = is_binary_pvcf(path)
+        if self._retrieved_samples:
+            reader = BinaryPvcfReader(path)
+            if not is_paired:
+                return reader.symbols()
+
+            self.samples = list(zip(reader.originals(), reader.symbols()))
+            self.training_length = int(len(self.samples) * test_ratio)
+
+            return self.samples
+
         with open(path) as samples_file:
             lines = samples_file.readlines()
 
@@ -125,14 +167,155 @@ class AbstractModel(ABC):
 
         return self.samples
 
-    def shuffle_samples(self):
+    def get_sample_windows(self, path: str) -> list:
+        """Gets the samples of a paired file with the lengths of their prefixes and
+        suffixes, so they can be cropped by `crop_samples` without reading the file
+        again.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file with the samples.
+
+        Returns
+        -------
+        List of tuples (original sequence, symbols of the parsed sequence, length of
+        the prefix, length of the suffix).
+        """
+        if is_binary_pvcf(path):
+            reader = BinaryPvcfReader(path)
+
+            return list(
+                zip(
+                    reader.originals(),
+                    reader.symbols(),
+                    reader.prefix_lengths.tolist(),
+                    reader.suffix_lengths.tolist(),
+                )
+            )
+
+        with open(path) as samples_file:
+            lines = samples_file.readlines()
+
+        windows = []
+        for original, parsed in zip(lines[::2], lines[1::2]):
+            prefix, infix, suffix = self.parser.retrive_sequence(parsed.rstrip())
+            windows.append(
+                (
+                    original.rstrip("\n"),
+                    f"{prefix}{infix}{suffix}",
+                    len(prefix),
+                    len(suffix),
+                )
+            )
+
+        return windows
+
+    def crop_samples(
+        self,
+        windows: list,
+        test_ratio: int,
+        prefix_length: int = None,
+        suffix_length: int = None,
+    ) -> list:
+        """Sets the samples from the samples returned by `get_sample_windows`, cropping
+        their prefixes and suffixes (see `_crop_sample`).
+
+        Parameters
+        ----------
+        windows: list
+            Samples with the lengths of their prefixes and suffixes.
+        test_ratio: int
+            Ratio of training and test samples
+        prefix_length: int = None
+            Length of the prefixes of the samples, if None the prefixes are not cropped.
+        suffix_length: int = None
+            Length of the suffixes of the samples, if None the suffixes are not cropped.
+
+        Returns
+        -------
+        Samples in a list of pairs.
+        """
+        self._retrieved_samples = True
+        self.samples = [
+            self._crop_sample(
+                original, symbols, prefix, suffix, prefix_length, suffix_length
+            )
+            for original, symbols, prefix, suffix in windows
+        ]
+        self.training_length = int(len(self.samples) * test_ratio)
+
+        return self.samples
+
+    @staticmethod
+    def _crop_sample(
+        original: str,
+        symbols: str,
+        prefix: int,
+        suffix: int,
+        prefix_length: int,
+        suffix_length: int,
+    ) -> tuple:
+        """Crops the prefix and the suffix of a sample to the given lengths.
+
+        Each nucleotide of the prefix and the suffix of the original sequence has a
+        symbol, so both sequences are cropped by the same number of characters. The
+        chromosome at the start of the original sequence and the infix at its end
+        (after `"|"`) are kept. For instance, if the sample has a prefix and a suffix of
+        length 3 and it is cropped to a prefix of 1 and a suffix of 2:
+
+        ```python
+            ("chr1\tACGTTCA|G", "qwefzxc") -> ("chr1\tGTTC|G", "efzx")
+        ```
+
+        Parameters
+        ----------
+        original: str
+            Original sequence.
+        symbols: str
+            Symbols of the parsed sequence.
+        prefix: int
+            Length of the prefix of the sample.
+        suffix: int
+            Length of the suffix of the sample.
+        prefix_length: int
+            Length of the cropped prefix, if None the prefix is not cropped.
+        suffix_length: int
+            Length of the cropped suffix, if None the suffix is not cropped.
+
+        Returns
+        -------
+        Pair (original sequence, symbols) cropped.
+        """
+        start = 0 if prefix_length is None else max(prefix - prefix_length, 0)
+        end = 0 if suffix_length is None else max(suffix - suffix_length, 0)
+
+        symbols = symbols[start : len(symbols) - end]
+
+        chromosome, tab, sequence = original.rpartition("\t")
+        sequence, separator, infix = sequence.partition("|")
+        if sequence:
+            sequence = sequence[start : len(sequence) - end]
+
+        return f"{chromosome}{tab}{sequence}{separator}{infix}", symbols
+
+    def shuffle_samples(self, seed: int = None):
         """Shuffle the samples.
 
+        Parameters
+        ----------
+        seed: int = None
+            Seed of the shuffle, if None the samples are shuffled with the global
+            random generator.
+
         Returns
         -------
         Samples that have been shuffled.
         """
-        shuffle(self.samples)
+        if seed is None:
+            shuffle(self.samples)
+        else:
+            Random(seed).shuffle(self.samples)
 
     def get_training_samples(self, is_paired: bool = True, index: int = 1) -> list:
         """Generates the samples training data from the total of samples.
@@ -184,6 +367,9 @@ class AbstractModel(ABC):
         -------
         The sequence in a string format.
         """
+        if self._retrieved_samples:
+            return lambda sequence: sequence
+
         return self.parser.retrive_string_sequence
 
     @classmethod
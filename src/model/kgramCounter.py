@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+
+import numpy as np
+
+_MAX_CODE = np.iinfo(np.int64).max
+
+COUNTS_EXTENSION = ".counts.npz"
+"""Extension of the file that stores the counts of a saved model."""
+
+
+class KGramCounter(object):
+    """Counts the k-grams and the prefixes of a list of samples, which are the data that
+    a ktss model needs to build its transitions.
+
+    The samples are encoded as an array of small integers (the index of each symbol in
+    the sorted alphabet of the samples), so each k-gram is identified by a rolling code
+    computed with numpy and the k-grams are counted with `np.unique`. Only the different
+    k-grams and prefixes are transformed into strings.
+
+    For each sample, the counter stores:
+
+    - **kgrams**: the substrings of length k of the samples whose length is greater or
+    equal than k.
+    - **prefixes**: the prefixes of length 1 to k - 1 of the samples (only the ones that
+    are not longer than the sample).
+    - **suffixes**: the suffix of length k - 1 of the samples whose length is greater
+    than k, the whole sample otherwise.
+    - **alphabet**: the symbols of the samples.
+
+    The counts are accumulated each time `update` is called, or when the counts of other
+    counter are added with `merge`:
+
+    ```python
+        counter = KGramCounter(3)
+        counter.update(["abab", "ab"])
+
+        counter.kgrams == Counter({"aba": 1, "bab": 1})
+        counter.prefixes == Counter({"a": 2, "ab": 2})
+    ```
+
+    Parameters
+    ----------
+    k: int
+        Length of the k-grams.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.kgrams = Counter()
+        self.prefixes = Counter()
+        self.suffixes = set()
+        self.alphabet = set()
+
+    @staticmethod
+    def _count_windows(
+        codes: np.ndarray, starts: np.ndarray, length: int, base: int
+    ) -> tuple:
+        """Counts the different windows of a length of the encoded samples.
+
+        The windows are identified by the rolling code of their symbols in base `base`,
+        or by their bytes if that code does not fit into a 64 bits integer.
+
+        Parameters
+        ----------
+        codes: ndarray
+            Encoded samples.
+        starts: ndarray
+            Start of each window.
+        length: int
+            Length of the windows.
+        base: int
+            Number of different symbols.
+
+        Returns
+        -------
+        Pair (start of the first window of each different window, count of each
+        different window).
+        """
+        if base ** length <= _MAX_CODE:
+            window_codes = np.zeros(len(starts), dtype=np.int64)
+            for index in range(length):
+                window_codes = window_codes * base + codes[starts + index]
+        else:
+            windows = np.ascontiguousarray(codes[starts[:, None] + np.arange(length)])
+            window_codes = windows.view(
+                np.dtype((np.void, windows.itemsize * length))
+            ).ravel()
+
+        _, first, counts = np.unique(
+            window_codes, return_index=True, return_counts=True
+        )
+
+        return starts[first], counts
+
+    def update(self, samples: list):
+        """Counts the k-grams, the prefixes and the suffixes of the samples.
+
+        Parameters
+        ----------
+        samples: list
+            List of samples, each sample is a string of symbols.
+        """
+        samples = [sample for sample in samples if sample]
+        if not samples:
+            return
+
+        k = self.k
+        text = "".join(samples)
+        symbols = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        alphabet = np.unique(symbols)
+        codes = np.searchsorted(alphabet, symbols).astype(np.int64)
+        base = len(alphabet)
+
+        self.alphabet.update(chr(symbol) for symbol in alphabet.tolist())
+
+        lengths = np.fromiter(map(len, samples), dtype=np.int64, count=len(samples))
+        offsets = np.zeros(len(samples), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+
+        # The k-grams of each sample start at its offset and end k - 1 symbols before
+        # its end, the samples shorter than k have not k-grams
+        windows = np.clip(lengths - k + 1, 0, None)
+        total_windows = int(windows.sum())
+        if total_windows:
+            sample_starts = np.repeat(np.cumsum(windows) - windows, windows)
+            starts = np.arange(total_windows) - sample_starts
+            starts += np.repeat(offsets, windows)
+
+            firsts, counts = self._count_windows(codes, starts, k, base)
+            for first, count in zip(firsts.tolist(), counts.tolist()):
+                self.kgrams[text[first : first + k]] += count
+
+        for length in range(1, k):
+            starts = offsets[lengths >= length]
+            if not len(starts):
+                break
+
+            firsts, counts = self._count_windows(codes, starts, length, base)
+            for first, count in zip(firsts.tolist(), counts.tolist()):
+                self.prefixes[text[first : first + length]] += count
+
+        self.suffixes.update(
+            sample[len(sample) - k + 1 :] if len(sample) > k else sample
+            for sample in samples
+        )
+
+    def merge(self, other: "KGramCounter"):
+        """Adds the counts of other counter with the same k.
+
+        Parameters
+        ----------
+        other: KGramCounter
+            Counter whose counts are added.
+
+        Raise
+        -----
+        ValueError: When the k of the counters is not the same.
+        """
+        if other.k != self.k:
+            raise ValueError(
+                f"The k of the counters is not the same: {self.k} != {other.k}"
+            )
+
+        self.kgrams.update(other.kgrams)
+        self.prefixes.update(other.prefixes)
+        self.suffixes.update(other.suffixes)
+        self.alphabet.update(other.alphabet)
+
+    def to_dict(self) -> dict:
+        """Transforms the counts into a dictionary that can be serialized as json.
+
+        Returns
+        -------
+        Dictionary with the k, the k-grams, the prefixes, the suffixes and the alphabet.
+        """
+        return {
+            "k": self.k,
+            "kgrams": dict(self.kgrams),
+            "prefixes": dict(self.prefixes),
+            "suffixes": sorted(self.suffixes),
+            "alphabet": sorted(self.alphabet),
+        }
+
+    @classmethod
+    def from_dict(cls, counts: dict) -> "KGramCounter":
+        """Creates a counter from a dictionary generated by `to_dict`.
+
+        Parameters
+        ----------
+        counts: dict
+            Dictionary with the counts.
+
+        Returns
+        -------
+        The counter.
+        """
+        counter = cls(counts["k"])
+        counter.kgrams.update(counts["kgrams"])
+        counter.prefixes.update(counts["prefixes"])
+        counter.suffixes.update(counts["suffixes"])
+        counter.alphabet.update(counts["alphabet"])
+
+        return counter
+
+    def save(self, path: str):
+        """Saves the counts into a numpy `.npz` file, with the k-grams, the prefixes,
+        the suffixes and the alphabet as string arrays and their counts as int64
+        arrays.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+        """
+        with open(path, "wb") as counts_file:
+            np.savez(
+                counts_file,
+                k=np.int64(self.k),
+                kgrams=np.array(list(self.kgrams), dtype=str),
+                kgrams_counts=np.fromiter(
+                    self.kgrams.values(), dtype=np.int64, count=len(self.kgrams)
+                ),
+                prefixes=np.array(list(self.prefixes), dtype=str),
+                prefixes_counts=np.fromiter(
+                    self.prefixes.values(), dtype=np.int64, count=len(self.prefixes)
+                ),
+                suffixes=np.array(sorted(self.suffixes), dtype=str),
+                alphabet=np.array(sorted(self.alphabet), dtype=str),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "KGramCounter":
+        """Creates a counter from a file generated by `save`.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file.
+
+        Returns
+        -------
+        The counter.
+        """
+        with np.load(path, allow_pickle=False) as counts:
+            counter = cls(int(counts["k"]))
+            counter.kgrams.update(
+                dict(zip(counts["kgrams"].tolist(), counts["kgrams_counts"].tolist()))
+            )
+            counter.prefixes.update(
+                dict(
+                    zip(counts["prefixes"].tolist(), counts["prefixes_counts"].tolist())
+                )
+            )
+            counter.suffixes.update(counts["suffixes"].tolist())
+            counter.alphabet.update(counts["alphabet"].tolist())
+
+        return counter
@@ -5,12 +5,20 @@ import itertools
 import json
 import logging
 import operator
+import os
+import shutil
 from typing import OrderedDict, Union
 
 from sortedcontainers import SortedDict, SortedList, SortedSet
 from src.argumentParser.abstractArguments import AbstractModelArguments
+from src.constants.constants import (BINARY_MODEL_FORMAT, JSON_MODEL_FORMAT,
+                                     NUMPY_TRAINER_BACKEND,
+                                     PYTHON_TRAINER_BACKEND)
+from src.dataStructures.compiledDfa import CompiledDFA, is_binary_dfa
+from src.dataStructures.dfaStochastic import DFAStochastic
 from src.logging.tqdmLoggingHandler import TqdmLoggingHandler
 from src.model.abstractModel import AbstractModel
+from src.model.kgramCounter import COUNTS_EXTENSION, KGramCounter
 from src.model.ktssValidation import KTSSValidator
 from src.parser.extendedParser import ExtendedParserVcf
 from tqdm import tqdm
@@ -47,12 +55,39 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
             "function_argumemnt": {"not_allowed_segements": "ktss_nas"},
             "action": "store_true",
         },
+        {
+            "key": "ktss_backend",
+            "name": "ktss-backend",
+            "help": f"Backend of the ktss trainer: python structures -> {PYTHON_TRAINER_BACKEND}, k-grams counted with numpy -> {NUMPY_TRAINER_BACKEND}",
+            "default": PYTHON_TRAINER_BACKEND,
+            "type": str,
+            "choices": [PYTHON_TRAINER_BACKEND, NUMPY_TRAINER_BACKEND],
+            "function_argumemnt": {"trainer_backend": "ktss_backend"},
+        },
+        {
+            "key": "ktss_workers",
+            "name": "ktss-workers",
+            "help": "Number of processes that annotate the test sequences",
+            "default": 1,
+            "type": int,
+            "function_argumemnt": {"annotation_workers": "ktss_workers"},
+        },
+        {
+            "key": "ktss_mformat",
+            "name": "ktss-model-format",
+            "help": f"Format of the saved ktss models: binary file that can be memory mapped -> {BINARY_MODEL_FORMAT}, json export -> {JSON_MODEL_FORMAT}",
+            "default": JSON_MODEL_FORMAT,
+            "type": str,
+            "choices": [BINARY_MODEL_FORMAT, JSON_MODEL_FORMAT],
+            "function_argumemnt": {"model_format": "ktss_model_format"},
+        },
     ]
     """Arguments that will be used by command line."""
 
     _trainer_arguments: dict = {
         "k_value": "k",
         "not_allowed_segements": "get_not_allowed_segements",
+        "trainer_backend": "backend",
     }
     """Mapping between command line arguments and function arguments of the
     **trainer** method."""
@@ -66,6 +101,10 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
     ):
         super().__init__(save_path=save_path, restore_path=restore_path)
         self._model = False
+        self.compiled_model = None
+        self.counter = None
+        self._transitions_counter = None
+        self._counts_path = None
         self.parser_class = parser
         self.tester_class = tester
         self.trainer_name = "ktt"
@@ -159,6 +198,7 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
         from_state: str,
         symbol: str,
         to_state: str,
+        count: int = 1,
     ) -> Union[OrderedDict, dict]:
         """Append a transition into an ordered dict that represent the transitions.
 
@@ -174,6 +214,8 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
             String that represents the transitions symbol.
         to_state: str
             String tht represents the destination state.
+        count: int = 1
+            Number of times that the transition happens.
 
         Returns
         -------
@@ -183,9 +225,9 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
             transitions[from_state] = SortedDict({})
             counter[from_state] = SortedDict({})
 
-        symbol_counter = 1
+        symbol_counter = count
         if transitions[from_state].get(symbol, False):
-            symbol_counter = counter[from_state][symbol] + 1
+            symbol_counter = counter[from_state][symbol] + count
         transitions[from_state][symbol] = to_state
         counter[from_state][symbol] = symbol_counter
 
@@ -388,14 +430,264 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
             "probabilities": probabilities,
         }
 
+    def _add_counter_transitions(
+        self,
+        transitions: Union[OrderedDict, dict],
+        transitions_counter: Union[OrderedDict, dict],
+        initial_state: str,
+        counter: KGramCounter,
+    ) -> set:
+        """Adds the transitions of the counts of a `KGramCounter` into the transitions
+        and the counter of the transitions.
+
+        Parameters
+        ----------
+        transitions: OrderedDict, dict
+            Ordered dict that contains transitions.
+        transitions_counter: OrderedDict, dict
+            Ordered dict that contains the number of times that a transition happens.
+        initial_state: str
+            Initial state
+        counter: KGramCounter
+            Counts of the k-grams and the prefixes of the samples.
+
+        Returns
+        -------
+        Set of the states whose transitions have been updated.
+        """
+        k = counter.k
+        updated_states = set()
+
+        # The transition from the initial state is added twice per prefix
+        for prefix, count in counter.prefixes.items():
+            from_state = prefix[:-1]
+            if len(prefix) == 1:
+                from_state, count = initial_state, 2 * count
+            self._add_transition(
+                transitions, transitions_counter, from_state, prefix[-1], prefix, count
+            )
+            updated_states.add(from_state)
+
+        for kgram, count in counter.kgrams.items():
+            self._add_transition(
+                transitions,
+                transitions_counter,
+                kgram[: k - 1],
+                kgram[k - 1],
+                kgram[1:k],
+                count,
+            )
+            updated_states.add(kgram[: k - 1])
+
+        return updated_states
+
+    @staticmethod
+    def _get_counter_states(initial_state: str, counter: KGramCounter) -> SortedSet:
+        """Returns the states of the transitions of the counts of a `KGramCounter`.
+
+        Parameters
+        ----------
+        initial_state: str
+            Initial state
+        counter: KGramCounter
+            Counts of the k-grams and the prefixes of the samples.
+
+        Returns
+        -------
+        The states.
+        """
+        states = SortedSet(counter.prefixes)
+        states.add(initial_state)
+        if counter.k > 2:
+            states.update(kgram[: counter.k - 1] for kgram in counter.kgrams)
+
+        return states
+
+    def _generate_counter_transitions(
+        self, initial_state: str, counter: KGramCounter
+    ) -> dict:
+        """Generates the transitions, the associated probabilities and the states of a
+        ktss model from the counts of a `KGramCounter`, giving the same result as
+        `_generate_transitions`.
+
+        Parameters
+        ----------
+        initial_state: str
+            Initial state
+        counter: KGramCounter
+            Counts of the k-grams and the prefixes of the samples.
+
+        Returns
+        -------
+        ```python
+            {
+                "transitions": transitions,
+                "states": states,
+                "probabilities": probabilities,
+                "counter": transitions_counter,
+            }
+        ```
+        """
+        transitions = SortedDict({})
+        transitions_counter = SortedDict({})
+        self._add_counter_transitions(
+            transitions, transitions_counter, initial_state, counter
+        )
+
+        return {
+            "transitions": transitions,
+            "states": self._get_counter_states(initial_state, counter),
+            "probabilities": KTSSModel._generate_probabilities(transitions_counter),
+            "counter": transitions_counter,
+        }
+
+    def _counter_training(
+        self, counter: KGramCounter, get_not_allowed_segements: bool = False
+    ) -> Union[OrderedDict, dict]:
+        """Generates a ktss model from the counts of a `KGramCounter`. The counter is
+        kept in `counter`, so the model can be updated with new samples (see
+        `update_training`).
+
+        Parameters
+        ----------
+        counter: KGramCounter
+            Counts of the k-grams and the prefixes of the samples.
+        get_not_allowed_segements: bool
+            If true returns not allowed segements.
+
+        Returns
+        -------
+        The model, as `_training`.
+        """
+        initial_state = "1"
+        alphabet = SortedSet(counter.alphabet)
+
+        transitions = self._generate_counter_transitions(initial_state, counter)
+
+        self._model = {
+            "states": transitions["states"],
+            "alphabet": alphabet,
+            "transitions": transitions["transitions"],
+            "initial_state": initial_state,
+            "final_states": SortedSet(counter.suffixes),
+            "probabilities": transitions["probabilities"],
+        }
+
+        if get_not_allowed_segements:
+            self._model["not_allowed_segments"] = self._generate_not_allowed_segments(
+                counter.kgrams, alphabet, counter.k
+            )
+
+        self.compiled_model = None
+        self.counter = counter
+        self._transitions_counter = transitions["counter"]
+        self._counts_path = None
+
+        return self._model
+
+    def update_training(
+        self,
+        samples: Union[list, tuple],
+        k: int = None,
+        get_not_allowed_segements: bool = False,
+    ) -> Union[OrderedDict, dict]:
+        """Updates the model with new samples, giving the same model as training it
+        with the previous samples and the new ones with the backend `"numpy"`.
+
+        The new samples are counted by a `KGramCounter`, and their counts are added to
+        the counts of the model (`counter`) and to the counts of its transitions, so
+        only the probabilities of the states with new transitions are computed again.
+        If the model has not counts, it is trained with the samples. The counts of a
+        loaded model are read from its counts file the first time it is updated.
+
+        Parameters
+        ----------
+        samples: list
+            List of new samples.
+        k: int = None
+            Parameter of the ktss model, by default the k of the counts of the model.
+        get_not_allowed_segements: bool
+            If true returns not allowed segements.
+
+        Raise
+        -----
+        ValueError: When the model has been trained without counts, or when k is not
+        the k of the counts of the model.
+
+        Returns
+        -------
+        The model, as `_training`.
+        """
+        if self.counter is None and self._counts_path is not None:
+            self.counter = KGramCounter.load(self._counts_path)
+            self._counts_path = None
+
+        if self.counter is None:
+            if self._model:
+                raise ValueError(
+                    "The model has no counts, it has to be trained with the "
+                    f"{NUMPY_TRAINER_BACKEND} backend to be updated"
+                )
+            if k is None:
+                raise ValueError("The k of the model is not defined")
+
+            counter = KGramCounter(k)
+            counter.update(samples)
+            return self._counter_training(counter, get_not_allowed_segements)
+
+        if k is not None and k != self.counter.k:
+            raise ValueError(f"The k of the model is {self.counter.k}, not {k}")
+
+        if self._transitions_counter is None:
+            self._counter_training(self.counter)
+
+        logging.info("Counting k-grams")
+        counter = KGramCounter(self.counter.k)
+        counter.update(samples)
+
+        logging.info("Updating model")
+        model = self.model
+        self.compiled_model = None
+        updated_states = self._add_counter_transitions(
+            model["transitions"],
+            self._transitions_counter,
+            model["initial_state"],
+            counter,
+        )
+        model["probabilities"].update(
+            KTSSModel._generate_probabilities(
+                {state: self._transitions_counter[state] for state in updated_states}
+            )
+        )
+        model["states"].update(
+            self._get_counter_states(model["initial_state"], counter)
+        )
+        model["alphabet"].update(counter.alphabet)
+        model["final_states"].update(counter.suffixes)
+        self.counter.merge(counter)
+
+        if get_not_allowed_segements:
+            model["not_allowed_segments"] = self._generate_not_allowed_segments(
+                self.counter.kgrams, model["alphabet"], self.counter.k
+            )
+        else:
+            model.pop("not_allowed_segments", None)
+
+        return model
+
     def _training(
         self,
         samples: Union[list, tuple],
         k: int,
         get_not_allowed_segements: bool = False,
+        backend: str = PYTHON_TRAINER_BACKEND,
     ) -> Union[OrderedDict, dict]:
         """Generates a ktss model from the samples and a k given.
 
+        With the backend `"numpy"` the k-grams of the samples are counted by a
+        `KGramCounter` and the model is built from the counts, which gives the same
+        model as the backend `"python"`.
+
         Parameters
         ----------
         samples: list
@@ -404,6 +696,8 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
             Parameter of the ktss model.
         get_not_allowed_segements: bool
             If true returns not allowed segements.
+        backend: str = "python"
+            Backend of the trainer, `"python"` or `"numpy"`.
 
         Returns
         -------
@@ -423,6 +717,23 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
         tqdm_out = TqdmLoggingHandler(logger, level=logging.INFO)
         logging.info("Training model")
 
+        if backend == NUMPY_TRAINER_BACKEND:
+            logging.info("Counting k-grams")
+            counter = KGramCounter(k)
+            counter.update(samples)
+            self._counter_training(counter, get_not_allowed_segements)
+
+            logging.info("Training finalized\n")
+            return self._model
+
+        if backend != PYTHON_TRAINER_BACKEND:
+            raise ValueError(f"Invalid trainer backend {backend}")
+
+        self.compiled_model = None
+        self.counter = None
+        self._transitions_counter = None
+        self._counts_path = None
+
         logging.info("Generating alphabet")
         alphabet = SortedSet(functools.reduce(operator.add, samples))
 
@@ -458,9 +769,12 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
         return self.parser_class
 
     def _test(self, parser_engine, filename, save_distances, **kwargs):
-        validator = self.tester_class(self.model, parser=parser_engine)
+        model = self.compiled_model if self.compiled_model is not None else self.model
+        validator = self.tester_class(model, parser=parser_engine)
 
-        distances = validator.generate_distances(self.get_test_samples())
+        distances = validator.generate_distances(
+            self.get_test_samples(), workers=kwargs.get("annotation_workers", 1)
+        )
 
         if save_distances:
             with open(filename, "w") as outfile:
@@ -483,12 +797,85 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
 
     @property
     def model(self):
+        if self._model is False and self.compiled_model is not None:
+            self._model = self.compiled_model.to_dict()
+            if "not_allowed_segments" in self.compiled_model.metadata:
+                self._model["not_allowed_segments"] = self.compiled_model.metadata[
+                    "not_allowed_segments"
+                ]
+
         return self._model
 
-    def saver(self):
-        super().saver()
+    @staticmethod
+    def model_filename(step: int = None, model_format: str = JSON_MODEL_FORMAT):
+        """Name of the file of a saved model.
 
-        with open(f"{self.save_path}ktss-model.json", "w") as outfile:
+        Parameters
+        ----------
+        step: int = None
+            Step of the model, if it is given the file is specific for that step.
+        model_format: str = JSON_MODEL_FORMAT
+            Format of the model.
+
+        Returns
+        -------
+        The name of the file.
+        """
+        extension = "bktss" if model_format == BINARY_MODEL_FORMAT else "json"
+        if step is None:
+            return f"ktss-model.{extension}"
+
+        return f"ktss-model-{step}.{extension}"
+
+    def saver(self, step: int = None, model_format: str = JSON_MODEL_FORMAT, **kwargs):
+        """Saves the model into the save path. The binary format is a compiled DFA (see
+        `src.dataStructures.compiledDfa.CompiledDFA.save`), and the json format is an
+        export of the dictionary of the model. If the model has counts (see
+        `update_training`) they are saved with the model, in the json of the model or,
+        with the binary format, in a numpy file next to it (see
+        `src.model.kgramCounter.KGramCounter.save`) so they are not read when the model
+        is loaded.
+
+        Parameters
+        ----------
+        step: int = None
+            Step of the model, if it is given the file is specific for that step.
+        model_format: str = JSON_MODEL_FORMAT
+            Format of the model.
+        """
+        super().saver(step)
+
+        if model_format not in (BINARY_MODEL_FORMAT, JSON_MODEL_FORMAT):
+            raise ValueError(f"The format {model_format} is not valid")
+
+        path = f"{self.save_path}{self.model_filename(step, model_format)}"
+        if model_format == BINARY_MODEL_FORMAT:
+            metadata = {}
+            if self.model.get("not_allowed_segments", False):
+                metadata["not_allowed_segments"] = list(
+                    self.model["not_allowed_segments"]
+                )
+
+            DFAStochastic(
+                self.model["states"],
+                self.model["alphabet"],
+                self.model["transitions"],
+                self.model["initial_state"],
+                self.model["final_states"],
+                self.model["probabilities"],
+            ).compile().save(path, metadata=metadata)
+
+            counts_path = f"{path}{COUNTS_EXTENSION}"
+            if self.counter is not None:
+                self.counter.save(counts_path)
+            elif self._counts_path is not None:
+                if os.path.abspath(self._counts_path) != os.path.abspath(counts_path):
+                    shutil.copyfile(self._counts_path, counts_path)
+            elif os.path.exists(counts_path):
+                os.remove(counts_path)
+            return
+
+        with open(path, "w") as outfile:
             model_for_json = {
                 "states": list(self.model["states"]),
                 "alphabet": list(self.model["alphabet"]),
@@ -502,20 +889,58 @@ class KTSSModel(AbstractModel, AbstractModelArguments):
                 model_for_json["not_allowed_segments"] = list(
                     self.model["not_allowed_segments"]
                 )
+            counter = self.counter
+            if counter is None and self._counts_path is not None:
+                counter = KGramCounter.load(self._counts_path)
+            if counter is not None:
+                model_for_json["counts"] = counter.to_dict()
             json.dump(model_for_json, outfile)
 
     def loader(self):
+        """Loads the model of the restore path, which can be a saved model or a folder
+        with a model saved without step (the binary one if there are both formats).
+
+        A binary model is loaded through a memory map (see
+        `src.dataStructures.compiledDfa.CompiledDFA.load`) into `compiled_model`, and
+        its dictionary is created when `model` is used. Its counts are not read until
+        the model is updated (see `update_training`).
+        """
         super().loader()
 
-        with open(self.save_path) as json_file:
+        path = self.restore_path
+        if os.path.isdir(path):
+            filename = self.model_filename(None, BINARY_MODEL_FORMAT)
+            path = f"{self.restore_path}{filename}"
+            if not os.path.exists(path):
+                path = f"{self.restore_path}{self.model_filename()}"
+        else:
+            path = path.rstrip("/")
+
+        self._model = False
+        self.compiled_model = None
+        self.counter = None
+        self._transitions_counter = None
+        self._counts_path = None
+        if is_binary_dfa(path):
+            self.compiled_model = CompiledDFA.load(path)
+            if os.path.exists(f"{path}{COUNTS_EXTENSION}"):
+                self._counts_path = f"{path}{COUNTS_EXTENSION}"
+            return
+
+        with open(path) as json_file:
             model = json.load(json_file)
 
-            model = {
+            loaded_model = {
                 "states": SortedSet(model["states"]),
                 "alphabet": SortedSet(model["alphabet"]),
                 "transitions": SortedDict(model["transitions"]),
                 "initial_state": model["initial_state"],
                 "final_states": SortedSet(model["final_states"]),
+                "probabilities": SortedDict(model["probabilities"]),
             }
+            if model.get("not_allowed_segments", False):
+                loaded_model["not_allowed_segments"] = model["not_allowed_segments"]
+            if "counts" in model:
+                self.counter = KGramCounter.from_dict(model["counts"])
 
-            self._model = model
+            self._model = loaded_model
@@ -1,8 +1,11 @@
 import logging
+import multiprocessing
 from typing import Callable, Union
 
+import numpy as np
 from sortedcontainers import SortedDict
 from src.argumentParser.abstractArguments import AbstractValidationArguments
+from src.dataStructures.compiledDfa import CompiledDFA
 from src.dataStructures.dfaStochastic import DFAStochastic
 from src.dataStructures.watsonCrickAutomata import WatsonCrickAutomata
 from src.logging.tqdmLoggingHandler import TqdmLoggingHandler
@@ -16,10 +19,23 @@ class KTSSValidator(AbstractValidationArguments):
     """Operates from a DFA generated from a KTSS model and allows to generate distances
     between original sequences and sequences derived from the original sequences.
 
+    The first time the candidates are used after the parser is set, the symbols of the
+    DFA that can be associated with each symbol of the sequences from each state (see
+    `_get_possible_symbols`) are computed for all the states of the compiled DFA and
+    stored as a CSR table: the candidates of
+    a state and a symbol of the sequences are
+    `candidate_symbols[candidate_offsets[i] : candidate_offsets[i + 1]]`, where `i` is
+    `state * (len(candidate_columns) + 1) + candidate_columns[symbol]`. The last column
+    of each state is for the symbols of the sequences that are not in the mappings.
+
+    The model can be the dictionary of the DFA or its `CompiledDFA` (for instance, a
+    model loaded from a binary file), which is used as it is. The `DFAStochastic` and
+    the `WatsonCrickAutomata` of the model are only built the first time they are used.
+
     Parameters
     ----------
-    model: dict
-        Dictionary that contains de DFA model
+    model: dict | CompiledDFA
+        Dictionary that contains de DFA model or the compiled DFA of the model
     parser: ParserVCF = ExtendedParserVcf
         Parser of the model
     """
@@ -57,6 +73,10 @@ class KTSSValidator(AbstractValidationArguments):
     ]
     """ Arguments that will be used by command line """
 
+    candidate_offsets: np.ndarray = None
+    """Offsets of the candidates of each state and symbol of the sequences in the
+    candidate table, it is None until the candidate table is computed."""
+
     _generate_distances_arguments: dict = {
         "sep": "separator",
         "min": "minimum",
@@ -69,34 +89,81 @@ class KTSSValidator(AbstractValidationArguments):
     **generate_distances** method """
 
     def __init__(
-        self, model: Union[SortedDict, dict], parser: ParserVcf = ExtendedParserVcf
+        self,
+        model: Union[SortedDict, dict, CompiledDFA],
+        parser: ParserVcf = ExtendedParserVcf,
     ):
         self.model = model
         self.infix_symbols = parser.mutations_symbols
 
         self._set_mappings(parser)
+        self._dfa = None
+        self._wca = None
+        self._compiled_dfa = model if isinstance(model, CompiledDFA) else None
         self.parser = parser
-        self.dfa = DFAStochastic(
-            model["states"],
-            model["alphabet"],
-            model["transitions"],
-            model["initial_state"],
-            model["final_states"],
-            model["probabilities"],
-        )
 
-        self.wca = WatsonCrickAutomata(set(), [], {"1"}, "1", set(), {}, {})
+    @property
+    def dfa(self) -> DFAStochastic:
+        """Stochastic DFA of the model, it is built the first time it is used."""
+        if self._dfa is None:
+            model = self.model
+            if isinstance(model, CompiledDFA):
+                model = model.to_dict()
+
+            self._dfa = DFAStochastic(
+                model["states"],
+                model["alphabet"],
+                model["transitions"],
+                model["initial_state"],
+                model["final_states"],
+                model["probabilities"],
+            )
+
+        return self._dfa
 
-        self.wca.parse_dfa(self.dfa, self.inverse_symbols)
+    @property
+    def wca(self) -> WatsonCrickAutomata:
+        """Watson-Crick automata of the model, it is built the first time it is
+        used."""
+        if self._wca is None:
+            self._wca = WatsonCrickAutomata(set(), [], {"1"}, "1", set(), {}, {})
+            self._wca.parse_dfa(self.dfa, self.inverse_symbols)
 
-    def generate_distances(self, sequences: Union[list, tuple]) -> SortedDict:
+        return self._wca
+
+    @property
+    def parser(self) -> ParserVcf:
+        """Parser of the model, when it is set the candidate table is computed again
+        the next time it is used."""
+        return self._parser
+
+    @parser.setter
+    def parser(self, parser: ParserVcf):
+        self._parser = parser
+        self.candidate_offsets = None
+
+    @property
+    def compiled_dfa(self) -> CompiledDFA:
+        """Compiled DFA of the model, it is compiled the first time it is used."""
+        if self._compiled_dfa is None:
+            self._compiled_dfa = self.dfa.compile()
+
+        return self._compiled_dfa
+
+    def generate_distances(
+        self, sequences: Union[list, tuple], workers: int = 1
+    ) -> SortedDict:
         """Generates all the distances of an infix of a given list of sequences of all
         the possible infixes.
 
+        The reference sequences are annotated by `annotate_batch`.
+
         Parameters
         ---------
         sequences: list
             List of sequences.
+        workers: int = 1
+            Number of processes that annotate the sequences.
 
         Returns
         -------
@@ -109,11 +176,14 @@ class KTSSValidator(AbstractValidationArguments):
         logger.info("Generating validation data")
         total_errors = 0
         total_chars = 0
-        for sequence_raw in tqdm(sequences, file=tqdm_out):
-            reference_sequence = sequence_raw[0]
+        annotations = self.iter_annotate_batch(
+            [sequence_raw[0] for sequence_raw in sequences], workers=workers
+        )
+        for sequence_raw, result_anotation in tqdm(
+            zip(sequences, annotations), total=len(sequences), file=tqdm_out
+        ):
             annotated_sequence = sequence_raw[1]
 
-            result_anotation = self.annotate_sequence(reference_sequence)
             key = f"{annotated_sequence}-{result_anotation}"
             result[key] = self._string_distances(result_anotation, annotated_sequence)
 
@@ -125,6 +195,97 @@ class KTSSValidator(AbstractValidationArguments):
 
         return result
 
+    def _prepare_annotation(self):
+        """Prepares the structures used to annotate the sequences, so they are created
+        before the processes of `annotate_batch` are forked. The sequences are
+        annotated by the Watson-Crick automata, so it is built with its greedy
+        transitions (see `WatsonCrickAutomata.compile`)."""
+        self.wca.compile()
+
+    def iter_annotate_batch(
+        self,
+        sequences: Union[list, tuple],
+        workers: int = 1,
+        chunk_size: int = 1000,
+        separator: str = "",
+    ):
+        """Annotates a list of sequences (see `annotate_sequence`), yielding the
+        annotations in the order of the sequences.
+
+        If there are more than one worker, the sequences are annotated in chunks by a
+        pool of processes. The processes are forked after the structures of the
+        validator are prepared, so the model is not sent to them, and the annotations
+        are sent back per chunk. Inside a process of other pool the sequences are
+        annotated by the current process.
+
+        Parameters
+        ----------
+        sequences: list, tuple
+            Sequences to be annotated.
+        workers: int = 1
+            Number of processes that annotate the sequences.
+        chunk_size: int = 1000
+            Number of sequences sent to a process at once.
+        separator: str = ""
+            Separator between the symbols of the annotated sequences.
+
+        Returns
+        -------
+        Generator of annotated sequences.
+        """
+        if workers <= 1 or multiprocessing.current_process().daemon:
+            for sequence in sequences:
+                yield self.annotate_sequence(sequence, separator=separator)
+            return
+
+        self._prepare_annotation()
+
+        global _annotation_validator
+        _annotation_validator = self
+
+        chunks = (
+            (sequences[start : start + chunk_size], separator)
+            for start in range(0, len(sequences), chunk_size)
+        )
+        context = multiprocessing.get_context("fork")
+        try:
+            with context.Pool(workers) as pool:
+                for annotations in pool.imap(_annotate_chunk, chunks):
+                    yield from annotations
+        finally:
+            # The validator is not kept alive by the module after the annotation
+            _annotation_validator = None
+
+    def annotate_batch(
+        self,
+        sequences: Union[list, tuple],
+        workers: int = 1,
+        chunk_size: int = 1000,
+        separator: str = "",
+    ) -> list:
+        """Annotates a list of sequences (see `iter_annotate_batch`).
+
+        Parameters
+        ----------
+        sequences: list, tuple
+            Sequences to be annotated.
+        workers: int = 1
+            Number of processes that annotate the sequences.
+        chunk_size: int = 1000
+            Number of sequences sent to a process at once.
+        separator: str = ""
+            Separator between the symbols of the annotated sequences.
+
+        Returns
+        -------
+        List of annotated sequences.
+        """
+        return list(
+            self.iter_annotate_batch(
+                sequences, workers=workers, chunk_size=chunk_size, separator=separator
+            )
+        )
+
     def annotate_sequence(self, sequence: str, separator: str = "") -> str:
         """Gets a string sequence, and annotates it.
 
@@ -182,7 +343,7 @@ class KTSSValidator(AbstractValidationArguments):
         -------
         Annotated sequence
         """
-        return self.wca.annotate_sequence(sequence)
+        return self.wca.annotate_sequence(sequence, separator=separator)
 
     def _get_possible_symbols(self, current_state: str, symbol: str) -> list:
         """Returns all the symbols of a transition with origin on current state that
@@ -202,11 +363,114 @@ class KTSSValidator(AbstractValidationArguments):
         -------
         List of possible symbols that match with the symbol.
         """
-        if current_state in self.dfa.final_states or not self.dfa.transitions.get(
-            current_state, False
-        ):
+        state = self.compiled_dfa.state_index.get(current_state)
+        if state is None:
+            return False
+
+        candidates = self._get_candidate_symbols(state, symbol)
+        if not len(candidates):
             return False
 
+        return [self.compiled_dfa.symbols[i] for i in candidates.tolist()]
+
+    def _get_candidate_symbols(self, state: int, symbol: str) -> np.ndarray:
+        """Returns the candidates of the candidate table for a state of the compiled DFA
+        and a symbol of the sequences.
+
+        Prameters
+        ---------
+        state: int
+            Index of the state of the compiled DFA.
+        symbol: str
+            Symbol of the sequence.
+
+        Returns
+        -------
+        Indexes of the symbols of the compiled DFA.
+        """
+        position = self._get_candidate_position(state, symbol)
+
+        return self.candidate_symbols[
+            self.candidate_offsets[position] : self.candidate_offsets[position + 1]
+        ]
+
+    def _get_candidate_position(self, state: int, symbol: str) -> int:
+        """Position of the candidate table for a state of the compiled DFA and a symbol
+        of the sequences. The candidate table is computed if it is not computed yet."""
+        if self.candidate_offsets is None:
+            self._set_candidate_table()
+
+        columns = len(self.candidate_columns)
+
+        return state * (columns + 1) + self.candidate_columns.get(symbol, columns)
+
+    def _set_candidate_table(self):
+        """Computes the candidate table of the compiled DFA with the mappings of the
+        parser.
+
+        For each symbol of the mappings, the candidates of a state are the symbols
+        associated with it (see `_get_mapped_symbols`) that have a transition from the
+        state or, if none of them has a transition, all the symbols of the transitions
+        of the state. The final states have no candidates.
+        """
+        compiled_dfa = self.compiled_dfa
+        transitions = compiled_dfa.table != -1
+        transitions[compiled_dfa.final_states] = False
+        symbols = np.arange(len(compiled_dfa.symbols), dtype=np.int32)
+
+        sequence_symbols = set(self.parser.prefix_map)
+        sequence_symbols.update(self.parser.suffix_map)
+        for key, value in self.parser.mutations_map.items():
+            sequence_symbols.update(value if isinstance(value, dict) else [key])
+        sequence_symbols = sorted(sequence_symbols)
+        self.candidate_columns = {
+            symbol: column for column, symbol in enumerate(sequence_symbols)
+        }
+        columns = len(sequence_symbols) + 1
+
+        keys = []
+        values = []
+        for column, symbol in enumerate(sequence_symbols + [None]):
+            mapped = []
+            if symbol is not None:
+                mapped = [
+                    compiled_dfa.symbol_index[i]
+                    for i in self._get_mapped_symbols(symbol)
+                    if isinstance(i, str) and i in compiled_dfa.symbol_index
+                ]
+            mapped = np.array(mapped, dtype=np.int32)
+
+            mapped_transitions = transitions[:, mapped]
+            other_transitions = transitions & ~mapped_transitions.any(axis=1)[:, None]
+            states, positions = np.nonzero(
+                np.concatenate([mapped_transitions, other_transitions], axis=1)
+            )
+
+            keys.append(states * columns + column)
+            values.append(np.concatenate([mapped, symbols])[positions])
+
+        keys = np.concatenate(keys)
+        order = np.argsort(keys, kind="stable")
+        self.candidate_symbols = np.concatenate(values)[order]
+
+        counts = np.bincount(keys, minlength=len(compiled_dfa.state_names) * columns)
+        self.candidate_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.candidate_offsets[1:])
+
+    def _get_mapped_symbols(self, symbol: str) -> list:
+        """Returns the symbols of the prefix, suffix and infix mappings that are
+        associated with a symbol.
+
+        Prameters
+        ---------
+        symbol: str
+            Symbol to be mapped.
+
+        Returns
+        -------
+        List of the symbols associated with the symbol, first the prefix and suffix
+        symbols and then the infix symbols.
+        """
         possible_symbols = []
         mutation_symbols = []
         KTSSValidator._add_symbol(symbol, self.parser.prefix_map, possible_symbols)
@@ -219,14 +483,7 @@ class KTSSValidator(AbstractValidationArguments):
                     symbol, self.parser.mutations_map[key], mutation_symbols
                 )
 
-        possible_symbols = self._filter_possibles(
-            current_state, possible_symbols + mutation_symbols
-        )
-
-        if len(possible_symbols) < 1:
-            possible_symbols = list(self.dfa.transitions[current_state].keys())
-
-        return possible_symbols
+        return possible_symbols + mutation_symbols
 
     def _set_mappings(self, parser: ParserVcf):
         """Set the mappings for the prefix, infix, and suffix between an original symbol
@@ -305,20 +562,25 @@ class KTSSValidator(AbstractValidationArguments):
         """
         return any(isinstance(i, dict) for i in mapping.values())
 
-    def _filter_possibles(self, state: str, symbols: list) -> list:
-        """Filter the symbols that can do a transition in a DFA from a given state.
 
-        Parameters
-        ----------
-        state: str
-            Origin state.
-        symbols: list
-            List of symbols to filter.
+_annotation_validator: KTSSValidator = None
+""" Validator of the current worker process """
 
-        Returns
-        -------
-        The filtered list.
-        """
-        return list(
-            filter(lambda symbol: self.dfa.has_transition(state, symbol), symbols)
-        )
+
+def _annotate_chunk(arguments: tuple) -> list:
+    """Annotates a chunk of sequences with the validator of the worker process.
+
+    Parameters
+    ----------
+    arguments: tuple
+        Sequences and separator between the symbols of the annotated sequences.
+
+    Returns
+    -------
+    List of annotated sequences.
+    """
+    sequences, separator = arguments
+    return [
+        _annotation_validator.annotate_sequence(sequence, separator=separator)
+        for sequence in sequences
+    ]
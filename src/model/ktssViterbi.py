@@ -1,7 +1,74 @@
+import numpy as np
 from src.model.ktssValidation import KTSSValidator
 
 
 class KTSSViterbi(KTSSValidator):
+    _candidates: dict = None
+    """Candidate transitions of each state for each symbol of the sequences, as a
+    dictionary `symbol -> state -> candidates`."""
+
+    def _set_candidate_table(self):
+        """Computes the candidate table (see `KTSSValidator._set_candidate_table`) and
+        the next state and the logarithm of the probability of each candidate."""
+        super()._set_candidate_table()
+
+        compiled_dfa = self.compiled_dfa
+        states = np.repeat(
+            np.arange(len(self.candidate_offsets) - 1)
+            // (len(self.candidate_columns) + 1),
+            np.diff(self.candidate_offsets),
+        )
+        self.candidate_states = compiled_dfa.table[states, self.candidate_symbols]
+        self.candidate_log_probabilities = compiled_dfa.log_probabilities[
+            compiled_dfa.transition_index(states, self.candidate_symbols)
+        ]
+        self._candidates = {}
+
+    def _prepare_annotation(self):
+        """Prepares the candidate table (see `_set_candidate_table`), which is used to
+        annotate the sequences instead of the Watson-Crick automata, before the
+        processes of `annotate_batch` are forked."""
+        if self.candidate_offsets is None:
+            self._set_candidate_table()
+
+    def _get_candidates(self, state: int, symbol: str) -> tuple:
+        """Returns the transitions that can be done from a state of the compiled DFA
+        with a symbol of a sequence, which are the transitions of the candidate table
+        (see `KTSSValidator._set_candidate_table`).
+
+        The candidates are kept as tuples, so each one is transformed once.
+
+        Parameters
+        ----------
+        state: int
+            Index of the state of the compiled DFA.
+        symbol: str
+            Symbol of the sequence.
+
+        Returns
+        -------
+        Tuple of candidate transitions, each one is a tuple (index of the next state,
+        index of the symbol of the transition, logarithm of its probability).
+        """
+        if self.candidate_offsets is None:
+            self._set_candidate_table()
+
+        symbol_candidates = self._candidates.setdefault(symbol, {})
+        if state not in symbol_candidates:
+            position = self._get_candidate_position(state, symbol)
+            candidates = slice(
+                self.candidate_offsets[position], self.candidate_offsets[position + 1]
+            )
+            symbol_candidates[state] = tuple(
+                zip(
+                    self.candidate_states[candidates].tolist(),
+                    self.candidate_symbols[candidates].tolist(),
+                    self.candidate_log_probabilities[candidates].tolist(),
+                )
+            )
+
+        return symbol_candidates[state]
+
     def annotate_sequence(self, sequence: str, separator: str = "") -> str:
         """Gets a string sequence, and annotates it using Viterbi algorthm.
 
@@ -10,10 +77,14 @@ class KTSSViterbi(KTSSValidator):
         from the sequence.
 
         Then, the method filters them by the condition that a transition can be done
-        with that symbols from a state of the model DFA.
+        with that symbols from a state of the model DFA (see `_get_candidates`).
 
-        If more than one symbol can be associated to a sequence symbol, this methods get
-        in a aleatory way a symbol from all the possible symbols.
+        The annotation is the path of the DFA with the highest probability, computed
+        in log space over the compiled DFA (see
+        `src.dataStructures.compiledDfa.CompiledDFA`). Each step keeps the score of each
+        reached state and a back-pointer to the previous state and the symbol of the
+        transition, the states that can not be reached are not stored. If no transition
+        can be done at a step, the annotation ends at the previous step.
 
         For instance, if our sequence is:
 
@@ -58,117 +129,44 @@ class KTSSViterbi(KTSSValidator):
         -------
         Annotated sequence
         """
-        forward_porb = {self.dfa.initial_state: 1}
-        backward = {}
-        leafs = set(self.dfa.initial_state)
-        bad_leafs = set()
-
-        count = 0
+        if self.candidate_offsets is None:
+            self._set_candidate_table()
+        compiled_dfa = self.compiled_dfa
+        computed_candidates = self._candidates
+
+        # Each step maps the reached states to a tuple (score, previous state, symbol
+        # of the transition), which is also the back-pointer of the state
+        steps = []
+        scores = {compiled_dfa.initial_state: (0.0, None, None)}
         for symbol in sequence:
-            auxiliar_leafs = set()
-            level_backward = {}
-            for current_state in leafs:
-                possible_symbols = self._get_possible_symbols(current_state, symbol)
-                if not possible_symbols:
-                    bad_leafs.add(current_state)
-                    continue
-
-                for possible_symbol in possible_symbols:
-                    next_state = self.dfa.transitions[current_state][possible_symbol]
-                    probability = self.dfa.probabilities[current_state][possible_symbol]
-                    forward_porb[next_state] = forward_porb[current_state] * probability
-                    level_backward[next_state] = current_state
-
-                    auxiliar_leafs.add(next_state)
-            if len(level_backward.keys()) > 0:
-                backward[count] = level_backward
-            leafs = auxiliar_leafs
-            count += 1
-
-        if len(leafs) < 1:
-            leafs = bad_leafs
-
-        states_probabilities = {state: forward_porb[state] for state in leafs}
-        state = max(states_probabilities, key=states_probabilities.get)
-
-        return self._backtrack(
-            state, backward, len(backward.keys()) - 1, separator=separator
-        )
-
-    def _get_symbol_by_destination(self, transitions: dict, destination: str) -> str:
-        """Gets a symbol transition from a transition by de destination state.
-
-        For instnce, if the transition is `{"a": "1", "b": "2"}` and the destination is
-        `"2"` the result is `"b"`.
-
-        Parameters
-        ----------
-        transitions: dict
-            Transitions.
-        destination: str
-            One transition destination.
-
-        Returns
-        -------
-        The symbol that goes to the destination.
-        """
-        return list(transitions.keys())[list(transitions.values()).index(destination)]
-
-    def _backtrack(
-        self,
-        state: str,
-        backward: dict,
-        length: int,
-        separator: str = "",
-    ) -> str:
-        """Backtracking through a dictionary to get the sequence of generated symbols
-        using the states.
-
-        For example, if the backward dictionary is:
-
-        ```python
-            {0: {"2": "1"}, 1: {"15": "2"}, 2: {"16": "15"}, 3: {"18": "16"}}
-        ```
-
-        The state is `"18"` and the dfa transitions are:
-
-        ```python
-            "1": {"a": "2", "b": "3"},
-            "2": {"a": "4", "b": "5", "d": "6", "l": "15"},
-            "3": {"a": "7", "b": "8", "d": "9"},
-            "4": {"z": "10", "x": "11"},
-            "6": {"z": "12"},
-            "9": {"z": "13", "x": "14"},
-            "10": {"z": "17"},
-            "15": {"z": "16"},
-            "16": {"z": "18"},
-        ```
-
-        The method will return `"alzz"`.
-
-        Parameters
-        ----------
-        state: str
-            State where de backtracking will start.
-        backward: dict
-            Backward dictionary.
-        length: int
-            Length of the backward dictionary.
-        separator: str = ""
-            Separator between the symbols of the annotated sequence.
-
-        Returns
-        -------
-        The generated sequence.
-        """
-        res = []
-        for i in range(length, -1, -1):
-            if not state in backward[i]:
-                continue
-            previous_state = backward[i][state]
-            symbol = self._get_symbol_by_destination(
-                self.dfa.transitions[previous_state], state
-            )
-            res = [symbol] + res
-            state = previous_state
-        return separator.join(res)
+            next_scores = {}
+            symbol_candidates = computed_candidates.get(symbol)
+            if symbol_candidates is None:
+                symbol_candidates = computed_candidates.setdefault(symbol, {})
+            for current_state, (score, _, _) in scores.items():
+                candidates = symbol_candidates.get(current_state)
+                if candidates is None:
+                    candidates = self._get_candidates(current_state, symbol)
+                for next_state, transition_symbol, log_probability in candidates:
+                    next_score = score + log_probability
+                    best = next_scores.get(next_state)
+                    if best is None or next_score > best[0]:
+                        next_scores[next_state] = (
+                            next_score,
+                            current_state,
+                            transition_symbol,
+                        )
+
+            if not next_scores:
+                break
+
+            scores = next_scores
+            steps.append(next_scores)
+
+        state = max(scores, key=lambda reached: scores[reached][0])
+        annotation = []
+        for step in reversed(steps):
+            _, state, transition_symbol = step[state]
+            annotation.append(compiled_dfa.symbols[transition_symbol])
+
+        return separator.join(reversed(annotation))
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import random
+import tempfile
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.constants.constants import (BINARY_MODEL_FORMAT, JSON_MODEL_FORMAT,
+                                     NUMPY_TRAINER_BACKEND,
+                                     PYTHON_TRAINER_BACKEND)
+from src.model.kgramCounter import KGramCounter
+from src.model.ktssModel import KTSSModel
+
+
+class TestKGramCounter(TestCase):
+    def test_update(self):
+        counter = KGramCounter(3)
+
+        counter.update(["abab", "ab", "abc"])
+
+        self.assertEqual(counter.kgrams, Counter({"aba": 1, "bab": 1, "abc": 1}))
+        self.assertEqual(counter.prefixes, Counter({"a": 3, "ab": 3}))
+        self.assertEqual(counter.suffixes, {"ab", "abc"})
+        self.assertEqual(counter.alphabet, {"a", "b", "c"})
+
+    def test_update_accumulates(self):
+        counter = KGramCounter(2)
+
+        counter.update(["aab"])
+        counter.update(["ab", "b"])
+
+        self.assertEqual(counter.kgrams, Counter({"aa": 1, "ab": 2}))
+        self.assertEqual(counter.prefixes, Counter({"a": 2, "b": 1}))
+        self.assertEqual(counter.suffixes, {"b", "ab"})
+
+    def test_update_bytes_codes(self):
+        samples = ["qwertyuiop", "qwertyuiopa", "poiuytrewq"]
+        counter = KGramCounter(5)
+        counter.update(samples)
+
+        with patch("src.model.kgramCounter._MAX_CODE", 0):
+            result = KGramCounter(5)
+            result.update(samples)
+
+        self.assertEqual(result.kgrams, counter.kgrams)
+        self.assertEqual(result.prefixes, counter.prefixes)
+
+    def test_merge(self):
+        counter = KGramCounter(2)
+        counter.update(["aab"])
+        other = KGramCounter(2)
+        other.update(["ab", "b"])
+
+        counter.merge(other)
+
+        self.assertEqual(counter.kgrams, Counter({"aa": 1, "ab": 2}))
+        self.assertEqual(counter.prefixes, Counter({"a": 2, "b": 1}))
+        self.assertEqual(counter.suffixes, {"b", "ab"})
+
+    def test_merge_invalid_k(self):
+        with self.assertRaises(ValueError):
+            KGramCounter(2).merge(KGramCounter(3))
+
+    def test_to_dict(self):
+        counter = KGramCounter(3)
+        counter.update(["abab", "ab", "abc"])
+
+        result = KGramCounter.from_dict(counter.to_dict())
+
+        self.assertEqual(result.k, 3)
+        self.assertEqual(result.kgrams, counter.kgrams)
+        self.assertEqual(result.prefixes, counter.prefixes)
+        self.assertEqual(result.suffixes, counter.suffixes)
+        self.assertEqual(result.alphabet, counter.alphabet)
+
+    def test_save(self):
+        counter = KGramCounter(3)
+        counter.update(["abab", "ab", "abc"])
+
+        with tempfile.TemporaryDirectory() as temporal_dir:
+            counter.save(f"{temporal_dir}/counts.npz")
+            result = KGramCounter.load(f"{temporal_dir}/counts.npz")
+
+        self.assertEqual(result.k, 3)
+        self.assertEqual(result.kgrams, counter.kgrams)
+        self.assertEqual(result.prefixes, counter.prefixes)
+        self.assertEqual(result.suffixes, counter.suffixes)
+        self.assertEqual(result.alphabet, counter.alphabet)
+
+
+class TestKTSSModelNumpyBackend(TestCase):
+    def setUp(self) -> None:
+        generator = random.Random(0)
+        self.samples = [
+            "".join(generator.choice("qwfzx") for _ in range(generator.randint(1, 12)))
+            for _ in range(200)
+        ]
+        self.samples += ["ab", "ab", "abab", "ba"]
+
+        return super().setUp()
+
+    def test_training(self):
+        for k in range(2, 7):
+            model = KTSSModel()._training(
+                self.samples, k, get_not_allowed_segements=True
+            )
+
+            result = KTSSModel()._training(
+                self.samples,
+                k,
+                get_not_allowed_segements=True,
+                backend=NUMPY_TRAINER_BACKEND,
+            )
+
+            self.assertEqual(result, model)
+            self.assertEqual(
+                list(result["probabilities"]), list(model["probabilities"])
+            )
+
+    def test_training_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            KTSSModel()._training(self.samples, 3, backend="invalid")
+
+    def _assert_same_model(self, result: dict, model: dict):
+        for key in ("states", "alphabet", "transitions", "initial_state"):
+            self.assertEqual(result[key], model[key])
+        self.assertEqual(result["final_states"], model["final_states"])
+        self.assertEqual(
+            {state: dict(i) for state, i in result["probabilities"].items()},
+            {state: dict(i) for state, i in model["probabilities"].items()},
+        )
+        self.assertEqual(
+            result.get("not_allowed_segments"), model.get("not_allowed_segments")
+        )
+
+    def test_update_training(self):
+        for k in range(2, 6):
+            model = KTSSModel()._training(
+                self.samples,
+                k,
+                get_not_allowed_segements=True,
+                backend=NUMPY_TRAINER_BACKEND,
+            )
+
+            ktss_model = KTSSModel()
+            ktss_model.update_training(self.samples[:50], k)
+            ktss_model.update_training(self.samples[50:120])
+            result = ktss_model.update_training(
+                self.samples[120:], get_not_allowed_segements=True
+            )
+
+            self._assert_same_model(result, model)
+
+    def test_update_training_saved(self):
+        model = KTSSModel()._training(self.samples, 3, backend=NUMPY_TRAINER_BACKEND)
+
+        for model_format in (BINARY_MODEL_FORMAT, JSON_MODEL_FORMAT):
+            with tempfile.TemporaryDirectory() as temporal_dir:
+                ktss_model = KTSSModel(save_path=temporal_dir)
+                ktss_model._training(
+                    self.samples[:100], 3, backend=NUMPY_TRAINER_BACKEND
+                )
+                ktss_model.saver(model_format=model_format)
+
+                ktss_model = KTSSModel(restore_path=temporal_dir)
+                ktss_model.loader()
+                result = ktss_model.update_training(self.samples[100:])
+
+            self._assert_same_model(result, model)
+
+    def test_update_training_saved_lazy_counts(self):
+        model = KTSSModel()._training(self.samples, 3, backend=NUMPY_TRAINER_BACKEND)
+
+        with tempfile.TemporaryDirectory() as temporal_dir:
+            ktss_model = KTSSModel(save_path=temporal_dir)
+            ktss_model._training(self.samples[:100], 3, backend=NUMPY_TRAINER_BACKEND)
+            ktss_model.saver(model_format=BINARY_MODEL_FORMAT)
+            ktss_model = KTSSModel(restore_path=temporal_dir, save_path=temporal_dir)
+            ktss_model.loader()
+
+            self.assertIsNone(ktss_model.counter)
+            self.assertNotIn("counts", ktss_model.compiled_model.metadata)
+
+            ktss_model.saver(1, BINARY_MODEL_FORMAT)
+            filename = KTSSModel.model_filename(1, BINARY_MODEL_FORMAT)
+            ktss_model = KTSSModel(restore_path=f"{temporal_dir}/{filename}")
+            ktss_model.loader()
+            result = ktss_model.update_training(self.samples[100:])
+
+        self._assert_same_model(result, model)
+        self.assertIsNone(ktss_model.compiled_model)
+
+    def test_update_training_without_counts(self):
+        ktss_model = KTSSModel()
+        ktss_model._training(self.samples, 3, backend=PYTHON_TRAINER_BACKEND)
+
+        with self.assertRaises(ValueError):
+            ktss_model.update_training(self.samples)
+
+    def test_update_training_invalid_k(self):
+        ktss_model = KTSSModel()
+        ktss_model.update_training(self.samples, 3)
+
+        with self.assertRaises(ValueError):
+            ktss_model.update_training(self.samples, 4)
@@ -1,5 +1,8 @@
+import random
+import tempfile
 from unittest import TestCase
 
+from src.constants.constants import BINARY_MODEL_FORMAT, JSON_MODEL_FORMAT
 from src.model.ktssModel import KTSSModel
 
 
@@ -455,3 +458,76 @@ class TestKTSSModelProbabilities(TestCase):
         result = KTSSModel._generate_probabilities(counter)
 
         self.assertEqual(result, probabilities)
+
+
+class TestKTSSModelSaver(TestCase):
+    def setUp(self) -> None:
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.model = KTSSModel(save_path=self.temporal_dir.name)
+        self.model._training(
+            ["abba", "abab", "bbaa"], 3, get_not_allowed_segements=True
+        )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def _assert_loaded(self, model: KTSSModel):
+        self.assertEqual(set(model.model), set(self.model.model))
+        for key in set(self.model.model) - {"not_allowed_segments"}:
+            self.assertEqual(model.model[key], self.model.model[key])
+        self.assertEqual(
+            set(model.model["not_allowed_segments"]),
+            set(self.model.model["not_allowed_segments"]),
+        )
+
+    def test_saver_loader_binary(self):
+        self.model.saver(model_format=BINARY_MODEL_FORMAT)
+
+        model = KTSSModel(restore_path=self.temporal_dir.name)
+        model.loader()
+
+        self.assertIsNotNone(model.compiled_model)
+        self._assert_loaded(model)
+
+    def test_saver_loader_json(self):
+        self.model.saver(step=1, model_format=JSON_MODEL_FORMAT)
+
+        model = KTSSModel(restore_path=f"{self.temporal_dir.name}/ktss-model-1.json")
+        model.loader()
+
+        self.assertIsNone(model.compiled_model)
+        self._assert_loaded(model)
+
+    def test_saver_loader_binary_model(self):
+        generator = random.Random(0)
+        samples = [
+            "".join(generator.choice("qwrzd") for _ in range(generator.randint(1, 8)))
+            for _ in range(50)
+        ]
+        for k in (2, 3):
+            self.model._training(samples, k)
+            self.model.saver(step=k, model_format=BINARY_MODEL_FORMAT)
+
+            model = KTSSModel(
+                restore_path=f"{self.temporal_dir.name}/ktss-model-{k}.bktss"
+            )
+            model.loader()
+
+            self.assertEqual(model.model, self.model.model)
+
+    def test_saver_invalid_format(self):
+        with self.assertRaises(ValueError):
+            self.model.saver(model_format="yaml")
+
+    def test_model_filename(self):
+        self.assertEqual(KTSSModel.model_filename(), "ktss-model.json")
+        self.assertEqual(
+            KTSSModel.model_filename(2, JSON_MODEL_FORMAT), "ktss-model-2.json"
+        )
+        self.assertEqual(
+            KTSSModel.model_filename(2, BINARY_MODEL_FORMAT), "ktss-model-2.bktss"
+        )
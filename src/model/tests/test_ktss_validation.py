@@ -121,24 +121,6 @@ class TestKTSSValidator(TestCase):
 
         self.assertFalse(result)
 
-    def test__filter_possibles(self):
-        state = ""
-        symbols = ["a", "b", "c", "d"]
-        possible_symbols = ["a", "b"]
-
-        result = self.ktss_validator._filter_possibles(state, symbols)
-
-        self.assertEqual(result, possible_symbols)
-
-    def test__filter_possibles_empty(self):
-        state = ""
-        symbols = ["c", "d"]
-        possible_symbols = []
-
-        result = self.ktss_validator._filter_possibles(state, symbols)
-
-        self.assertEqual(result, possible_symbols)
-
 
 class TestKTSSValidatorAnnotate(TestCase):
     def setUp(self) -> None:
@@ -210,6 +192,25 @@ class TestKTSSValidatorAnnotate(TestCase):
 
         self.assertEqual(result, annotated)
 
+    def test_annotate_sequence_separator(self):
+        result = self.ktss_validator.annotate_sequence("AG", separator="-")
+
+        self.assertEqual(result, "a-d")
+
+    def test_annotate_batch_separator(self):
+        result = self.ktss_validator.annotate_batch(
+            ["AG"] * 3, workers=2, chunk_size=1, separator="-"
+        )
+
+        self.assertEqual(result, ["a-d"] * 3)
+
+    def test_prepare_annotation(self):
+        self.assertIsNone(self.ktss_validator._wca)
+
+        self.ktss_validator._prepare_annotation()
+
+        self.assertIsNotNone(self.ktss_validator._wca._greedy_transitions)
+
     def test_5(self):
         sequence = "AA"
         annotated_mutation = "al"
@@ -368,3 +369,37 @@ class TestKTSSValidatorDistances(TestCase):
         result = self.ktss_validator._get_possible_symbols(current_state, symbol)
 
         self.assertFalse(result)
+
+    def test__get_possible_symbols_without_transitions(self):
+        result = self.ktss_validator._get_possible_symbols("16", "A")
+
+        self.assertFalse(result)
+
+    def test__get_possible_symbols_parser(self):
+        self.ktss_validator.parser = ParserFactory
+
+        result = self.ktss_validator._get_possible_symbols("2", "C")
+
+        self.assertEqual(result, ["a", "b", "d", "l"])
+
+    def test__get_candidate_symbols(self):
+        compiled_dfa = self.ktss_validator.compiled_dfa
+        state = compiled_dfa.state_index["2"]
+
+        result = self.ktss_validator._get_candidate_symbols(state, "C")
+
+        self.assertEqual(result.tolist(), [compiled_dfa.symbol_index["d"]])
+
+    def test_candidate_table_lazy(self):
+        self.assertIsNone(self.ktss_validator.candidate_offsets)
+
+        self.ktss_validator._get_possible_symbols("2", "C")
+
+        self.assertIsNotNone(self.ktss_validator.candidate_offsets)
+
+    def test_candidate_table_parser(self):
+        self.ktss_validator._get_possible_symbols("2", "C")
+
+        self.ktss_validator.parser = ParserFactoryKTSSValidatorAnnotate
+
+        self.assertIsNone(self.ktss_validator.candidate_offsets)
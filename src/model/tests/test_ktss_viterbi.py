@@ -1,7 +1,8 @@
 from unittest import TestCase
 
+from src.model import ktssValidation
 from src.model.ktssViterbi import KTSSViterbi
-from src.model.tests.factories import ParserFactoryKTSSValidatorDistances
+from src.model.tests.factories import ParserFactory, ParserFactoryKTSSValidatorDistances
 
 
 class TestKTSSValidatorViterbi(TestCase):
@@ -44,26 +45,6 @@ class TestKTSSValidatorViterbi(TestCase):
         self.ktss_validator.parser = ParserFactoryKTSSValidatorDistances
         return super().setUp()
 
-    def test__get_symbol_by_destination(self):
-        transitions = {"a": "1", "b": "2"}
-        destination = "2"
-        origin = "b"
-
-        result = self.ktss_validator._get_symbol_by_destination(
-            transitions, destination
-        )
-
-        self.assertEqual(result, origin)
-
-    def test__backtrack(self):
-        state = "18"
-        backward = {0: {"2": "1"}, 1: {"15": "2"}, 2: {"16": "15"}, 3: {"18": "16"}}
-        sequence = "alzz"
-
-        result = self.ktss_validator._backtrack(state, backward, 3)
-
-        self.assertEqual(result, sequence)
-
     def test_annotate_sequence_viterbi(self):
         sequence = "AAAA"
         annotation = "alzz"
@@ -79,3 +60,89 @@ class TestKTSSValidatorViterbi(TestCase):
         result = self.ktss_validator.annotate_sequence(sequence)
 
         self.assertEqual(result, annotation)
+
+    def test_annotate_sequence_viterbi_parser(self):
+        self.ktss_validator.annotate_sequence("AAAA")
+        self.ktss_validator.parser = ParserFactory
+
+        result = self.ktss_validator.annotate_sequence("AAAA")
+
+        self.assertEqual(result, "aazz")
+
+    def test_annotate_sequence_viterbi_separator(self):
+        result = self.ktss_validator.annotate_sequence("AAAA", separator="-")
+
+        self.assertEqual(result, "a-l-z-z")
+
+    def test_annotate_sequence_viterbi_compiled(self):
+        compiled_dfa = self.ktss_validator.compiled_dfa
+        validator = KTSSViterbi(
+            compiled_dfa, parser=ParserFactoryKTSSValidatorDistances
+        )
+
+        result = validator.annotate_sequence("AAAA")
+
+        self.assertEqual(result, "alzz")
+        self.assertIs(validator.compiled_dfa, compiled_dfa)
+        self.assertIsNone(validator._dfa)
+        self.assertIsNone(validator._wca)
+
+    def test_annotate_batch(self):
+        sequences = ["AAAA", "AAAAA", "AAA"] * 5
+        annotations = [self.ktss_validator.annotate_sequence(i) for i in sequences]
+
+        result = self.ktss_validator.annotate_batch(sequences, workers=2, chunk_size=4)
+
+        self.assertEqual(result, annotations)
+
+    def test_annotate_batch_releases_validator(self):
+        annotations = self.ktss_validator.iter_annotate_batch(
+            ["AAAA"] * 4, workers=2, chunk_size=1
+        )
+        next(annotations)
+        annotations.close()
+
+        self.assertIsNone(ktssValidation._annotation_validator)
+
+    def test_annotate_batch_separator(self):
+        result = self.ktss_validator.annotate_batch(["AAAA"], separator="-")
+
+        self.assertEqual(result, ["a-l-z-z"])
+
+    def test_generate_distances_workers(self):
+        sequences = [("AAAA", "alzz"), ("AAAA", "aazz")] * 3
+
+        result = self.ktss_validator.generate_distances(sequences, workers=2)
+
+        self.assertEqual(result, self.ktss_validator.generate_distances(sequences))
+
+
+class TestKTSSValidatorViterbiLong(TestCase):
+    def setUp(self) -> None:
+        self.length = 1500
+        states = {str(i) for i in range(self.length + 1)}
+        transitions = {}
+        probabilities = {}
+        for i in range(self.length):
+            transitions[str(i)] = {"a": str(i + 1), "l": str(i + 1), "z": str(i + 1)}
+            probabilities[str(i)] = {"a": 0.3, "l": 0.6, "z": 0.1}
+            if i % 3 == 0:
+                probabilities[str(i)] = {"a": 0.6, "l": 0.3, "z": 0.1}
+        model = {
+            "alphabet": {"a", "l", "z"},
+            "states": states,
+            "transitions": transitions,
+            "initial_state": "0",
+            "final_states": {},
+            "probabilities": probabilities,
+        }
+        self.ktss_validator = KTSSViterbi(model)
+        self.ktss_validator.parser = ParserFactoryKTSSValidatorDistances
+        return super().setUp()
+
+    def test_annotate_sequence_viterbi_long(self):
+        annotation = "".join("a" if i % 3 == 0 else "l" for i in range(self.length))
+
+        result = self.ktss_validator.annotate_sequence("A" * self.length)
+
+        self.assertEqual(result, annotation)
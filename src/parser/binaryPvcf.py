@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+import shutil
+import struct
+import tempfile
+from array import array
+
+import numpy as np
+
+BINARY_PVCF_MAGIC: bytes = b"BPVCF001"
+"""First bytes of a binary parsed vcf file."""
+
+BINARY_PVCF_EXTENSION: str = ".bpvcf"
+"""Extension of the binary parsed vcf files."""
+
+_HEADER = struct.Struct("<8s7Q")
+
+
+def is_binary_pvcf(path: str) -> bool:
+    """Checks if a parsed vcf file is a binary file.
+
+    Parameters
+    ----------
+    path: str
+        Path of the file.
+
+    Returns
+    -------
+    True if the file is a binary parsed vcf file, otherwise False.
+    """
+    with open(path, "rb") as pvcf_file:
+        return pvcf_file.read(len(BINARY_PVCF_MAGIC)) == BINARY_PVCF_MAGIC
+
+
+class BinaryPvcfWriter(object):
+    """Writes parsed sequences into a binary columnar file.
+
+    Each record has four columns: the original sequence (as it is written on the text
+    files, without the new line), the symbols of the parsed sequence (the prefix, the
+    infix and the suffix joined), the length of the prefix and the length of the suffix.
+    The file has a header followed by the sections:
+
+    ```
+        original data    uint8[original_size]
+        symbols data     uint8[symbols_size]
+        original offsets int64[records + 1]
+        symbols offsets  int64[records + 1]
+        prefix lengths   int64[records]
+        suffix lengths   int64[records]
+    ```
+
+    The header stores the magic bytes, the number of records and the byte offset of
+    each section. The records are streamed, only the offsets and lengths are kept in
+    memory until the file is closed:
+
+    ```python
+        with BinaryPvcfWriter("parsed.bpvcf") as writer:
+            writer.write("ACGT|T", "qwfzx", 2, 2)
+    ```
+
+    Parameters
+    ----------
+    path: str
+        Path of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(b"\0" * _HEADER.size)
+        self._symbols_file = tempfile.TemporaryFile()
+
+        self._original_offsets = array("q", [0])
+        self._symbols_offsets = array("q", [0])
+        self._prefix_lengths = array("q")
+        self._suffix_lengths = array("q")
+
+    def write(
+        self, original: str, symbols: str, prefix_length: int, suffix_length: int
+    ) -> None:
+        """Writes a record.
+
+        Parameters
+        ----------
+        original: str
+            Original sequence.
+        symbols: str
+            Symbols of the parsed sequence.
+        prefix_length: int
+            Number of symbols of the prefix.
+        suffix_length: int
+            Number of symbols of the suffix.
+        """
+        original = original.encode("ascii")
+        symbols = symbols.encode("ascii")
+
+        self._file.write(original)
+        self._symbols_file.write(symbols)
+        self._original_offsets.append(self._original_offsets[-1] + len(original))
+        self._symbols_offsets.append(self._symbols_offsets[-1] + len(symbols))
+        self._prefix_lengths.append(prefix_length)
+        self._suffix_lengths.append(suffix_length)
+
+    def close(self) -> None:
+        """Writes the symbols and the offsets sections and the header."""
+        if self._file.closed:
+            return
+
+        sections = [self._file.tell()]
+        self._symbols_file.seek(0)
+        shutil.copyfileobj(self._symbols_file, self._file)
+        self._symbols_file.close()
+
+        for column in (
+            self._original_offsets,
+            self._symbols_offsets,
+            self._prefix_lengths,
+            self._suffix_lengths,
+        ):
+            # The columns of integers are aligned to 8 bytes, so they can be mapped
+            self._file.write(b"\0" * (-self._file.tell() % 8))
+            sections.append(self._file.tell())
+            column.tofile(self._file)
+        sections.append(self._file.tell())
+
+        self._file.seek(0)
+        self._file.write(
+            _HEADER.pack(BINARY_PVCF_MAGIC, len(self._prefix_lengths), *sections)
+        )
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class BinaryPvcfReader(object):
+    """Reads a binary parsed vcf file generated by `BinaryPvcfWriter` through a memory
+    map, so the columns are numpy arrays that are not read until they are used.
+
+    Parameters
+    ----------
+    path: str
+        Path of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+
+        (
+            magic,
+            self.length,
+            symbols_start,
+            original_offsets_start,
+            symbols_offsets_start,
+            prefix_lengths_start,
+            suffix_lengths_start,
+            _,
+        ) = _HEADER.unpack(self._map[: _HEADER.size].tobytes())
+        if magic != BINARY_PVCF_MAGIC:
+            raise ValueError(f"{path} is not a binary parsed vcf file")
+
+        self.original_offsets = self._column(original_offsets_start, self.length + 1)
+        self.symbols_offsets = self._column(symbols_offsets_start, self.length + 1)
+        self.prefix_lengths = self._column(prefix_lengths_start, self.length)
+        self.suffix_lengths = self._column(suffix_lengths_start, self.length)
+
+        self.original_data = self._map[_HEADER.size : symbols_start]
+        self.symbols_data = self._map[
+            symbols_start : symbols_start + int(self.symbols_offsets[-1])
+        ]
+
+    def _column(self, start: int, length: int) -> np.ndarray:
+        """Gets a column of integers of the file.
+
+        Parameters
+        ----------
+        start: int
+            Byte offset of the column.
+        length: int
+            Number of items of the column.
+
+        Returns
+        -------
+        The column.
+        """
+        return self._map[start : start + 8 * length].view(np.int64)
+
+    @staticmethod
+    def _strings(data: np.ndarray, offsets: np.ndarray) -> list:
+        """Splits a column of strings using its offsets.
+
+        Parameters
+        ----------
+        data: ndarray
+            Data of the column.
+        offsets: ndarray
+            Offsets of each string of the column.
+
+        Returns
+        -------
+        List of strings.
+        """
+        text = data.tobytes().decode("ascii")
+        offsets = offsets.tolist()
+
+        return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    def originals(self) -> list:
+        """Returns the original sequences.
+
+        Returns
+        -------
+        List of original sequences.
+        """
+        return self._strings(self.original_data, self.original_offsets)
+
+    def symbols(self) -> list:
+        """Returns the symbols of the parsed sequences.
+
+        Returns
+        -------
+        List of parsed sequences.
+        """
+        return self._strings(self.symbols_data, self.symbols_offsets)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> tuple:
+        original = self.original_data[
+            self.original_offsets[index] : self.original_offsets[index + 1]
+        ]
+        symbols = self.symbols_data[
+            self.symbols_offsets[index] : self.symbols_offsets[index + 1]
+        ]
+
+        return (
+            original.tobytes().decode("ascii"),
+            symbols.tobytes().decode("ascii"),
+            int(self.prefix_lengths[index]),
+            int(self.suffix_lengths[index]),
+        )
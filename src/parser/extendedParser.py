@@ -68,6 +68,183 @@ class ExtendedParserVcf(ParserVcf):
 
     name: str = "extended"
 
+    @classmethod
+    def _translation_table(cls, mapping: dict) -> bytes:
+        """Generates a table for `bytes.translate` from a mapping between nucleotides and
+        symbols. The lowercase nucleotides have the symbols of the uppercase ones, the
+        new line character is kept and any other character is changed to `\\0`.
+
+        Parameters
+        ----------
+        mapping: dict
+            Mapping between nucleotides and symbols.
+
+        Returns
+        -------
+        The translation table.
+        """
+        table = bytearray(256)
+        table[ord("\n")] = ord("\n")
+        for nucleotide, symbol in mapping.items():
+            table[ord(nucleotide.upper())] = ord(symbol)
+            table[ord(nucleotide.lower())] = ord(symbol)
+
+        return bytes(table)
+
+    @classmethod
+    def _translation_tables(cls) -> dict:
+        """Translation tables of the prefix, the mutation and the suffix mappings. The
+        tables are generated once per class.
+
+        Returns
+        -------
+        Dictionary with the tables of the keys `"prefix"`, `"mutation"` and
+        `"suffix"`.
+        """
+        if "_tables" not in cls.__dict__:
+            cls._tables = {
+                "prefix": cls._translation_table(cls.prefix_map),
+                "suffix": cls._translation_table(cls.suffix_map),
+            }
+            if all(isinstance(i, str) for i in cls.mutations_map.values()):
+                cls._tables["mutation"] = cls._translation_table(cls.mutations_map)
+
+        return cls._tables
+
+    @classmethod
+    def _translate(cls, sequence: str, table: str) -> str:
+        """Changes every nucleotide of a sequence to its symbol using a translation
+        table.
+
+        Parameters
+        ----------
+        sequence: str
+            Sequence.
+        table: str
+            Name of the translation table: `"prefix"`, `"mutation"` or `"suffix"`.
+
+        Raises
+        ------
+        KeyError
+            When the sequence has a character without symbol.
+
+        Returns
+        -------
+        The sequence of symbols.
+        """
+        translated = sequence.encode("ascii").translate(
+            cls._translation_tables()[table]
+        )
+        if 0 in translated:
+            raise KeyError(sequence[translated.index(0)])
+
+        return translated.decode("ascii")
+
+    @classmethod
+    def _translate_batch(cls, sequences: list, table: str) -> list:
+        """Changes every nucleotide of many sequences to its symbol, translating all the
+        sequences at once.
+
+        Parameters
+        ----------
+        sequences: list
+            Sequences.
+        table: str
+            Name of the translation table: `"prefix"`, `"mutation"` or `"suffix"`.
+
+        Returns
+        -------
+        The sequences of symbols.
+        """
+        if not sequences:
+            return []
+
+        return cls._translate("\n".join(sequences), table).split("\n")
+
+    @classmethod
+    def _encode_mutation(cls, sequence: Union[tuple, list], mutation: str) -> str:
+        """Transforms the mutation of a sequence into symbols.
+
+        Parameters
+        ----------
+        sequence: tuple
+            Sequence.
+        mutation: str
+            Mutation sequence.
+
+        Returns
+        -------
+        Symbols of the mutation.
+        """
+        return cls._translate(mutation, "mutation")
+
+    @classmethod
+    def _encode_mutation_batch(cls, sequences: list, mutations: list) -> list:
+        """Transforms the mutations of many sequences into symbols.
+
+        Parameters
+        ----------
+        sequences: list
+            Sequences.
+        mutations: list
+            Mutation sequences.
+
+        Returns
+        -------
+        Symbols of the mutations.
+        """
+        return cls._translate_batch(mutations, "mutation")
+
+    @classmethod
+    def encode(cls, sequence: Union[tuple, list], mutation: str) -> tuple:
+        """Transforms the sequence with a given mutation into a sequence of symbols, as
+        `method` does, but each part of the result is a string.
+
+        For instance, if the sequence is `("ACGT","ACGT","ACGT")` and the mutation is
+        `"ACGT"`, the method returns `("qwer", "asdf", "zxcv")`.
+
+        Parameters
+        ----------
+        sequence: tuple
+            Sequence.
+        mutation: str
+            Mutation sequence.
+
+        Returns
+        -------
+        Transformed sequence.
+        """
+        return (
+            cls._translate(sequence[0], "prefix"),
+            cls._encode_mutation(sequence, mutation),
+            cls._translate(sequence[2], "suffix"),
+        )
+
+    @classmethod
+    def encode_batch(cls, sequences: list, mutations: list) -> list:
+        """Transforms many sequences with their mutations into sequences of symbols (see
+        `encode`). The prefixes, the mutations and the suffixes of all the sequences
+        are translated at once.
+
+        Parameters
+        ----------
+        sequences: list
+            Sequences.
+        mutations: list
+            Mutation sequences.
+
+        Returns
+        -------
+        Transformed sequences.
+        """
+        return list(
+            zip(
+                cls._translate_batch([i[0] for i in sequences], "prefix"),
+                cls._encode_mutation_batch(sequences, mutations),
+                cls._translate_batch([i[2] for i in sequences], "suffix"),
+            )
+        )
+
     @classmethod
     def method(cls, sequence: Union[tuple, list], mutation: str) -> tuple:
         """Parse the sequence with a given mutation to a new sequence with different
@@ -100,12 +277,7 @@ class ExtendedParserVcf(ParserVcf):
         -------
         Transformed sequence.
         """
-
-        left = [cls.prefix_map[nucletid.upper()] for nucletid in sequence[0]]
-        middle = [cls.mutations_map[nucletid.upper()] for nucletid in mutation]
-        right = [cls.suffix_map[nucletid.upper()] for nucletid in sequence[2]]
-
-        return (left, middle, right)
+        return tuple(list(part) for part in cls.encode(sequence, mutation))
 
     def sequence_to_string(
         self,
@@ -162,25 +334,86 @@ class ExtendedParserVcf(ParserVcf):
         -------
         Transformed sequence.
         """
-        result_sequence = self.method(sequence, mutation)
+        return self._encoded_to_string(
+            self.encode(sequence, mutation),
+            original_sequence,
+            prefix,
+            separator_symbols,
+            separator_sequences,
+            prefix_separator,
+        )
 
-        parsed_sequence_prefix = separator_symbols.join(result_sequence[0])
-        parsed_sequence_infix = separator_symbols.join(result_sequence[1])
-        parsed_sequence_suffix = separator_symbols.join(result_sequence[2])
+    @staticmethod
+    def _encoded_to_string(
+        encoded_sequence: tuple,
+        original_sequence: str,
+        prefix: str,
+        separator_symbols: str = "-",
+        separator_sequences: str = " ",
+        prefix_separator: str = "*",
+    ) -> str:
+        """Transforms a sequence returned by `encode` to a string format (see
+        `sequence_to_string`).
 
-        parsed_sequence = (
-            parsed_sequence_prefix,
-            parsed_sequence_infix,
-            parsed_sequence_suffix,
+        Parameters
+        ----------
+        encoded_sequence: tuple
+            Sequence returned by `encode`.
+        original_sequence: str
+            Original sequence in a string shape.
+        prefix: str
+            Prefix to append before the parsed sequence.
+        separator_symbols: str = "-"
+            Symbol that is between each symbol of the parsed sequence.
+        separator_sequences: str = " "
+            Symbol that is between each symbol of the transformed sequence.
+        prefix_separator: str = "*"
+            Symbols that divide each part of the prefix.
+
+        Returns
+        -------
+        Transformed sequence.
+        """
+        string_sequence = separator_sequences.join(
+            separator_symbols.join(part) for part in encoded_sequence
         )
 
-        string_sequence_prefix = (
+        return (
             f"{original_sequence}{prefix_separator}{prefix}{prefix_separator}"
+            f"{string_sequence}\n"
         )
 
-        string_sequence = separator_sequences.join(parsed_sequence)
+    def sequences_to_string(
+        self,
+        sequences: list,
+        mutations: list,
+        original_sequences: list,
+        prefixes: list,
+    ) -> list:
+        """Transforms many sequences to a string format (see `sequence_to_string`),
+        encoding all the sequences at once with `encode_batch`.
 
-        return f"{string_sequence_prefix}{string_sequence}\n"
+        Parameters
+        ----------
+        sequences: list
+            Sequences.
+        mutations: list
+            Mutations.
+        original_sequences: list
+            Original sequences in a string shape.
+        prefixes: list
+            Prefixes to append before the parsed sequences.
+
+        Returns
+        -------
+        Transformed sequences.
+        """
+        return [
+            self._encoded_to_string(encoded_sequence, original_sequence, prefix)
+            for encoded_sequence, original_sequence, prefix in zip(
+                self.encode_batch(sequences, mutations), original_sequences, prefixes
+            )
+        ]
 
     @staticmethod
     def retrive_sequence(
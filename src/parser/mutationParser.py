@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Union
 
 import Levenshtein
@@ -24,6 +25,9 @@ MUTATION_TYPES = [
     (REPLACE, MUTATIONS_SUBSITUTION_SYMBOLS),
 ]
 
+MUTATION_CACHE_SIZE = 65536
+""" Maximum number of pairs (reference, mutation) whose symbols are cached """
+
 
 class MutationParser(ExtendedParserVcf):
     """Parses data from the files VCF and FASTA and prepares that data for a machine
@@ -80,6 +84,11 @@ class MutationParser(ExtendedParserVcf):
 
     The transformed sequence is named the **mutation** sequence.
 
+    The symbols of the mutations are obtained from the edit operations between the
+    reference and the mutation. The SNVs and the insertions or deletions of one
+    nucleotide are solved without computing the edit operations and the symbols of the
+    other pairs (reference, mutation) are cached (see `cache_info`).
+
     Parameters
     ----------
     vcf_path: str
@@ -122,9 +131,9 @@ class MutationParser(ExtendedParserVcf):
         return res
 
     @classmethod
-    def method(cls, sequence: Union[tuple, list], mutation: str) -> tuple:
-        """Parse the sequence with a given mutation to a new sequence with different
-        noation, in this case a **mutation** sequence.
+    def _encode_mutation(cls, sequence: Union[tuple, list], mutation: str) -> str:
+        """Transforms the mutation of a sequence into symbols, in this case each
+        operation that changes the infix of the sequence into the mutation is a symbol.
 
         For instance, if the sequence is
 
@@ -138,7 +147,7 @@ class MutationParser(ExtendedParserVcf):
             "GTTCAC"
         ```
 
-        the method changes it to:
+        the method returns `"uadtf"`, so `method` changes the sequence to:
 
         ```python
             (
@@ -157,10 +166,78 @@ class MutationParser(ExtendedParserVcf):
 
         Returns
         -------
-        Transformed sequence.
+        Symbols of the mutation.
         """
-        infix = sequence[1]
+        symbols = cls._simple_mutation_symbols(sequence[1], mutation)
+        if symbols is not None:
+            return symbols
+
+        return cls._mutation_symbols(sequence[1], mutation)
+
+    @classmethod
+    def _simple_mutation_symbols(cls, infix: str, mutation: str) -> str:
+        """Gets the symbols of a mutation without computing the edit operations when
+        the mutation is a SNV, only inserts or deletes nucleotides, or inserts or
+        deletes one nucleotide of the infix.
+
+        Parameters
+        ----------
+        infix : str
+            Infix of the sequence.
+        mutation : str
+            Mutation sequence.
+
+        Returns
+        -------
+        Symbols of the mutation or None if the mutation is not simple.
+        """
+        if infix == mutation:
+            return ""
+
+        if not infix:
+            return "".join(cls.mutations_map[INSERT][i] for i in mutation)
+
+        if not mutation:
+            return "".join(cls.mutations_map[DELETE][i] for i in infix)
+
+        if len(infix) == 1 and len(mutation) == 1:
+            return cls.mutations_map[REPLACE][infix]
+
+        operation, shorter, longer = INSERT, infix, mutation
+        if len(infix) > len(mutation):
+            operation, shorter, longer = DELETE, mutation, infix
+
+        if len(longer) - len(shorter) != 1:
+            return None
+
+        # The nucleotide is inserted or deleted at the first different position, any
+        # other position that gives the same sequence has the same nucleotide
+        index = next(
+            (i for i, (a, b) in enumerate(zip(shorter, longer)) if a != b),
+            len(shorter),
+        )
+        if longer[index + 1 :] != shorter[index:]:
+            return None
+
+        return cls.mutations_map[operation][longer[index]]
+
+    @classmethod
+    @lru_cache(maxsize=MUTATION_CACHE_SIZE)
+    def _mutation_symbols(cls, infix: str, mutation: str) -> str:
+        """Gets the symbols of a mutation from the edit operations between the infix and
+        the mutation. The results are cached.
 
+        Parameters
+        ----------
+        infix : str
+            Infix of the sequence.
+        mutation : str
+            Mutation sequence.
+
+        Returns
+        -------
+        Symbols of the mutation.
+        """
         operations = Levenshtein.editops(infix, mutation)
 
         mutation_type_sequence = []
@@ -179,7 +256,42 @@ class MutationParser(ExtendedParserVcf):
 
             mutation_type_sequence.append(mutation_type_symbol)
 
-        left = [cls.prefix_map[nucletid.upper()] for nucletid in sequence[0]]
-        right = [cls.suffix_map[nucletid.upper()] for nucletid in sequence[2]]
+        return "".join(mutation_type_sequence)
+
+    @classmethod
+    def cache_info(cls) -> dict:
+        """Gets the counters of the cache of edit operations of the current process,
+        the processes of a parser with workers have their own caches.
 
-        return (left, mutation_type_sequence, right)
+        Returns
+        -------
+        Dictionary with the keys `"hits"` and `"misses"` (of the cache) and `"size"`
+        (number of cached mutations).
+        """
+        info = cls._mutation_symbols.cache_info()
+
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+        }
+
+    @classmethod
+    def _encode_mutation_batch(cls, sequences: list, mutations: list) -> list:
+        """Transforms the mutations of many sequences into symbols.
+
+        Parameters
+        ----------
+        sequences: list
+            Sequences.
+        mutations: list
+            Mutation sequences.
+
+        Returns
+        -------
+        Symbols of the mutations.
+        """
+        return [
+            cls._encode_mutation(sequence, mutation)
+            for sequence, mutation in zip(sequences, mutations)
+        ]
@@ -2,11 +2,19 @@
 
 import logging
 from abc import ABC, abstractmethod
+from collections import deque
+from multiprocessing import Pool
 from typing import Union
 
 from src.argumentParser.abstractArguments import AbstractParserArguments
+from src.constants.constants import (BINARY_PVCF_FORMAT, FILE_STORAGE,
+                                     LIGHT_VCF_READER, MMAP_STORAGE,
+                                     PACKED_STORAGE, PYVCF_READER,
+                                     TEXT_PVCF_FORMAT)
 from src.fasta.fastaReader import FastaReader
 from src.logging.tqdmLoggingHandler import TqdmLoggingHandler
+from src.parser.binaryPvcf import BINARY_PVCF_EXTENSION, BinaryPvcfWriter
+from src.parser.vcfReader import LightVcfReader, VcfAlternative, VcfRecord
 from tqdm import tqdm
 from vcf import Reader as VcfReader
 
@@ -46,6 +54,12 @@ class ParserVcf(AbstractParserArguments, ABC):
         Path of the vcf file.
     fasta_path: str
         Path of the fasta file.
+    fasta_storage: str = "file"
+        How the sequences are read from the fasta file.
+    vcf_reader: str = "pyvcf"
+        How the vcf file is read: `"pyvcf"` parses every column of the records with
+        PyVCF and `"light"` only parses the columns CHROM, POS, REF and ALT (see
+        `src.parser.vcfReader.LightVcfReader`).
     """
 
     _arguments: list = [
@@ -77,6 +91,40 @@ class ParserVcf(AbstractParserArguments, ABC):
             "type": str,
             "function_argumemnt": {"pfilename": "pfilename"},
         },
+        {
+            "key": "fstorage",
+            "name": "fasta-storage",
+            "help": f"How the sequences are read from the fasta file: seeking the file -> {FILE_STORAGE}, memory map -> {MMAP_STORAGE}, in memory with 2 bits per nucleotide -> {PACKED_STORAGE}",
+            "default": FILE_STORAGE,
+            "type": str,
+            "choices": [FILE_STORAGE, MMAP_STORAGE, PACKED_STORAGE],
+            "function_argumemnt": {"fasta_storage": "fasta_storage"},
+        },
+        {
+            "key": "vreader",
+            "name": "vcf-reader",
+            "help": f"How the vcf file is read: parsing all the columns with PyVCF -> {PYVCF_READER}, parsing only CHROM, POS, REF and ALT columns -> {LIGHT_VCF_READER}",
+            "default": PYVCF_READER,
+            "type": str,
+            "choices": [PYVCF_READER, LIGHT_VCF_READER],
+            "function_argumemnt": {"vcf_reader": "vcf_reader"},
+        },
+        {
+            "key": "pformat",
+            "name": "parser-format",
+            "help": f"Format of the parser file: text -> {TEXT_PVCF_FORMAT}, binary columns -> {BINARY_PVCF_FORMAT}",
+            "default": TEXT_PVCF_FORMAT,
+            "type": str,
+            "choices": [TEXT_PVCF_FORMAT, BINARY_PVCF_FORMAT],
+            "function_argumemnt": {"output_format": "parser_format"},
+        },
+        {
+            "key": "aalt",
+            "name": "all-alternatives",
+            "help": "Parses a sequence for each alternative allele of the records instead of only the first one",
+            "function_argumemnt": {"all_alternatives": "all_alternatives"},
+            "action": "store_true",
+        },
     ]
     """ Arguments that will be used by command line """
 
@@ -88,6 +136,9 @@ class ParserVcf(AbstractParserArguments, ABC):
         "parser_prefix": "prefix_length",
         "parser_suffix": "suffix_length",
         "result_folder": "path",
+        "workers": "workers",
+        "output_format": "output_format",
+        "all_alternatives": "all_alternatives",
     }
     """ Mapping between command line arguments and function arguments of the
     **generate_sequence** method """
@@ -95,11 +146,32 @@ class ParserVcf(AbstractParserArguments, ABC):
     fasta_reader: FastaReader = None
     """ Fasta reader """
 
-    def __init__(self, vcf_path: str, fasta_path: str):
-        logging.info("Loading vcf file")
-        self._vcf_file = VcfReader(open(vcf_path, "r"))
+    batch_size: int = 10000
+    """ Maximum number of contiguous records of the same chromosome whose sequences are
+    obtained from the fasta file at once """
+
+    worker_batches: int = 4
+    """ Maximum number of batches per worker that are sent to the workers ahead of the
+    batch that is being yielded """
 
-        self.fasta_reader = FastaReader(fasta_path)
+    def __init__(
+        self,
+        vcf_path: str,
+        fasta_path: str,
+        fasta_storage: str = FILE_STORAGE,
+        vcf_reader: str = PYVCF_READER,
+    ):
+        logging.info("Loading vcf file")
+        if vcf_reader == LIGHT_VCF_READER:
+            self._vcf_file = LightVcfReader(vcf_path, batch_size=self.batch_size)
+        elif vcf_reader == PYVCF_READER:
+            self._vcf_file = VcfReader(open(vcf_path, "r"))
+        else:
+            raise ValueError(f"Invalid vcf reader {vcf_reader}")
+
+        self._fasta_path = fasta_path
+        self._fasta_storage = fasta_storage
+        self.fasta_reader = FastaReader(fasta_path, storage=fasta_storage)
         logging.info("Loading finalized\n")
 
     @property
@@ -113,7 +185,12 @@ class ParserVcf(AbstractParserArguments, ABC):
         """Default filename for the results."""
         return f"parsed_{self.name}_data.pvcf"
 
-    def get_vcf(self) -> VcfReader:
+    @property
+    def _default_binary_filename(self) -> str:
+        """Default filename for the results in binary format."""
+        return f"parsed_{self.name}_data{BINARY_PVCF_EXTENSION}"
+
+    def get_vcf(self) -> Union[VcfReader, LightVcfReader]:
         """Returns vcf file.
 
         Returns
@@ -122,6 +199,26 @@ class ParserVcf(AbstractParserArguments, ABC):
         """
         return self._vcf_file
 
+    def _get_batches(self):
+        """Groups the contiguous records of the vcf file that are from the same
+        chromosome in batches of at most `batch_size` records.
+
+        Returns
+        -------
+        Generator of lists of records.
+        """
+        batch = []
+        for record in self.get_vcf():
+            if batch and (
+                record.CHROM != batch[0].CHROM or len(batch) == self.batch_size
+            ):
+                yield batch
+                batch = []
+            batch.append(record)
+
+        if batch:
+            yield batch
+
     def _original_sequence_to_string(
         self,
         prefix: str,
@@ -219,6 +316,285 @@ class ParserVcf(AbstractParserArguments, ABC):
         """
         pass
 
+    def sequences_to_string(
+        self,
+        sequences: list,
+        mutations: list,
+        original_sequences: list,
+        prefixes: list,
+    ) -> list:
+        """Transforms many sequences to a string format using `sequence_to_string`.
+
+        Parameters
+        ----------
+        sequences: list
+            Sequences.
+        mutations: list
+            Mutations.
+        original_sequences: list
+            Original sequences in a string shape.
+        prefixes: list
+            Prefixes to append before the parsed sequences.
+
+        Returns
+        -------
+        Transformed sequences.
+        """
+        return [
+            self.sequence_to_string(sequence, mutation, original_sequence, prefix)
+            for sequence, mutation, original_sequence, prefix in zip(
+                sequences, mutations, original_sequences, prefixes
+            )
+        ]
+
+    @staticmethod
+    def _get_mutations(record, all_alternatives: bool = False) -> list:
+        """Gets the mutations of a record, which are the sequences of its alternative
+        alleles. The missing alleles are skipped.
+
+        Parameters
+        ----------
+        record: Record
+            Record of the vcf file.
+        all_alternatives: bool = False
+            If true gets all the alternative alleles, otherwise only the first one.
+
+        Returns
+        -------
+        List of mutations.
+        """
+        if not all_alternatives:
+            return [record.ALT[0].sequence]
+
+        return [i.sequence for i in record.ALT if i is not None]
+
+    def _parse_batch(
+        self,
+        batch: list,
+        write_chromosome: bool,
+        add_original: bool,
+        prefix_length: int,
+        suffix_length: int,
+        add_mutation_to_original: bool,
+        binary: bool = False,
+        all_alternatives: bool = False,
+    ) -> list:
+        """Parses a batch of contiguous records of the same chromosome.
+
+        If `all_alternatives` is true a sequence is parsed for each alternative allele
+        of the records, otherwise only the first alternative allele is used.
+
+        If `binary` is true each parsed sequence is a tuple with the columns of the
+        binary format (see `src.parser.binaryPvcf.BinaryPvcfWriter`): the original
+        sequence, the symbols of the parsed sequence, the length of the prefix and the
+        length of the suffix.
+
+        Parameters
+        ----------
+        batch: list
+            Records of the vcf file.
+        write_chromosome: bool
+            If true add the chromosome where the sequences is from into the file.
+        add_original: bool
+            If true adds the original sequence into the file.
+        prefix_length: int
+            Length of the prefix.
+        suffix_length: int
+            Length of the suffix.
+        add_mutation_to_original: bool
+            If true Add mutation to original sequence.
+        binary: bool = False
+            If true returns the columns of the binary format.
+        all_alternatives: bool = False
+            If true parses all the alternative alleles of the records.
+
+        Returns
+        -------
+        Parsed sequences of the records.
+        """
+        batch_sequences = self.fasta_reader.sequences(
+            batch[0].CHROM,
+            [i.REF for i in batch],
+            [i.POS - 1 for i in batch],
+            prefix_length,
+            suffix_length,
+        )
+
+        sequences = []
+        mutations = []
+        original_sequences = []
+        prefixes = []
+        for i, sequence in zip(batch, batch_sequences):
+            assert sequence[1].upper() == i.REF.upper()
+
+            prefix = ""
+            if write_chromosome:
+                prefix = f"{i.CHROM}\t"
+
+            for mutation in self._get_mutations(i, all_alternatives):
+                original_sequence = ""
+                if add_original:
+                    original_sequence = self._original_sequence_to_string(
+                        prefix,
+                        sequence.copy(),
+                        mutation=mutation if add_mutation_to_original else None,
+                    )
+
+                sequences.append(sequence)
+                mutations.append(mutation)
+                original_sequences.append(original_sequence)
+                prefixes.append(prefix)
+
+        if not binary:
+            return self.sequences_to_string(
+                sequences, mutations, original_sequences, prefixes
+            )
+
+        binary_sequences = []
+        for sequence, mutation, original_sequence in zip(
+            sequences, mutations, original_sequences
+        ):
+            prefix_symbols, infix_symbols, suffix_symbols = (
+                "".join(symbols) for symbols in self.method(sequence, mutation)
+            )
+            binary_sequences.append(
+                (
+                    original_sequence.rstrip("\n"),
+                    f"{prefix_symbols}{infix_symbols}{suffix_symbols}",
+                    len(prefix_symbols),
+                    len(suffix_symbols),
+                )
+            )
+
+        return binary_sequences
+
+    @classmethod
+    def _to_records(cls, batch: list, all_alternatives: bool = False) -> list:
+        """Transforms the records of a batch into `src.parser.vcfReader.VcfRecord`, so
+        the batch can be sent to other processes.
+
+        Parameters
+        ----------
+        batch: list
+            Records of the vcf file.
+        all_alternatives: bool = False
+            If true keeps all the alternative alleles, otherwise only the first one.
+
+        Returns
+        -------
+        The records as `src.parser.vcfReader.VcfRecord`.
+        """
+        return [
+            VcfRecord(
+                i.CHROM,
+                i.POS,
+                i.REF,
+                [
+                    VcfAlternative(mutation)
+                    for mutation in cls._get_mutations(i, all_alternatives)
+                ],
+            )
+            for i in batch
+        ]
+
+    def __getstate__(self) -> dict:
+        # The vcf file and the fasta reader have open files, so they are not sent to
+        # other processes and the fasta reader is opened again
+        state = self.__dict__.copy()
+        state.pop("_vcf_file", None)
+        state.pop("fasta_reader", None)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.fasta_reader = FastaReader(self._fasta_path, storage=self._fasta_storage)
+
+    def iter_sequences(
+        self,
+        write_chromosome: bool = False,
+        add_original: bool = True,
+        prefix_length: int = 5,
+        suffix_length: int = 5,
+        add_mutation_to_original: bool = True,
+        workers: int = 1,
+        binary: bool = False,
+        all_alternatives: bool = False,
+    ):
+        """Parses the records of the vcf file using the method `method`, yielding the
+        parsed sequences one by one, so the sequences are not kept in memory.
+
+        The sequences of the contiguous records of the same chromosome are obtained
+        from the fasta file in batches (see `_get_batches`). If there are more than one
+        worker, the batches are parsed by a pool of processes, each one with its own
+        fasta reader, and the sequences are yielded in the order of the vcf file. At most
+        `worker_batches` batches per worker are read from the vcf file ahead of the
+        batch that is being yielded, so a slow consumer does not keep the whole vcf
+        file in memory.
+
+        Parameters
+        ----------
+        write_chromosome: bool = False
+            If true add the chromosome where the sequences is from.
+        add_original: bool = False
+            If true adds the original sequence.
+        prefix_length: int = 5
+            Length of the prefix.
+        suffix_length: int = 5
+            Length of the suffix.
+        add_mutation_to_original: bool = True
+            If true Add mutation to original sequence.
+        workers: int = 1
+            Number of processes that parse the sequences.
+        binary: bool = False
+            If true yields the columns of the binary format (see `_parse_batch`).
+        all_alternatives: bool = False
+            If true parses a sequence for each alternative allele of the records.
+
+        Returns
+        -------
+        Generator of parsed sequences.
+        """
+        logger = logging.getLogger()
+        tqdm_out = TqdmLoggingHandler(logger, level=logging.INFO)
+
+        options = {
+            "write_chromosome": write_chromosome,
+            "add_original": add_original,
+            "prefix_length": prefix_length,
+            "suffix_length": suffix_length,
+            "add_mutation_to_original": add_mutation_to_original,
+            "binary": binary,
+            "all_alternatives": all_alternatives,
+        }
+
+        pool = None
+        if workers > 1:
+            pool = Pool(workers, initializer=_init_worker, initargs=(self,))
+            results = _bounded_imap(
+                pool,
+                _parse_batch,
+                (
+                    (self._to_records(batch, all_alternatives), options)
+                    for batch in self._get_batches()
+                ),
+                workers * self.worker_batches,
+            )
+        else:
+            results = (
+                self._parse_batch(batch, **options) for batch in self._get_batches()
+            )
+
+        progress = tqdm(file=tqdm_out)
+        try:
+            for batch_sequences in results:
+                yield from batch_sequences
+                progress.update(len(batch_sequences))
+        finally:
+            progress.close()
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
     def _generate_sequences(
         self,
         path: str,
@@ -228,6 +604,10 @@ class ParserVcf(AbstractParserArguments, ABC):
         prefix_length: int = 5,
         suffix_length: int = 5,
         add_mutation_to_original: bool = True,
+        workers: int = 1,
+        collect: bool = True,
+        output_format: str = TEXT_PVCF_FORMAT,
+        all_alternatives: bool = False,
     ):
         """Generates a file with the mutated sequences using the method `method` for
         parse the sequence and the mutation.
@@ -236,6 +616,11 @@ class ParserVcf(AbstractParserArguments, ABC):
         source chromsome of the sequence, the length of the prefix and suffix, add the
         original sequence or add the mutation in the original sequence.
 
+        The sequences are written into the file as they are parsed (see
+        `iter_sequences`), they are only kept in memory if `collect` is true. The file
+        can be a text file or a binary columnar file (see
+        `src.parser.binaryPvcf.BinaryPvcfWriter`).
+
         Parameters
         ----------
         path: str
@@ -252,46 +637,54 @@ class ParserVcf(AbstractParserArguments, ABC):
             Length of the suffix.
         add_mutation_to_original: bool = True
             If true Add mutation to original sequence.
+        workers: int = 1
+            Number of processes that parse the sequences.
+        collect: bool = True
+            If true returns the parsed sequences.
+        output_format: str = "text"
+            Format of the file, `"text"` or `"binary"`.
+        all_alternatives: bool = False
+            If true parses a sequence for each alternative allele of the records.
 
         Returns
         -------
-        Parsed sequences from vcf.
+        Parsed sequences from vcf or None if `collect` is false. In binary format each
+        sequence is a tuple with the columns of the record.
         """
-        logger = logging.getLogger()
-        tqdm_out = TqdmLoggingHandler(logger, level=logging.INFO)
+        if output_format not in (TEXT_PVCF_FORMAT, BINARY_PVCF_FORMAT):
+            raise ValueError(f"Invalid parser format {output_format}")
 
+        binary = output_format == BINARY_PVCF_FORMAT
         if not filename:
             filename = self._default_filename
+            if binary:
+                filename = self._default_binary_filename
 
         logging.info(f"Parsing sequences using {self.name}")
-        sequences = []
-        with open(f"{path}/{filename}", "w") as parsed_data_file:
-            for i in tqdm(self.get_vcf(), file=tqdm_out):
-                sequence = self.fasta_reader[i.CHROM].sequence(
-                    i.REF, i.POS - 1, prefix_length, suffix_length
-                )
-
-                assert sequence[1].upper() == i.REF.upper()
-
-                prefix = ""
-                if write_chromosome:
-                    prefix = f"{i.CHROM}\t"
-
-                original_sequence = ""
-                if add_original:
-                    mutation = None
-                    if add_mutation_to_original:
-                        mutation = i.ALT[0].sequence
-                    original_sequence = self._original_sequence_to_string(
-                        prefix, sequence.copy(), mutation=mutation
-                    )
-
-                parsed_sequence = self.sequence_to_string(
-                    sequence, i.ALT[0].sequence, original_sequence, prefix
-                )
-
-                sequences.append(parsed_sequence)
-                parsed_data_file.write(parsed_sequence)
+        sequences = [] if collect else None
+        if binary:
+            parsed_data_file = BinaryPvcfWriter(f"{path}/{filename}")
+        else:
+            parsed_data_file = open(f"{path}/{filename}", "w")
+
+        with parsed_data_file:
+            for sequence in self.iter_sequences(
+                write_chromosome=write_chromosome,
+                add_original=add_original,
+                prefix_length=prefix_length,
+                suffix_length=suffix_length,
+                add_mutation_to_original=add_mutation_to_original,
+                workers=workers,
+                binary=binary,
+                all_alternatives=all_alternatives,
+            ):
+                if binary:
+                    parsed_data_file.write(*sequence)
+                else:
+                    parsed_data_file.write(sequence)
+
+                if collect:
+                    sequences.append(sequence)
 
         logging.info("Parsing finalized\n")
         return sequences
@@ -320,13 +713,16 @@ class ParserVcf(AbstractParserArguments, ABC):
             Length of the suffix.
         add_mutation_to_original: bool = True
             If true Add mutation to original sequence.
-
-        Returns
-        -------
-        Parsed sequences from vcf.
+        workers: int = 1
+            Number of processes that parse the sequences.
+        output_format: str = "text"
+            Format of the file, `"text"` or `"binary"`.
+        all_alternatives: bool = False
+            If true parses a sequence for each alternative allele of the records.
         """
         self._generate_sequences(
             **self.get_generate_sequences_arguments(**kwargs),
+            collect=False,
         )
 
     @staticmethod
@@ -364,3 +760,75 @@ class ParserVcf(AbstractParserArguments, ABC):
         The sequence in a different string format.
         """
         pass
+
+
+_worker_parser: ParserVcf = None
+""" Parser of the current worker process """
+
+
+def _init_worker(parser: ParserVcf):
+    """Sets the parser of a worker process, the parser opens its own fasta reader.
+
+    Parameters
+    ----------
+    parser: ParserVcf
+        Parser.
+    """
+    global _worker_parser
+    _worker_parser = parser
+    # The packed chromosomes are already in the memory inherited from the parent
+    # process and they do not read the fasta file, so they are not packed again
+    if parser._fasta_storage == PACKED_STORAGE:
+        return
+
+    # The forked processes share the open files of the parent process, so a fasta
+    # reader shared with them would read from the same offset
+    _worker_parser.fasta_reader = FastaReader(
+        parser._fasta_path, storage=parser._fasta_storage
+    )
+
+
+def _parse_batch(arguments: tuple) -> list:
+    """Parses a batch of records with the parser of the worker process.
+
+    Parameters
+    ----------
+    arguments: tuple
+        Batch of records and options of `ParserVcf._parse_batch`.
+
+    Returns
+    -------
+    Parsed sequences of the records.
+    """
+    batch, options = arguments
+    return _worker_parser._parse_batch(batch, **options)
+
+
+def _bounded_imap(pool: Pool, function, iterable, window: int):
+    """Applies a function to the items of an iterable with a pool of processes,
+    yielding the results in order like `Pool.imap`, but keeping at most `window`
+    items submitted to the pool and not yielded yet.
+
+    Parameters
+    ----------
+    pool: Pool
+        Pool of processes.
+    function: Callable
+        Function applied to each item.
+    iterable: Iterable
+        Items.
+    window: int
+        Maximum number of pending items.
+
+    Returns
+    -------
+    Generator of the results.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(pool.apply_async(function, (item,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+
+    while pending:
+        yield pending.popleft().get()
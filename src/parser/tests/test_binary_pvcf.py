@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+import pathlib
+import tempfile
+from unittest import TestCase
+
+from src.constants.constants import BINARY_PVCF_FORMAT, TEXT_PVCF_FORMAT
+from src.model.ktssModel import KTSSModel
+from src.parser.binaryPvcf import BinaryPvcfReader, BinaryPvcfWriter, is_binary_pvcf
+from src.parser.extendedParser import ExtendedParserVcf
+from src.parser.mutationParser import MutationParser
+
+
+class TestBinaryPvcf(TestCase):
+    def setUp(self) -> None:
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.path = f"{self.temporal_dir.name}/parsed.bpvcf"
+        self.records = [
+            ("chr1\tACGT|T", "qwfzx", 2, 2),
+            ("", "a", 0, 0),
+            ("CCGTA|AC", "wwsdzxc", 2, 3),
+        ]
+
+        with BinaryPvcfWriter(self.path) as writer:
+            for record in self.records:
+                writer.write(*record)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_is_binary_pvcf(self):
+        text_path = f"{self.temporal_dir.name}/parsed.pvcf"
+        with open(text_path, "w") as text_file:
+            text_file.write("ACGT|T\n**q-w f z-x\n")
+
+        self.assertTrue(is_binary_pvcf(self.path))
+        self.assertFalse(is_binary_pvcf(text_path))
+
+    def test_reader(self):
+        reader = BinaryPvcfReader(self.path)
+
+        result = [reader[i] for i in range(len(reader))]
+
+        self.assertEqual(result, self.records)
+
+    def test_reader_columns(self):
+        reader = BinaryPvcfReader(self.path)
+
+        self.assertEqual(reader.originals(), [i[0] for i in self.records])
+        self.assertEqual(reader.symbols(), [i[1] for i in self.records])
+        self.assertEqual(list(reader.prefix_lengths), [2, 0, 2])
+        self.assertEqual(list(reader.suffix_lengths), [2, 0, 3])
+        self.assertEqual(list(reader.symbols_offsets), [0, 5, 6, 13])
+
+    def test_reader_invalid(self):
+        text_path = f"{self.temporal_dir.name}/parsed.pvcf"
+        with open(text_path, "w") as text_file:
+            text_file.write("ACGT|T\n**q-w f z-x\n" * 10)
+
+        with self.assertRaises(ValueError):
+            BinaryPvcfReader(text_path)
+
+
+class TestParserVcfBinary(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def _generate(self, parser_class, **kwargs):
+        parser = parser_class(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+        )
+        parser._generate_sequences(self.temporal_dir.name, **kwargs)
+
+        return parser
+
+    def test_generate_sequences(self):
+        for parser_class in (ExtendedParserVcf, MutationParser):
+            parser = self._generate(parser_class)
+            with open(f"{self.temporal_dir.name}/{parser._default_filename}") as file:
+                lines = file.readlines()
+            originals = [i.rstrip("\n") for i in lines[::2]]
+            symbols = [parser.retrive_string_sequence(i) for i in lines[1::2]]
+
+            parser = self._generate(parser_class, output_format=BINARY_PVCF_FORMAT)
+            reader = BinaryPvcfReader(
+                f"{self.temporal_dir.name}/{parser._default_binary_filename}"
+            )
+
+            self.assertEqual(reader.originals(), originals)
+            self.assertEqual(reader.symbols(), symbols)
+            for i, symbol in enumerate(symbols):
+                prefix, infix, suffix = parser.retrive_sequence(lines[2 * i + 1])
+                self.assertEqual(reader.prefix_lengths[i], len(prefix))
+                self.assertEqual(reader.suffix_lengths[i], len(suffix))
+
+    def test_get_samples(self):
+        parser = self._generate(ExtendedParserVcf)
+        text_model = KTSSModel(parser=ExtendedParserVcf)
+        text_model.get_samples(
+            f"{self.temporal_dir.name}/{parser._default_filename}", 0.5
+        )
+
+        parser = self._generate(ExtendedParserVcf, output_format=BINARY_PVCF_FORMAT)
+        binary_model = KTSSModel(parser=ExtendedParserVcf)
+        binary_model.get_samples(
+            f"{self.temporal_dir.name}/{parser._default_binary_filename}", 0.5
+        )
+
+        self.assertEqual(
+            binary_model.get_training_samples(), text_model.get_training_samples()
+        )
+        self.assertEqual(binary_model.get_test_samples(), text_model.get_test_samples())
+
+    def test_get_samples_cropped(self):
+        for output_format in (TEXT_PVCF_FORMAT, BINARY_PVCF_FORMAT):
+            for parser_class in (ExtendedParserVcf, MutationParser):
+                parser = self._generate(
+                    parser_class,
+                    output_format=output_format,
+                    write_chromosome=True,
+                    prefix_length=3,
+                    suffix_length=2,
+                )
+                filename = parser._default_filename
+                if output_format == BINARY_PVCF_FORMAT:
+                    filename = parser._default_binary_filename
+                model = KTSSModel(parser=parser_class)
+                model.get_samples(f"{self.temporal_dir.name}/{filename}", 0.5)
+                samples = model.get_training_samples(), model.get_test_samples()
+
+                self._generate(
+                    parser_class,
+                    output_format=output_format,
+                    write_chromosome=True,
+                    prefix_length=10,
+                    suffix_length=12,
+                )
+                model = KTSSModel(parser=parser_class)
+                model.get_samples(
+                    f"{self.temporal_dir.name}/{filename}",
+                    0.5,
+                    prefix_length=3,
+                    suffix_length=2,
+                )
+                result = model.get_training_samples(), model.get_test_samples()
+
+                self.assertEqual(result, samples)
+
+    def test_crop_sample(self):
+        result = KTSSModel._crop_sample("chr1\tACGTTCA|G", "qwefzxc", 3, 3, 1, 2)
+
+        self.assertEqual(result, ("chr1\tGTTC|G", "efzx"))
+
+    def test_crop_sample_shorter(self):
+        result = KTSSModel._crop_sample("ACGTT", "wefzx", 2, 2, 4, None)
+
+        self.assertEqual(result, ("ACGTT", "wefzx"))
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import pathlib
+import tempfile
+from multiprocessing import Pool
 from unittest import TestCase
 from unittest.mock import mock_open, patch
 
+from src.constants.constants import PACKED_STORAGE
 from src.parser.extendedParser import ExtendedParserVcf
+from src.parser.parserVcf import _bounded_imap
 
 
 class TestExtendedParserVcf_ParserVcf(TestCase):
@@ -70,6 +74,65 @@ class TestExtendedParserVcf_ParserVcf(TestCase):
 
         self.assertEqual(result, parsed_sequence)
 
+    def test_method_lowercase(self):
+        sequence = ("acgt", "ACGT", "aCgT")
+        mutation = "tgca"
+        parsed_sequence = (
+            ["q", "w", "e", "r"],
+            ["f", "d", "s", "a"],
+            ["z", "x", "c", "v"],
+        )
+
+        result = self.parser.method(sequence, mutation)
+
+        self.assertEqual(result, parsed_sequence)
+
+    def test_method_invalid_nucleotide(self):
+        sequence = ("ACGT", "ACGT", "ACNT")
+
+        with self.assertRaises(KeyError):
+            self.parser.method(sequence, "TGCA")
+
+    def test_encode(self):
+        sequence = ("ACGT", "ACGT", "ACGT")
+        mutation = "TGCA"
+        encoded_sequence = ("qwer", "fdsa", "zxcv")
+
+        result = self.parser.encode(sequence, mutation)
+
+        self.assertEqual(result, encoded_sequence)
+
+    def test_encode_batch(self):
+        sequences = [("ACGT", "A", "ACGT"), ("", "C", "T"), ("GG", "T", "")]
+        mutations = ["TGCA", "A", ""]
+        encoded_sequences = [
+            ("qwer", "fdsa", "zxcv"),
+            ("", "a", "v"),
+            ("ee", "", ""),
+        ]
+
+        result = self.parser.encode_batch(sequences, mutations)
+
+        self.assertEqual(result, encoded_sequences)
+
+    def test_sequences_to_string(self):
+        sequences = [("ACGT", "ACGT", "ACGT"), ("AC", "A", "")]
+        mutations = ["TGCA", "C"]
+        original_sequences = ["ACGT", ""]
+        prefixes = ["prefix", ""]
+
+        result = self.parser.sequences_to_string(
+            sequences, mutations, original_sequences, prefixes
+        )
+
+        self.assertEqual(
+            result,
+            [
+                self.parser.sequence_to_string(*arguments)
+                for arguments in zip(sequences, mutations, original_sequences, prefixes)
+            ],
+        )
+
     def test_sequence_to_string(self):
         original_sequence = "ACGT"
         prefix = "prefix"
@@ -173,3 +236,153 @@ class TestExtendedParserVcf_ParserVcf(TestCase):
         result = ExtendedParserVcf.retrive_string_sequence(sequence)
 
         self.assertEqual(result, tuple_sequence)
+
+
+class TestExtendedParserVcfWorkers(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_generate_sequences_workers(self):
+        sequences = ExtendedParserVcf(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+        )._generate_sequences(self.temporal_dir.name, write_chromosome=True)
+        parser = ExtendedParserVcf(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+        )
+        parser.batch_size = 2
+
+        result = parser._generate_sequences(
+            self.temporal_dir.name, write_chromosome=True, workers=2
+        )
+        with open(f"{self.temporal_dir.name}/{parser._default_filename}") as file:
+            lines = file.read()
+
+        self.assertEqual(result, sequences)
+        self.assertEqual(lines, "".join(sequences))
+
+    def test_generate_sequences_workers_packed(self):
+        sequences = self._parser()._generate_sequences(
+            self.temporal_dir.name, write_chromosome=True
+        )
+        parser = ExtendedParserVcf(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+            fasta_storage=PACKED_STORAGE,
+        )
+        parser.batch_size = 2
+
+        result = parser._generate_sequences(
+            self.temporal_dir.name, write_chromosome=True, workers=2
+        )
+
+        self.assertEqual(result, sequences)
+
+    def test_bounded_imap(self):
+        consumed = []
+
+        def items():
+            for i in range(6):
+                consumed.append(i)
+                yield i
+
+        with Pool(2) as pool:
+            results = _bounded_imap(pool, abs, items(), 2)
+            first = next(results)
+            pending = len(consumed)
+            result = [first, *results]
+
+        self.assertEqual(pending, 2)
+        self.assertEqual(result, list(range(6)))
+
+    def _parser(self) -> ExtendedParserVcf:
+        return ExtendedParserVcf(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+        )
+
+    def test_iter_sequences(self):
+        sequences = self._parser()._generate_sequences(self.temporal_dir.name)
+
+        result = self._parser().iter_sequences()
+
+        self.assertNotIsInstance(result, list)
+        self.assertEqual(list(result), sequences)
+
+    def test_generate_sequences_not_collect(self):
+        sequences = list(self._parser().iter_sequences())
+        parser = self._parser()
+
+        result = parser._generate_sequences(self.temporal_dir.name, collect=False)
+        with open(f"{self.temporal_dir.name}/{parser._default_filename}") as file:
+            lines = file.read()
+
+        self.assertIsNone(result)
+        self.assertEqual(lines, "".join(sequences))
+
+
+class TestExtendedParserVcfAllAlternatives(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.vcf_path = f"{self.temporal_dir.name}/multiple.vcf"
+        with open(self.vcf_path, "w") as vcf_file:
+            vcf_file.write(
+                "##fileformat=VCFv4.1\n"
+                "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+                "chr1\t12\trs01\tTG\tA,C\t.\t.\t.\n"
+                "chr1\t17\trs02\tG\tTA\t.\t.\t.\n"
+            )
+        self.single_path = f"{self.temporal_dir.name}/single.vcf"
+        with open(self.single_path, "w") as vcf_file:
+            vcf_file.write(
+                "##fileformat=VCFv4.1\n"
+                "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+                "chr1\t12\trs01\tTG\tA\t.\t.\t.\n"
+                "chr1\t12\trs01\tTG\tC\t.\t.\t.\n"
+                "chr1\t17\trs02\tG\tTA\t.\t.\t.\n"
+            )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def _generate(self, vcf_path: str, **kwargs) -> list:
+        parser = ExtendedParserVcf(vcf_path, f"{self.static_dir}test.fa.gz")
+
+        return parser._generate_sequences(
+            self.temporal_dir.name, write_chromosome=True, **kwargs
+        )
+
+    def test_generate_sequences_first_alternative(self):
+        sequences = self._generate(self.single_path)
+
+        result = self._generate(self.vcf_path)
+
+        self.assertEqual(result, [sequences[0], sequences[2]])
+
+    def test_generate_sequences_all_alternatives(self):
+        sequences = self._generate(self.single_path)
+
+        result = self._generate(self.vcf_path, all_alternatives=True)
+
+        self.assertEqual(result, sequences)
+
+    def test_generate_sequences_all_alternatives_workers(self):
+        sequences = self._generate(self.single_path)
+
+        result = self._generate(self.vcf_path, all_alternatives=True, workers=2)
+
+        self.assertEqual(result, sequences)
@@ -67,3 +67,55 @@ class TestMutationParser(TestCase):
         result = self.parser.method(sequence, mutation)
 
         self.assertEqual(result, mutation_type_sequence)
+
+    def test_encode_batch(self):
+        sequences = [("ACGT", "", "ACGT"), ("AC", "CG", "T"), ("G", "ACGT", "")]
+        mutations = ["ACGT", "C", "GCTC"]
+
+        result = self.parser.encode_batch(sequences, mutations)
+
+        self.assertEqual(
+            result,
+            [
+                tuple("".join(part) for part in self.parser.method(*arguments))
+                for arguments in zip(sequences, mutations)
+            ],
+        )
+
+    def test_simple_mutation_symbols(self):
+        pairs = [
+            ("A", "T"),
+            ("ACG", "AG"),
+            ("AG", "ACG"),
+            ("AAAT", "AAT"),
+            ("CGT", "CGTA"),
+            ("TCGA", "CGA"),
+            ("", "ACG"),
+            ("GT", ""),
+            ("ACGT", "ACGT"),
+        ]
+
+        result = [self.parser._simple_mutation_symbols(*pair) for pair in pairs]
+
+        self.assertEqual(
+            result, [self.parser._mutation_symbols(*pair) for pair in pairs]
+        )
+
+    def test_simple_mutation_symbols_complex(self):
+        pairs = [("ACGT", "TGCA"), ("AC", "GT"), ("ACGT", "AG"), ("AGT", "ACGA")]
+
+        result = [self.parser._simple_mutation_symbols(*pair) for pair in pairs]
+
+        self.assertEqual(result, [None] * len(pairs))
+
+    def test_cache_info(self):
+        info = self.parser.cache_info()
+
+        self.parser.method(("AC", "A", "GT"), "T")
+        self.parser.method(("AC", "ACGT", "GT"), "GTTCAC")
+        self.parser.method(("AC", "ACGT", "GT"), "GTTCAC")
+        result = self.parser.cache_info()
+
+        self.assertEqual(result["hits"], info["hits"] + 1)
+        self.assertLessEqual(result["misses"], info["misses"] + 1)
+        self.assertGreaterEqual(result["size"], 1)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import pathlib
+import shutil
+import tempfile
+from unittest import TestCase
+
+from src.constants.constants import LIGHT_VCF_READER
+from src.parser.extendedParser import ExtendedParserVcf
+from src.parser.vcfReader import LightVcfReader, VcfAlternative, VcfRecord
+from vcf import Reader as VcfReader
+
+
+class TestLightVcfReader(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.vcf_path = f"{self.static_dir}vcfTest.vcf"
+        self.reader = LightVcfReader(self.vcf_path, batch_size=3)
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_filename(self):
+        result = self.reader.filename
+
+        self.assertEqual(result, self.vcf_path)
+
+    def test_iter(self):
+        record = VcfRecord("chr1", 1, "G", [VcfAlternative("A")])
+
+        result = list(self.reader)
+
+        self.assertEqual(len(result), 10)
+        self.assertEqual(result[0], record)
+
+    def test_batches(self):
+        result = [len(batch) for batch in self.reader.batches()]
+
+        self.assertEqual(result, [3, 3, 3, 1])
+
+    def test_pyvcf(self):
+        with open(self.vcf_path, "r") as vcf_file:
+            records = [
+                (i.CHROM, i.POS, i.REF, [str(j) for j in i.ALT])
+                for i in VcfReader(vcf_file)
+            ]
+
+        result = [
+            (i.CHROM, i.POS, i.REF, [j.sequence for j in i.ALT]) for i in self.reader
+        ]
+
+        self.assertEqual(result, records)
+
+    def test_gzip(self):
+        gzip_path = f"{self.temporal_dir.name}/vcfTest.vcf.gz"
+        with open(self.vcf_path, "rb") as vcf_file, gzip.open(
+            gzip_path, "wb"
+        ) as gzip_file:
+            shutil.copyfileobj(vcf_file, gzip_file)
+
+        result = list(LightVcfReader(gzip_path))
+
+        self.assertEqual(result, list(self.reader))
+
+    def test_missing_alternative(self):
+        vcf_path = f"{self.temporal_dir.name}/missing.vcf"
+        with open(vcf_path, "w") as vcf_file:
+            vcf_file.write("#CHROM\tPOS\tID\tREF\tALT\nchr1\t3\t.\tA\tC,.\n")
+
+        result = list(LightVcfReader(vcf_path))
+
+        self.assertEqual(
+            result, [VcfRecord("chr1", 3, "A", [VcfAlternative("C"), None])]
+        )
+
+
+class TestExtendedParserVcfLightReader(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = f"{str(pathlib.Path(__file__).parent.absolute())}/static/"
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.parser = ExtendedParserVcf(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+        )
+        self.light_parser = ExtendedParserVcf(
+            f"{self.static_dir}vcfTest.vcf",
+            f"{self.static_dir}test.fa.gz",
+            vcf_reader=LIGHT_VCF_READER,
+        )
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def test_get_vcf(self):
+        result = self.light_parser.get_vcf()
+
+        self.assertIsInstance(result, LightVcfReader)
+
+    def test_generate_sequences(self):
+        sequences = self.parser._generate_sequences(
+            self.temporal_dir.name, write_chromosome=True
+        )
+
+        result = self.light_parser._generate_sequences(
+            self.temporal_dir.name, write_chromosome=True
+        )
+
+        self.assertEqual(result, sequences)
+
+    def test_invalid_reader(self):
+        with self.assertRaises(ValueError):
+            ExtendedParserVcf(
+                f"{self.static_dir}vcfTest.vcf",
+                f"{self.static_dir}test.fa.gz",
+                vcf_reader="invalid",
+            )
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+from collections import namedtuple
+
+VcfAlternative = namedtuple("VcfAlternative", ["sequence"])
+"""Alternative allele of a record, as the substitutions of PyVCF it has the attribute
+`sequence`."""
+
+VcfRecord = namedtuple("VcfRecord", ["CHROM", "POS", "REF", "ALT"])
+"""Record of a vcf file with the columns CHROM, POS, REF and ALT, where POS is an
+integer and ALT is a list of `VcfAlternative` (None when the allele is missing)."""
+
+
+class LightVcfReader(object):
+    """Reads the records of a vcf file parsing only the columns used by the parsers
+    (CHROM, POS, REF and ALT), the rest of the columns of each line are not tokenized.
+
+    The file can be a plain vcf file or a gzip compressed vcf file (with `.gz`
+    extension). The records are read in batches, iterating the reader yields the
+    records one by one and `batches` yields the lists of records:
+
+    ```python
+        reader = LightVcfReader("data.vcf.gz")
+
+        for record in reader:
+            print(record.CHROM, record.POS, record.REF, record.ALT[0].sequence)
+
+        for batch in reader.batches():
+            print(len(batch))
+    ```
+
+    Parameters
+    ----------
+    filename: str
+        Path of the vcf file.
+    batch_size: int = 10000
+        Number of records of each batch.
+    """
+
+    def __init__(self, filename: str, batch_size: int = 10000):
+        self.filename = filename
+        self.batch_size = batch_size
+
+    def _open(self):
+        """Opens the vcf file in text mode.
+
+        Returns
+        -------
+        The vcf file.
+        """
+        if self.filename.endswith(".gz"):
+            return gzip.open(self.filename, "rt")
+
+        return open(self.filename, "r")
+
+    @staticmethod
+    def _parse_alternatives(alternatives: str) -> list:
+        """Gets the alternative alleles of the ALT column.
+
+        Parameters
+        ----------
+        alternatives: str
+            ALT column.
+
+        Returns
+        -------
+        List of alternative alleles, None if the allele is missing.
+        """
+        return [
+            None if alternative == "." else VcfAlternative(alternative)
+            for alternative in alternatives.split(",")
+        ]
+
+    def batches(self):
+        """Reads the records of the vcf file in batches of `batch_size` records.
+
+        Returns
+        -------
+        Generator of lists of `VcfRecord`.
+        """
+        batch = []
+        with self._open() as vcf_file:
+            for line in vcf_file:
+                if line.startswith("#") or not line.strip():
+                    continue
+
+                chrom, pos, _, ref, alt = line.split("\t", 5)[:5]
+                alternatives = self._parse_alternatives(alt.rstrip("\n"))
+                batch.append(VcfRecord(chrom, int(pos), ref, alternatives))
+
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield from batch
@@ -1,18 +1,23 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import multiprocessing
 import os
+import random
 
 from src.argumentParser.argumentParser import ArgumentParser
-from src.constants.constants import (EXTENDED_PARSER_CODE, KTSS_MODEL,
+from src.constants.constants import (BINARY_PVCF_FORMAT, EXTENDED_PARSER_CODE,
+                                     FILE_STORAGE, KTSS_MODEL,
                                      MUTATION_PARSER_CODE,
-                                     PARSER_MODEL_OPERATION, PARSER_OPERATION)
+                                     PARSER_MODEL_OPERATION, PARSER_OPERATION,
+                                     PYVCF_READER)
 from src.model.ktssModel import KTSSModel
 from src.model.ktssValidation import KTSSValidator
 from src.model.ktssViterbi import KTSSViterbi
 from src.parser.extendedParser import ExtendedParserVcf
 from src.parser.mutationParser import MutationParser
 from src.parser.parserVcf import ParserVcf
+from src.runner.sweep import Sweep
 from src.utils.folders import parse_route
 
 dir_path = os.path.dirname(os.path.realpath(__file__))
@@ -47,6 +52,10 @@ class Runner(object):
         test_ratio=0.95,
         save_distances=False,
         steps=10,
+        cv_workers=1,
+        seed=None,
+        fasta_storage=FILE_STORAGE,
+        vcf_reader=PYVCF_READER,
         **kwargs,
     ):
         self._result_folder = parse_route(result_folder)
@@ -76,42 +85,68 @@ class Runner(object):
         self._options["test_ratio"] = test_ratio
         self._options["steps"] = steps
 
+        self._vcf_path = vcf_path
+        self._fasta_path = fasta_path
         self._steps = steps
+        self._cv_workers = cv_workers
+        self._seed = seed
 
-        self._parser_engine = parser(vcf_path, fasta_path)
+        self._parser_engine = parser(
+            vcf_path, fasta_path, fasta_storage=fasta_storage, vcf_reader=vcf_reader
+        )
 
     def parse_sequences(self):
         self._parser_engine.generate_sequences(**self._options)
 
-    def train_and_test_model(self):
-        total_error = 0.0
-        step_ratio = 1 / self._steps
-        self._model.get_samples(
-            f"{self._result_folder}{self._parser_engine._default_filename}",
-            self._test_ratio,
-        )
+    @property
+    def parsed_filename(self):
+        """Path of the file with the parsed sequences."""
+        filename = self._parser_engine._default_filename
+        if self._options.get("output_format") == BINARY_PVCF_FORMAT:
+            filename = self._parser_engine._default_binary_filename
 
-        for step in range(self._steps):
-            logging.info("###########################################")
-            logging.info(f"Validating step {step}")
-            logging.info("###########################################")
+        return f"{self._result_folder}{filename}"
 
-            self._model.shuffle_samples()
-            self._model.trainer(**self._options)
-            self._model.saver()
+    def train_and_test_model(
+        self, prefix_length=None, suffix_length=None, windows=None, save_model=True
+    ):
+        """Trains and tests the model with the parsed sequences.
+
+        If `prefix_length` or `suffix_length` are given, the prefixes and suffixes of
+        the parsed sequences are cropped to those lengths, so they must not be longer
+        than the lengths used by the parser. If `windows` is given (see
+        `AbstractModel.get_sample_windows`) the samples are taken from it instead of
+        reading the parsed file.
+
+        Each round of the validation shuffles the samples with its own seed (`seed` +
+        round, or a random seed if `seed` is not given), so the rounds are independent
+        and can be executed by `cv_workers` processes.
+        """
+        total_error = 0.0
+        step_ratio = 1 / self._steps
 
-            filename = (
-                f"{self._result_folder}{self._model.trainer_name}-distances-{step}.json"
+        if windows is None:
+            self._model.get_samples(
+                self.parsed_filename,
+                self._test_ratio,
+                prefix_length=prefix_length,
+                suffix_length=suffix_length,
             )
-
-            error_model = self._model.tester(
-                self._parser_engine,
-                filename,
-                **self._options,
+        else:
+            self._model.crop_samples(
+                windows, self._test_ratio, prefix_length, suffix_length
             )
 
+        if self._seed is None:
+            seeds = [random.getrandbits(32) for _ in range(self._steps)]
+        else:
+            seeds = [self._seed + step for step in range(self._steps)]
+
+        samples = self._model.samples
+        for error_model in self._validate_steps(samples, seeds, save_model):
             total_error += error_model * step_ratio
 
+        self._model.samples = samples
         accuracy = (1 - total_error) * 100
 
         logging.info("###########################################")
@@ -120,35 +155,83 @@ class Runner(object):
 
         return accuracy
 
+    def _validate_steps(self, samples, seeds, save_model=True):
+        """Executes the rounds of the validation, one per seed, in this process or in
+        a pool of `cv_workers` processes. The processes are forked, so the samples are
+        shared with them. Each round saves its model in its own file, whatever the
+        number of processes.
+
+        Returns
+        -------
+        Generator of the errors of the rounds.
+        """
+        steps = list(enumerate(seeds))
+        if self._cv_workers <= 1:
+            for step, seed in steps:
+                yield self._validate_step(step, seed, samples, save_model)
+            return
+
+        global _cv_state
+        _cv_state = (self, samples, save_model)
+
+        context = multiprocessing.get_context("fork")
+        with context.Pool(min(self._cv_workers, len(steps))) as pool:
+            yield from pool.imap(_validate_step, steps)
+
+    def _validate_step(self, step, seed, samples, save_model=True):
+        """Executes a round of the validation: shuffles the samples with the seed,
+        trains the model and tests it.
+
+        Returns
+        -------
+        Error of the model.
+        """
+        logging.info("###########################################")
+        logging.info(f"Validating step {step}")
+        logging.info("###########################################")
+
+        self._model.samples = list(samples)
+        self._model.shuffle_samples(seed)
+        self._model.trainer(**self._options)
+        if save_model:
+            self._model.saver(step, **self._options)
+
+        filename = (
+            f"{self._result_folder}{self._model.trainer_name}-distances-{step}.json"
+        )
+
+        return self._model.tester(
+            self._parser_engine,
+            filename,
+            **self._options,
+        )
+
     @staticmethod
     def test():
+        """Tests the model for different lengths of the prefix and the suffix and
+        different values of k (see `src.runner.sweep.Sweep`)."""
         args = _argument_parser.get_function_arguments()
+        lengths = range(15, 101, 15)
+
+        logging.basicConfig(
+            format="%(asctime)s %(levelname)-8s %(message)s",
+            level=logging.WARNING,
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
 
-        with open("results.txt", "w") as fr:
-            title = f"LENGTH-PREFIX\tLENGTH-SUFFIX\tK\tACCURACY"
-            print(title, file=fr)
-            print(title)
-            for length_suffix in range(15, 101, 15):
-                for length_prefix in range(15, 101, 15):
-                    for k in range(2, 12):
-                        args["test_ratio"] = 9 / 10
-                        args["parser_prefix"] = length_prefix
-                        args["parser_suffix"] = length_suffix
-                        args["k_value"] = k
-                        args["steps"] = 10
-                        logging.basicConfig(
-                            format="%(asctime)s %(levelname)-8s %(message)s",
-                            level=logging.WARNING,
-                            datefmt="%Y-%m-%d %H:%M:%S",
-                        )
-
-                        instance = Runner(**args)
-
-                        accuracy = instance._start()
-                        text = f"{length_prefix}\t{length_suffix}\t{k}\t{accuracy:.2f}"
-
-                        print(text, file=fr)
-                        print(text)
+        args["test_ratio"] = 9 / 10
+        args["steps"] = 10
+
+        instance = Runner(**args)
+        sweep = Sweep(
+            instance,
+            lengths,
+            lengths,
+            range(2, 12),
+            workers=args.get("sweep_workers", 1),
+        )
+
+        return sweep.run()
 
     @staticmethod
     def run(logger=True):
@@ -173,3 +256,24 @@ class Runner(object):
 
         if PARSER_OPERATION in self._operation:
             self.parse_sequences()
+
+
+_cv_state: tuple = None
+""" Runner, samples and if the model is saved of the current validation """
+
+
+def _validate_step(arguments: tuple) -> float:
+    """Executes a round of the validation with the runner of the worker process.
+
+    Parameters
+    ----------
+    arguments: tuple
+        Step and seed of the round.
+
+    Returns
+    -------
+    Error of the model.
+    """
+    runner, samples, save_model = _cv_state
+    step, seed = arguments
+    return runner._validate_step(step, seed, samples, save_model)
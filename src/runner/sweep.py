@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from collections import namedtuple
+
+SweepConfig = namedtuple("SweepConfig", ["prefix_length", "suffix_length", "k"])
+"""Configuration of the sweep: length of the prefix, length of the suffix and k."""
+
+
+class Sweep(object):
+    """Evaluates a runner for every combination of lengths of the prefix, lengths of the
+    suffix and values of k.
+
+    The sequences are parsed once with the longest prefix and suffix, and the parsed
+    samples are loaded once and kept in memory, so each configuration only crops them
+    (see `AbstractModel.crop_samples`) before training and testing the model. The
+    configurations are evaluated by a pool of processes, which are forked from the
+    current process so they share the runner (with its fasta reader) and the samples.
+    The trained models and the distances are not saved by the configurations.
+
+    Each evaluated configuration is appended to a checkpoint file (one json per line)
+    with the fingerprint of the inputs and the options of the runner (see
+    `fingerprint`), so if the sweep is killed, running it again only evaluates the
+    configurations that are not in the checkpoint. The entries of the checkpoint with
+    other fingerprint are discarded. The results file is written again, in the order of
+    the configurations, every time a result is obtained:
+
+    ```python
+        sweep = Sweep(runner, range(15, 101, 15), range(15, 101, 15), range(2, 12))
+        results = sweep.run()
+    ```
+
+    Parameters
+    ----------
+    runner: Runner
+        Runner that parses the sequences and trains and tests the model.
+    prefix_lengths: iterable
+        Lengths of the prefix.
+    suffix_lengths: iterable
+        Lengths of the suffix.
+    k_values: iterable
+        Values of k.
+    workers: int = 1
+        Number of processes that evaluate the configurations.
+    results_path: str = "results.txt"
+        Path of the results file.
+    checkpoint_path: str = None
+        Path of the checkpoint file, by default `sweep-checkpoint.jsonl` in the result
+        folder of the runner.
+    """
+
+    def __init__(
+        self,
+        runner,
+        prefix_lengths,
+        suffix_lengths,
+        k_values,
+        workers: int = 1,
+        results_path: str = "results.txt",
+        checkpoint_path: str = None,
+    ):
+        self.runner = runner
+        self.configs = [
+            SweepConfig(prefix_length, suffix_length, k)
+            for suffix_length in suffix_lengths
+            for prefix_length in prefix_lengths
+            for k in k_values
+        ]
+        self.workers = workers
+        self.results_path = results_path
+        self.checkpoint_path = checkpoint_path
+        if not self.checkpoint_path:
+            self.checkpoint_path = f"{runner._result_folder}sweep-checkpoint.jsonl"
+
+        self.windows = None
+        self._fingerprint = None
+
+    ignored_options: tuple = (
+        "k_value",
+        "parser_prefix",
+        "parser_suffix",
+        "save_distances",
+        "result_folder",
+        "workers",
+        "cv_workers",
+        "sweep_workers",
+        "annotation_workers",
+        "test",
+    )
+    """Options of the runner that are not part of the fingerprint, because they are
+    set by each configuration or they do not change the results."""
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the inputs and the options of the runner: the path, size and
+        modification time of the vcf and fasta files, the seed and the options that are
+        not in `ignored_options` (parser, ktss options, ...)."""
+        if self._fingerprint is None:
+            inputs = {
+                "options": {
+                    key: value
+                    for key, value in self.runner._options.items()
+                    if key not in self.ignored_options
+                },
+                "seed": self.runner._seed,
+            }
+            for name in ("vcf", "fasta"):
+                path = getattr(self.runner, f"_{name}_path")
+                stat = os.stat(path)
+                inputs[name] = [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+            content = json.dumps(inputs, sort_keys=True, default=str)
+            self._fingerprint = hashlib.sha256(content.encode()).hexdigest()
+
+        return self._fingerprint
+
+    def read_checkpoint(self) -> dict:
+        """Reads the results of the checkpoint file. A line that is not complete, for
+        example because the sweep was killed while writing it, is skipped, and the
+        results of other inputs or options (see `fingerprint`) are discarded.
+
+        Returns
+        -------
+        Dictionary with the accuracy of each evaluated configuration.
+        """
+        results = {}
+        if not os.path.exists(self.checkpoint_path):
+            return results
+
+        discarded = 0
+        with open(self.checkpoint_path) as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if result.get("fingerprint") != self.fingerprint:
+                    discarded += 1
+                    continue
+
+                config = SweepConfig(
+                    result["prefix_length"], result["suffix_length"], result["k"]
+                )
+                results[config] = result["accuracy"]
+
+        if discarded:
+            logging.warning(
+                f"{discarded} results of the checkpoint are discarded, they were "
+                "obtained with other inputs or options"
+            )
+
+        return results
+
+    def load_samples(self):
+        """Parses the sequences with the longest prefix and suffix of the
+        configurations and loads the parsed samples."""
+        self.runner._options["parser_prefix"] = max(
+            config.prefix_length for config in self.configs
+        )
+        self.runner._options["parser_suffix"] = max(
+            config.suffix_length for config in self.configs
+        )
+        self.runner.parse_sequences()
+
+        self.windows = self.runner._model.get_sample_windows(
+            self.runner.parsed_filename
+        )
+
+    def evaluate(self, config: SweepConfig) -> float:
+        """Trains and tests the model of a configuration.
+
+        Parameters
+        ----------
+        config: SweepConfig
+            Configuration.
+
+        Returns
+        -------
+        Accuracy of the model.
+        """
+        self.runner._options["k_value"] = config.k
+        self.runner._options["save_distances"] = False
+        if self.workers > 1:
+            # The processes of the pool can not create other pools
+            self.runner._cv_workers = 1
+
+        return self.runner.train_and_test_model(
+            prefix_length=config.prefix_length,
+            suffix_length=config.suffix_length,
+            windows=self.windows,
+            save_model=False,
+        )
+
+    @staticmethod
+    def _result_to_string(config: SweepConfig, accuracy: float) -> str:
+        """Line of the results file of a configuration."""
+        return (
+            f"{config.prefix_length}\t{config.suffix_length}\t{config.k}\t"
+            f"{accuracy:.2f}"
+        )
+
+    def _write_results(self, results: dict):
+        """Writes the results file with the evaluated configurations, in the order of
+        the configurations.
+
+        Parameters
+        ----------
+        results: dict
+            Accuracy of each evaluated configuration.
+        """
+        temporal_path = f"{self.results_path}.tmp"
+        with open(temporal_path, "w") as results_file:
+            print("LENGTH-PREFIX\tLENGTH-SUFFIX\tK\tACCURACY", file=results_file)
+            for config in self.configs:
+                if config in results:
+                    print(
+                        self._result_to_string(config, results[config]),
+                        file=results_file,
+                    )
+
+        os.replace(temporal_path, self.results_path)
+
+    def _iter_results(self, configs: list):
+        """Evaluates the configurations, in this process or in a pool of processes.
+
+        Parameters
+        ----------
+        configs: list
+            Configurations to evaluate.
+
+        Returns
+        -------
+        Generator of pairs (configuration, accuracy) in the order they are evaluated.
+        """
+        if self.workers <= 1:
+            for config in configs:
+                yield config, self.evaluate(config)
+            return
+
+        global _sweep
+        _sweep = self
+
+        # The processes are forked, so they have a copy of the runner and the samples
+        # without sending them
+        context = multiprocessing.get_context("fork")
+        with context.Pool(self.workers) as pool:
+            yield from pool.imap_unordered(_evaluate, configs)
+
+    def run(self) -> dict:
+        """Evaluates the configurations that are not in the checkpoint file.
+
+        Returns
+        -------
+        Dictionary with the accuracy of each configuration.
+        """
+        results = self.read_checkpoint()
+        pending = [config for config in self.configs if config not in results]
+        logging.info(
+            f"{len(self.configs) - len(pending)} configurations restored, "
+            f"{len(pending)} pending"
+        )
+
+        if pending:
+            self.load_samples()
+
+        if os.path.exists(self.checkpoint_path) and os.path.getsize(
+            self.checkpoint_path
+        ):
+            with open(self.checkpoint_path, "rb+") as checkpoint_file:
+                # A line that is not complete is ended, so it is not joined with the
+                # next result
+                checkpoint_file.seek(-1, os.SEEK_END)
+                if checkpoint_file.read(1) != b"\n":
+                    checkpoint_file.write(b"\n")
+
+        self._write_results(results)
+        print("LENGTH-PREFIX\tLENGTH-SUFFIX\tK\tACCURACY")
+        with open(self.checkpoint_path, "a") as checkpoint_file:
+            for config, accuracy in self._iter_results(pending):
+                results[config] = accuracy
+
+                result = {
+                    **config._asdict(),
+                    "accuracy": accuracy,
+                    "fingerprint": self.fingerprint,
+                }
+                checkpoint_file.write(f"{json.dumps(result)}\n")
+                checkpoint_file.flush()
+
+                self._write_results(results)
+                print(self._result_to_string(config, accuracy))
+
+        return results
+
+
+_sweep: Sweep = None
+""" Sweep of the current worker process """
+
+
+def _evaluate(config: SweepConfig) -> tuple:
+    """Evaluates a configuration with the sweep of the worker process.
+
+    Parameters
+    ----------
+    config: SweepConfig
+        Configuration.
+
+    Returns
+    -------
+    Pair (configuration, accuracy).
+    """
+    return config, _sweep.evaluate(config)
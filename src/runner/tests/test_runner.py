@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import os
+import pathlib
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from src.constants.constants import PARSER_MODEL_OPERATION
+from src.runner.runner import Runner
+
+
+class TestRunnerValidation(TestCase):
+    def setUp(self) -> None:
+        self.static_dir = (
+            f"{pathlib.Path(__file__).parent.parent.parent.absolute()}"
+            "/parser/tests/static/"
+        )
+        self.temporal_dir = tempfile.TemporaryDirectory()
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def _runner(self, **kwargs) -> Runner:
+        argv = [
+            "init.py",
+            "-s",
+            self.temporal_dir.name,
+            "-vcf",
+            f"{self.static_dir}vcfTest.vcf",
+            "-fasta",
+            f"{self.static_dir}test.fa.gz",
+        ]
+        with patch("sys.argv", argv):
+            runner = Runner(
+                f"{self.static_dir}vcfTest.vcf",
+                f"{self.static_dir}test.fa.gz",
+                operation=PARSER_MODEL_OPERATION,
+                result_folder=self.temporal_dir.name,
+                parser_prefix=3,
+                parser_suffix=3,
+                test_ratio=0.5,
+                steps=4,
+                **kwargs,
+            )
+        runner.parse_sequences()
+
+        return runner
+
+    def test_train_and_test_model_seed(self):
+        accuracy = self._runner(seed=7).train_and_test_model()
+
+        result = self._runner(seed=7).train_and_test_model()
+
+        self.assertEqual(result, accuracy)
+
+    def test_train_and_test_model_saves_steps(self):
+        self._runner(seed=7).train_and_test_model()
+
+        self.assertFalse(os.path.exists(f"{self.temporal_dir.name}/ktss-model.json"))
+        for step in range(4):
+            self.assertTrue(
+                os.path.exists(f"{self.temporal_dir.name}/ktss-model-{step}.json")
+            )
+
+    def test_train_and_test_model_cv_workers(self):
+        accuracy = self._runner(seed=7).train_and_test_model()
+
+        result = self._runner(seed=7, cv_workers=2).train_and_test_model()
+
+        self.assertEqual(result, accuracy)
+        for step in range(4):
+            self.assertTrue(
+                os.path.exists(f"{self.temporal_dir.name}/ktss-model-{step}.json")
+            )
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+import json
+import tempfile
+from unittest import TestCase
+
+from src.runner.sweep import Sweep, SweepConfig
+
+
+class FakeModel(object):
+    def get_sample_windows(self, path):
+        return [(path, "qwe", 1, 1)]
+
+
+class FakeRunner(object):
+    def __init__(self, result_folder):
+        self._result_folder = result_folder
+        self._vcf_path = f"{result_folder}test.vcf"
+        self._fasta_path = f"{result_folder}test.fa"
+        self._seed = 1
+        self._options = {"parser": "e", "k_value": 3, "cv_workers": 1}
+        self._model = FakeModel()
+        self.parsed_filename = "parsed.pvcf"
+        self.parsed = []
+        self.evaluated = []
+
+    def parse_sequences(self):
+        self.parsed.append(
+            (self._options["parser_prefix"], self._options["parser_suffix"])
+        )
+
+    def train_and_test_model(self, prefix_length, suffix_length, windows, save_model):
+        self.evaluated.append((prefix_length, suffix_length, self._options["k_value"]))
+        assert windows == [("parsed.pvcf", "qwe", 1, 1)]
+        assert not save_model
+
+        return prefix_length + suffix_length / 10 + self._options["k_value"] / 100
+
+
+class TestSweep(TestCase):
+    def setUp(self) -> None:
+        self.temporal_dir = tempfile.TemporaryDirectory()
+        self.folder = f"{self.temporal_dir.name}/"
+        self.results_path = f"{self.folder}results.txt"
+        for path in ("test.vcf", "test.fa"):
+            with open(f"{self.folder}{path}", "w") as input_file:
+                input_file.write(path)
+        self.runner = FakeRunner(self.folder)
+        self.configs = [
+            SweepConfig(prefix, suffix, k)
+            for suffix in (1, 2)
+            for prefix in (3, 4)
+            for k in (2, 3)
+        ]
+
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.temporal_dir.cleanup()
+
+        return super().tearDown()
+
+    def _sweep(self, **kwargs) -> Sweep:
+        return Sweep(
+            self.runner,
+            (3, 4),
+            (1, 2),
+            (2, 3),
+            results_path=self.results_path,
+            **kwargs,
+        )
+
+    def _accuracy(self, config):
+        return config.prefix_length + config.suffix_length / 10 + config.k / 100
+
+    def test_configs(self):
+        result = self._sweep().configs
+
+        self.assertEqual(result, self.configs)
+
+    def test_run(self):
+        result = self._sweep().run()
+
+        self.assertEqual(result, {i: self._accuracy(i) for i in self.configs})
+        self.assertEqual(self.runner.parsed, [(4, 2)])
+        self.assertEqual(self.runner.evaluated, [tuple(i) for i in self.configs])
+
+    def test_run_workers(self):
+        result = self._sweep(workers=2).run()
+
+        self.assertEqual(result, {i: self._accuracy(i) for i in self.configs})
+
+    def test_results_file(self):
+        self._sweep().run()
+
+        with open(self.results_path) as results_file:
+            lines = results_file.read().splitlines()
+
+        self.assertEqual(lines[0], "LENGTH-PREFIX\tLENGTH-SUFFIX\tK\tACCURACY")
+        self.assertEqual(lines[1], "3\t1\t2\t3.12")
+        self.assertEqual(len(lines), len(self.configs) + 1)
+
+    def test_results_file_workers(self):
+        self._sweep().run()
+        with open(self.results_path) as results_file:
+            lines = results_file.read()
+
+        self._sweep(workers=2).run()
+        with open(self.results_path) as results_file:
+            result = results_file.read()
+
+        self.assertEqual(result, lines)
+
+    def _write_checkpoint(self, configs: list, fingerprint: str):
+        with open(f"{self.folder}sweep-checkpoint.jsonl", "w") as checkpoint_file:
+            for config in configs:
+                result = {
+                    **config._asdict(),
+                    "accuracy": self._accuracy(config),
+                    "fingerprint": fingerprint,
+                }
+                checkpoint_file.write(f"{json.dumps(result)}\n")
+
+    def test_fingerprint(self):
+        fingerprint = self._sweep().fingerprint
+        self.runner._options["k_value"] = 5
+        self.runner._options["cv_workers"] = 4
+
+        result = self._sweep().fingerprint
+
+        self.assertEqual(result, fingerprint)
+
+    def test_fingerprint_options(self):
+        fingerprint = self._sweep().fingerprint
+        self.runner._options["parser"] = "m"
+
+        result = self._sweep().fingerprint
+
+        self.assertNotEqual(result, fingerprint)
+
+    def test_fingerprint_inputs(self):
+        fingerprint = self._sweep().fingerprint
+        with open(self.runner._vcf_path, "a") as vcf_file:
+            vcf_file.write("changed")
+
+        result = self._sweep().fingerprint
+
+        self.assertNotEqual(result, fingerprint)
+
+    def test_resume_other_fingerprint(self):
+        self._write_checkpoint(self.configs[:3], "other")
+
+        result = self._sweep().run()
+
+        self.assertEqual(result, {i: self._accuracy(i) for i in self.configs})
+        self.assertEqual(self.runner.evaluated, [tuple(i) for i in self.configs])
+
+    def test_resume(self):
+        self._write_checkpoint(self.configs[:3], self._sweep().fingerprint)
+        with open(f"{self.folder}sweep-checkpoint.jsonl", "a") as checkpoint_file:
+            checkpoint_file.write('{"prefix_length": 4, "suff')
+
+        result = self._sweep().run()
+
+        self.assertEqual(result, {i: self._accuracy(i) for i in self.configs})
+        self.assertEqual(self.runner.evaluated, [tuple(i) for i in self.configs[3:]])
+        self.assertEqual(self._sweep().read_checkpoint(), result)
+
+    def test_resume_finished(self):
+        self._sweep().run()
+        self.runner.parsed = []
+        self.runner.evaluated = []
+
+        result = self._sweep().run()
+
+        self.assertEqual(result, {i: self._accuracy(i) for i in self.configs})
+        self.assertEqual(self.runner.parsed, [])
+        self.assertEqual(self.runner.evaluated, [])